@@ -5,95 +5,292 @@ API Manager - ModuStackClean
 Gestor de API con fallback automático a modo offline
 """
 
+import copy
 import requests
 import json
-from typing import Optional, Tuple, Dict, Any
+import threading
+from urllib.parse import urlencode
+from typing import Callable, Iterator, List, Optional, Tuple, Dict, Any
 from datetime import datetime
 
+from utils.ttl_cache import TTLCache
+
+# Estados de la conexión
+STATUS_CHECKING = "checking"
+STATUS_CONNECTED = "connected"
+STATUS_DISCONNECTED = "disconnected"
+
+# Tiempo máximo para establecer la conexión TCP/TLS
+CONNECT_TIMEOUT = 3.0
+
+# Tiempo máximo de espera de la respuesta una vez conectado
+READ_TIMEOUT = 10.0
+
+# Tiempo máximo del ping de verificación
+PING_TIMEOUT = (CONNECT_TIMEOUT, 5.0)
+
+# Espera máxima por el ping en curso antes de una petición
+CHECK_WAIT = 4.0
+
+# Mensaje de la API para rutas que no existen en el servidor desplegado
+ENDPOINT_NOT_FOUND = "Endpoint no encontrado"
+
+# Vigencia en caché de las respuestas GET por endpoint ("/*" = un nivel más)
+CACHE_TTLS = {
+    "/api/usuarios": 30.0,
+    "/api/usuarios/count": 30.0,
+    "/api/usuarios/*": 60.0,
+    "/api/info": 300.0,
+    "/api/health": 10.0
+}
+
+# Respuestas guardadas como máximo
+CACHE_MAX_ENTRIES = 128
+
 class APIManager:
-    """Gestor de API con fallback automático"""
+    """Gestor de API con fallback automático
+    
+    El ping inicial corre en un hilo de fondo: el constructor vuelve de
+    inmediato con estado "checking" y los listeners registrados reciben el
+    nuevo estado cuando la verificación termina.
+    """
     
-    def __init__(self):
+    def __init__(self, auto_check: bool = True):
         self.api_base_url = "https://rulossoluciones.com/modustackclean"
-        self.timeout = 10
+        self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
         self.session = requests.Session()
-        self.connection_status = "unknown"
+        # Sin verificación automática no hay nada que esperar hasta que se lance una
+        self.connection_status = STATUS_CHECKING if auto_check else STATUS_DISCONNECTED
+        self.cache = TTLCache(max_entries=CACHE_MAX_ENTRIES)
         
-        # Probar conexión al inicializar
-        self.test_connection()
+        self._listeners: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+        self._check_done = threading.Event()
+        self._check_thread = None
+        
+        # Probar conexión en segundo plano sin bloquear el arranque
+        if auto_check:
+            self.start_background_check()
+    
+    def add_status_listener(self, callback: Callable[[str], None]):
+        """Registrar un callback que recibe el estado cuando cambia"""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+    
+    def remove_status_listener(self, callback: Callable[[str], None]):
+        """Quitar un callback de estado"""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+    
+    def _set_status(self, status: str):
+        """Cambiar el estado y avisar a los listeners"""
+        changed = status != self.connection_status
+        self.connection_status = status
+        if changed:
+            self._notify(status)
+    
+    def _notify(self, status: str):
+        """Entregar el estado a los listeners registrados"""
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(status)
+            except Exception as e:
+                print(f"⚠️ Error en listener de conexión: {e}")
+    
+    def start_background_check(self) -> bool:
+        """Lanzar el ping en un hilo de fondo (False si ya hay uno en curso)"""
+        with self._lock:
+            if self._check_thread is not None and self._check_thread.is_alive():
+                return False
+            self._check_done.clear()
+            self._check_thread = threading.Thread(target=self.test_connection, daemon=True)
+        self._set_status(STATUS_CHECKING)
+        self._check_thread.start()
+        return True
+    
+    def wait_for_check(self, timeout: Optional[float] = None) -> bool:
+        """Esperar a que termine la verificación en curso"""
+        if self.connection_status != STATUS_CHECKING:
+            return True
+        if self._check_thread is None:
+            return False  # Nunca se lanzó una verificación: no esperar
+        return self._check_done.wait(timeout)
     
     def test_connection(self) -> bool:
         """Probar conexión a la API"""
         try:
-            response = self.session.get(f"{self.api_base_url}/api/ping", timeout=self.timeout)
+            response = self.session.get(f"{self.api_base_url}/api/ping", timeout=PING_TIMEOUT)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('ok') and data.get('mensaje') == 'pong':
-                    self.connection_status = "connected"
                     print("✅ API conectada exitosamente")
+                    self._finish_check(STATUS_CONNECTED)
                     return True
         except Exception as e:
             print(f"❌ Error conectando a API: {str(e)[:50]}")
         
-        self.connection_status = "disconnected"
         print("❌ API no disponible - Modo offline activado")
+        self._finish_check(STATUS_DISCONNECTED)
         return False
     
+    def _finish_check(self, status: str):
+        """Publicar el resultado de la verificación"""
+        # El estado se fija antes de liberar a quien espera en wait_for_check
+        changed = status != self.connection_status
+        self.connection_status = status
+        self._check_done.set()
+        if changed:
+            self._notify(status)
+    
     def is_connected(self) -> bool:
         """Verificar si hay conexión a la API"""
-        return self.connection_status == "connected"
+        return self.connection_status == STATUS_CONNECTED
+    
+    def is_checking(self) -> bool:
+        """Verificar si el ping sigue en curso"""
+        return self.connection_status == STATUS_CHECKING
     
     def get_connection_info(self) -> Dict[str, Any]:
         """Obtener información de la conexión"""
-        if self.is_connected():
+        if self.is_checking():
             return {
-                "status": "connected",
+                "status": STATUS_CHECKING,
+                "type": "api",
+                "url": self.api_base_url,
+                "timestamp": datetime.now().isoformat()
+            }
+        elif self.is_connected():
+            return {
+                "status": STATUS_CONNECTED,
                 "type": "api",
                 "url": self.api_base_url,
                 "timestamp": datetime.now().isoformat()
             }
         else:
             return {
-                "status": "disconnected",
+                "status": STATUS_DISCONNECTED,
                 "type": "offline",
                 "url": None,
                 "timestamp": datetime.now().isoformat()
             }
     
-    def make_api_request(self, endpoint: str, method: str = "GET", data: Dict = None) -> Tuple[bool, str, Optional[Dict]]:
-        """Realizar petición a la API"""
+    def make_api_request(self, endpoint: str, method: str = "GET", data: Dict = None,
+                         use_cache: bool = True) -> Tuple[bool, str, Optional[Dict]]:
+        """Realizar petición a la API
+        
+        Los GET de endpoints con vigencia en CACHE_TTLS se sirven desde la
+        caché mientras estén vigentes; al vencer se revalidan con
+        If-None-Match/If-Modified-Since y un 304 renueva la entrada sin
+        volver a descargarla. Las escrituras invalidan su recurso.
+        """
+        self.wait_for_check(CHECK_WAIT)
         if not self.is_connected():
             return False, "API no disponible", None
         
+        method = method.upper()
+        ttl = self._cache_ttl(endpoint) if use_cache and method == "GET" else 0
+        cache_key = f"{method} {endpoint}"
+        headers = {}
+        cached = None
+        if ttl:
+            fresh = self.cache.get(cache_key)
+            if fresh is not None:
+                return self._copy_result(fresh)
+            cached = self.cache.get_entry(cache_key)
+            if cached is not None:
+                if cached.meta.get('etag'):
+                    headers['If-None-Match'] = cached.meta['etag']
+                if cached.meta.get('last_modified'):
+                    headers['If-Modified-Since'] = cached.meta['last_modified']
+        
         try:
             url = f"{self.api_base_url}{endpoint}"
             
-            if method.upper() == "GET":
-                response = self.session.get(url, timeout=self.timeout)
-            elif method.upper() == "POST":
+            if method == "GET":
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            elif method == "POST":
                 response = self.session.post(url, json=data, timeout=self.timeout)
             else:
                 return False, f"Método {method} no soportado", None
             
-            if response.status_code == 200:
-                try:
-                    api_data = response.json()
-                    if api_data.get('ok'):
-                        return True, api_data.get('mensaje', 'Operación exitosa'), api_data.get('data')
-                    else:
-                        return False, api_data.get('mensaje', 'Error en la API'), None
-                except json.JSONDecodeError:
-                    return False, "Respuesta JSON inválida", None
-            else:
-                return False, f"Error HTTP {response.status_code}", None
+            if response.status_code == 304 and cached is not None:
+                self.cache.touch(cache_key, ttl)
+                return self._copy_result(cached.value)
+            
+            result = self._parse_response(response)
+            if ttl and result[0]:
+                self.cache.set(cache_key, result, ttl, meta={
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                })
+                return self._copy_result(result)
+            elif method != "GET" and result[0]:
+                self.invalidate_cache(endpoint)
+            return result
                 
         except requests.RequestException as e:
             return False, f"Error de conexión: {str(e)}", None
         except Exception as e:
             return False, f"Error inesperado: {str(e)}", None
     
+    @staticmethod
+    def _copy_result(result: Tuple[bool, str, Any]) -> Tuple[bool, str, Any]:
+        """Copiar los datos de una respuesta guardada: quien llama puede modificarlos"""
+        success, message, data = result
+        return success, message, copy.deepcopy(data)
+    
+    def _parse_response(self, response) -> Tuple[bool, str, Optional[Dict]]:
+        """Traducir la respuesta JSON de la API a (éxito, mensaje, datos)"""
+        if response.status_code == 200:
+            try:
+                api_data = response.json()
+                if api_data.get('ok'):
+                    return True, api_data.get('mensaje', 'Operación exitosa'), api_data.get('data')
+                else:
+                    return False, api_data.get('mensaje', 'Error en la API'), None
+            except json.JSONDecodeError:
+                return False, "Respuesta JSON inválida", None
+        else:
+            # La API explica el error en "mensaje" (ej. 404 "Usuario no encontrado")
+            try:
+                mensaje = response.json().get('mensaje')
+            except (ValueError, AttributeError):
+                mensaje = None
+            return False, mensaje or f"Error HTTP {response.status_code}", None
+    
+    @staticmethod
+    def _cache_ttl(endpoint: str) -> float:
+        """Vigencia en caché de un endpoint (0 = no se guarda)"""
+        path = endpoint.split('?', 1)[0]
+        if path in CACHE_TTLS:
+            return CACHE_TTLS[path]
+        parent = path.rsplit('/', 1)[0]
+        return CACHE_TTLS.get(parent + '/*', 0)
+    
+    def invalidate_cache(self, endpoint: Optional[str] = None) -> int:
+        """Invalidar las respuestas guardadas de un recurso (o todas)
+        
+        "/api/usuarios/5" invalida todo lo guardado bajo "/api/usuarios",
+        porque el listado y el conteo también cambian.
+        """
+        if endpoint is None:
+            count = len(self.cache)
+            self.cache.clear()
+            return count
+        resource = '/'.join(endpoint.split('?', 1)[0].split('/')[:3])
+        return self.cache.invalidate_prefix(f"GET {resource}")
+    
+    def get_cache_stats(self) -> Dict:
+        """Obtener las métricas de la caché de respuestas"""
+        return self.cache.get_stats()
+    
     def login_usuario(self, correo: str, password: str) -> Tuple[bool, str, Optional[Dict]]:
         """Autenticar usuario a través de la API"""
+        self.wait_for_check(CHECK_WAIT)
         if not self.is_connected():
             return False, "API no disponible - Usa 'root'/'root' para acceso offline", None
         
@@ -120,6 +317,7 @@ class APIManager:
     
     def create_usuario(self, nombre: str, correo: str, password: str, rol: str = 'usuario') -> Tuple[bool, str, Optional[int]]:
         """Crear usuario a través de la API"""
+        self.wait_for_check(CHECK_WAIT)
         if not self.is_connected():
             return False, "API no disponible", None
         
@@ -136,8 +334,55 @@ class APIManager:
         else:
             return False, f"Error obteniendo usuarios: {message}", []
     
+    def get_usuarios_page(self, limit: int = 100, after: Optional[str] = None,
+                          fields: Optional[List[str]] = None) -> Tuple[bool, str, Dict]:
+        """Obtener una página de usuarios por cursor (creado_en, id)"""
+        params = {'limit': limit}
+        if after:
+            params['after'] = after
+        if fields:
+            params['fields'] = ','.join(fields)
+        success, message, data = self.make_api_request(f"/api/usuarios?{urlencode(params)}")
+        
+        if success and data:
+            return True, message, {
+                "usuarios": data.get('usuarios', []),
+                "next_cursor": data.get('next_cursor')
+            }
+        else:
+            return False, f"Error obteniendo usuarios: {message}", {"usuarios": [], "next_cursor": None}
+    
+    def iter_usuarios(self, page_size: int = 100, fields: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Recorrer todos los usuarios de la API página a página
+        
+        Un error a mitad del recorrido se propaga como RuntimeError para no
+        confundirlo con el final del listado.
+        """
+        after = None
+        while True:
+            success, message, page = self.get_usuarios_page(page_size, after, fields)
+            if not success:
+                raise RuntimeError(message)
+            yield from page["usuarios"]
+            after = page["next_cursor"]
+            if not after:
+                return
+    
     def get_usuario_by_id(self, user_id: int) -> Tuple[bool, str, Optional[Dict]]:
         """Obtener usuario por ID de la API"""
+        success, message, data = self.make_api_request(f"/api/usuarios/{int(user_id)}")
+        
+        if success and data:
+            return True, "Usuario encontrado", data.get('usuario')
+        elif message == ENDPOINT_NOT_FOUND:
+            return self._find_usuario_in_list(user_id)
+        elif message == "Usuario no encontrado":
+            return False, message, None
+        else:
+            return False, f"Error obteniendo usuario: {message}", None
+    
+    def _find_usuario_in_list(self, user_id: int) -> Tuple[bool, str, Optional[Dict]]:
+        """Buscar en el listado completo (API anterior sin /api/usuarios/{id})"""
         success, message, data = self.make_api_request("/api/usuarios")
         
         if success and data:
@@ -152,7 +397,10 @@ class APIManager:
     
     def count_usuarios(self) -> Tuple[bool, str, int]:
         """Contar usuarios de la API"""
-        success, message, data = self.make_api_request("/api/usuarios")
+        success, message, data = self.make_api_request("/api/usuarios/count")
+        if not success and message == ENDPOINT_NOT_FOUND:
+            # API anterior sin /api/usuarios/count
+            success, message, data = self.make_api_request("/api/usuarios")
         
         if success and data:
             count = data.get('count', 0)
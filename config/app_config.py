@@ -29,6 +29,32 @@ class AppConfig:
         self.CARD_RADIUS = 12
         self.BUTTON_RADIUS = 8
         
+        # Configuración de la búsqueda de archivos
+        self.SEARCH_EXTENSIONS = ['.exe', '.zip', '.rar', '.msi']
+        self.SEARCH_PATTERNS = []  # Patrones glob adicionales, ej. "setup*"
+        self.SEARCH_MIN_SIZE = None  # Tamaño mínimo en bytes
+        self.SEARCH_MAX_SIZE = None  # Tamaño máximo en bytes
+        self.SEARCH_MIN_AGE_DAYS = None  # Solo archivos sin modificar en al menos N días
+        self.SEARCH_MAX_AGE_DAYS = None  # Solo archivos modificados en los últimos N días
+        
+        # Configuración del organizador automático (la primera regla que coincide gana)
+        self.ORGANIZER_TARGET_DIR = None  # None: carpetas de categoría junto a cada archivo
+        self.ORGANIZER_BATCH_SIZE = 200
+        self.ORGANIZER_RULES = [
+            {"category": "Instaladores", "extensions": ['.exe', '.msi']},
+            {"category": "Comprimidos", "extensions": ['.zip', '.rar', '.7z', '.tar.gz']},
+            {"category": "Documentos", "extensions": ['.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.txt']},
+            {"category": "Imágenes", "extensions": ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']},
+            {"category": "Multimedia", "extensions": ['.mp3', '.wav', '.mp4', '.mkv', '.avi', '.mov']},
+        ]
+        
+        # Configuración del hash de contraseñas (ver utils/password_hasher.py)
+        self.PASSWORD_HASH_ALGORITHM = "scrypt"  # "scrypt" o "pbkdf2_sha256"
+        self.PASSWORD_SCRYPT_N = 2 ** 14  # Costo de scrypt (16 MB y ~80 ms por hash)
+        self.PASSWORD_PBKDF2_ITERATIONS = 600_000
+        self.PASSWORD_HASH_WORKERS = 4  # Hashes simultáneos como máximo (0: en el hilo que llama)
+        self.PASSWORD_HASH_USE_PROCESSES = False  # Los hilos bastan: hashlib libera el GIL
+        
         # Textos de la aplicación
         self.WELCOME_MESSAGE = "Bienvenido a ModuStackClean"
         self.SUBTITLE_MESSAGE = "Sistema de Organización y Gestión de Archivos"
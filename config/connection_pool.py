@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pool de Conexiones - ModuStackClean
+Pool compartido de conexiones MySQL con préstamo/devolución, verificación y métricas
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+# Claves de DB_CONFIG que configuran el pool y no la conexión
+POOL_KEYS = ('pool_name', 'pool_size', 'pool_reset_session')
+
+# Espera máxima por una conexión libre
+DEFAULT_BORROW_TIMEOUT = 5.0
+
+# Una conexión inactiva más tiempo que esto se verifica con ping antes de prestarla
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+
+
+class PooledConnection:
+    """Conexión prestada por el pool
+
+    Se comporta como la conexión de MySQL; close() la devuelve al pool en
+    lugar de cerrarla, de modo que el código existente no cambia. Si se
+    pierde sin llamar a close(), el recolector solo libera su lugar en el
+    pool (métrica "reclaimed"); la conexión física no se reutiliza.
+    """
+
+    def __init__(self, pool: "ConnectionPool", connection, slot: Dict):
+        self._pool = pool
+        self._connection = connection
+        self._slot = slot
+
+    @property
+    def slot(self) -> Dict:
+        """Datos que viven mientras viva la conexión física (ej. sentencias preparadas)"""
+        return self._slot
+
+    def close(self):
+        """Devolver la conexión al pool"""
+        if self._connection is not None:
+            self._pool.release(self._connection, self._slot)
+            self._connection = None
+
+    def discard(self):
+        """Cerrar la conexión física en lugar de devolverla (estado incierto)"""
+        if self._connection is not None:
+            self._pool._discard(self._connection, in_use=True)
+            self._connection = None
+
+    def __del__(self):
+        # Préstamo olvidado: corre dentro del recolector, así que nada de E/S
+        # (ni rollback ni close); la conexión física se suelta con este objeto
+        if self.__dict__.get('_connection') is not None:
+            self._connection = None
+            try:
+                self._pool.reclaim()
+            except Exception:
+                pass
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise PoolError("La conexión ya fue devuelta al pool")
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name, value):
+        # Propiedades como autocommit se aplican a la conexión real
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._connection, name, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """Pool de conexiones con préstamo bloqueante y verificación perezosa
+
+    Las conexiones se crean bajo demanda hasta pool_size. Al prestar una
+    conexión que estuvo inactiva más de health_check_interval se hace un
+    ping; si falla se descarta y se crea otra. Al devolverla no se hace
+    ningún viaje al servidor salvo que haya una transacción abierta.
+    """
+
+    def __init__(self, config: Dict, pool_size: int = 5, borrow_timeout: float = DEFAULT_BORROW_TIMEOUT,
+                 health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+                 connect: Callable = None):
+        self.name = config.get('pool_name', 'modustackclean_pool')
+        self.config = {key: value for key, value in config.items() if key not in POOL_KEYS}
+        self.pool_size = max(1, pool_size)
+        self.borrow_timeout = borrow_timeout
+        self.health_check_interval = health_check_interval
+        self._connect = connect or mysql.connector.connect
+
+        self._idle = deque()  # (conexión, slot, momento de devolución)
+        self._created = 0
+        self._condition = threading.Condition()
+        self._metrics = {
+            "created": 0,
+            "borrowed": 0,
+            "returned": 0,
+            "reused": 0,
+            "health_checks": 0,
+            "discarded": 0,
+            "timeouts": 0,
+            "reclaimed": 0,
+            "in_use": 0,
+            "peak_in_use": 0,
+            "wait_seconds": 0.0,
+            "connect_seconds": 0.0
+        }
+
+    def get_connection(self, timeout: Optional[float] = None,
+                       connect_timeout: Optional[int] = None) -> PooledConnection:
+        """Tomar prestada una conexión (esperando si todas están en uso)
+
+        connect_timeout reemplaza el de la configuración si hay que abrir
+        una conexión nueva (ej. pruebas rápidas al iniciar).
+        """
+        timeout = self.borrow_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            with self._condition:
+                while not self._idle and self._created >= self.pool_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics["timeouts"] += 1
+                        raise PoolError(f"No hay conexiones libres en el pool '{self.name}' tras {timeout:.1f} s")
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    connection, slot, released_at = self._idle.pop()
+                else:
+                    connection, slot, released_at = None, None, None
+                    self._created += 1
+
+            reused = connection is not None
+            if connection is None:
+                try:
+                    connection, slot = self._create(connect_timeout), {}
+                except Exception:
+                    with self._condition:
+                        self._created -= 1
+                        self._condition.notify()
+                    raise
+            elif time.monotonic() - released_at > self.health_check_interval and not self._is_healthy(connection):
+                self._discard(connection)
+                continue
+
+            with self._condition:
+                self._metrics["reused"] += reused
+                self._metrics["borrowed"] += 1
+                self._metrics["in_use"] += 1
+                self._metrics["peak_in_use"] = max(self._metrics["peak_in_use"], self._metrics["in_use"])
+                self._metrics["wait_seconds"] += time.monotonic() - started
+            return PooledConnection(self, connection, slot)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Préstamo con devolución automática"""
+        pooled = self.get_connection(timeout)
+        try:
+            yield pooled
+        finally:
+            pooled.close()
+
+    def release(self, connection, slot: Dict):
+        """Recibir una conexión devuelta"""
+        try:
+            if getattr(connection, 'in_transaction', False):
+                connection.rollback()
+        except Error:
+            self._discard(connection, in_use=True)
+            return
+
+        with self._condition:
+            self._metrics["returned"] += 1
+            self._metrics["in_use"] -= 1
+            self._idle.append((connection, slot, time.monotonic()))
+            self._condition.notify()
+
+    def reclaim(self):
+        """Liberar el lugar de una conexión que nadie devolvió (llamado desde el recolector)"""
+        with self._condition:
+            self._created -= 1
+            self._metrics["reclaimed"] += 1
+            self._metrics["in_use"] -= 1
+            self._condition.notify()
+
+    def _create(self, connect_timeout: Optional[int] = None):
+        """Abrir una conexión física nueva"""
+        config = self.config
+        if connect_timeout is not None:
+            config = dict(config, connect_timeout=connect_timeout)
+        started = time.monotonic()
+        connection = self._connect(**config)
+        with self._condition:
+            self._metrics["created"] += 1
+            self._metrics["connect_seconds"] += time.monotonic() - started
+        return connection
+
+    def _is_healthy(self, connection) -> bool:
+        """Verificar con ping una conexión que estuvo inactiva"""
+        with self._condition:
+            self._metrics["health_checks"] += 1
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, connection, in_use: bool = False):
+        """Cerrar una conexión rota y liberar su lugar"""
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._created -= 1
+            self._metrics["discarded"] += 1
+            if in_use:
+                self._metrics["in_use"] -= 1
+            self._condition.notify()
+
+    def get_stats(self) -> Dict:
+        """Obtener las métricas del pool"""
+        with self._condition:
+            stats = dict(self._metrics)
+            stats["name"] = self.name
+            stats["size"] = self.pool_size
+            stats["open"] = self._created
+            stats["idle"] = len(self._idle)
+        stats["avg_wait_ms"] = stats["wait_seconds"] / stats["borrowed"] * 1000 if stats["borrowed"] else 0.0
+        stats["avg_connect_ms"] = stats["connect_seconds"] / stats["created"] * 1000 if stats["created"] else 0.0
+        return stats
+
+    def close_all(self):
+        """Cerrar las conexiones inactivas"""
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+            self._created -= len(idle)
+        for connection, _, _ in idle:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+# Pools compartidos por nombre
+_POOLS: Dict[str, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(config: Dict, **kwargs) -> ConnectionPool:
+    """Obtener el pool compartido de una configuración (se crea la primera vez)"""
+    name = config.get('pool_name', 'modustackclean_pool')
+    with _POOLS_LOCK:
+        pool = _POOLS.get(name)
+        if pool is None:
+            pool = ConnectionPool(config, pool_size=config.get('pool_size', 5), **kwargs)
+            _POOLS[name] = pool
+        return pool
+
+
+def close_pools():
+    """Cerrar todas las conexiones inactivas de los pools compartidos"""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    for pool in pools:
+        pool.close_all()
@@ -7,9 +7,13 @@ Configuración para desarrollo con MySQL local
 
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.constants import ClientFlag
 import json
 from datetime import datetime
 import socket
+import time
+
+from config.connection_pool import POOL_KEYS, get_pool
 
 class DatabaseConfigLocal:
     """Configuración de la base de datos MySQL local para desarrollo"""
@@ -28,7 +32,9 @@ class DatabaseConfigLocal:
             'pool_size': 5,
             'connect_timeout': 10,
             'use_unicode': True,
-            'get_warnings': True
+            'get_warnings': True,
+            # rowcount de UPDATE cuenta filas encontradas aunque no cambien
+            'client_flags': [ClientFlag.FOUND_ROWS]
         }
         
         # Configuración de la API
@@ -60,18 +66,49 @@ class DatabaseConfigLocal:
             print(f"❌ Error probando conectividad: {e}")
             return False
     
-    def get_connection(self):
-        """Obtener conexión a la base de datos local"""
+    def probe(self, timeout: float = 1.5) -> bool:
+        """Prueba rápida: puerto abierto y una conexión del pool, todo dentro de `timeout`, sin consultas"""
+        started = time.monotonic()
         try:
-            print(f"🔗 Intentando conectar a MySQL local en {self.DB_CONFIG['host']}...")
-            connection = mysql.connector.connect(**self.DB_CONFIG)
-            if connection.is_connected():
-                print("✅ Conexión a MySQL local establecida correctamente")
-                # Seleccionar la base de datos
-                cursor = connection.cursor()
-                cursor.execute("USE modustackclean")
+            with socket.create_connection((self.DB_CONFIG['host'], self.DB_CONFIG.get('port', 3306)), timeout=timeout):
+                pass
+        except OSError:
+            return False
+        
+        # Lo que quede del tiempo (connect_timeout usa segundos enteros, mínimo 1)
+        remaining = max(0.1, timeout - (time.monotonic() - started))
+        try:
+            connection = get_pool(self.DB_CONFIG).get_connection(
+                timeout=remaining, connect_timeout=max(1, int(remaining))
+            )
+        except Error:
+            return False
+        connection.close()
+        return True
+    
+    def check_schema(self) -> bool:
+        """Verificar que la tabla usuarios existe"""
+        connection = self.get_connection()
+        if not connection:
+            return False
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SHOW TABLES LIKE 'usuarios'")
+                return cursor.fetchone() is not None
+            finally:
                 cursor.close()
-                return connection
+        except Error as e:
+            print(f"❌ Error verificando el esquema: {e}")
+            return False
+        finally:
+            connection.close()
+    
+    def get_connection(self):
+        """Obtener una conexión del pool compartido (close() la devuelve al pool)"""
+        try:
+            # La base de datos ya viene en DB_CONFIG; no hace falta un USE por préstamo
+            return get_pool(self.DB_CONFIG).get_connection()
         except Error as e:
             print(f"❌ Error conectando a MySQL local: {e}")
             
@@ -106,21 +143,24 @@ class DatabaseConfigLocal:
             
             connection = self.get_connection()
             if connection:
-                cursor = connection.cursor()
-                cursor.execute("SELECT VERSION()")
-                version = cursor.fetchone()
-                print(f"✅ Conexión exitosa. Versión de MySQL: {version[0]}")
-                
-                # Verificar si la tabla usuarios existe
-                cursor.execute("SHOW TABLES LIKE 'usuarios'")
-                table_exists = cursor.fetchone()
-                if table_exists:
-                    print("✅ Tabla 'usuarios' encontrada")
-                else:
-                    print("⚠️ Tabla 'usuarios' no encontrada")
-                
-                cursor.close()
-                connection.close()
+                try:
+                    cursor = connection.cursor()
+                    try:
+                        cursor.execute("SELECT VERSION()")
+                        version = cursor.fetchone()
+                        print(f"✅ Conexión exitosa. Versión de MySQL: {version[0]}")
+                        
+                        # Verificar si la tabla usuarios existe
+                        cursor.execute("SHOW TABLES LIKE 'usuarios'")
+                        table_exists = cursor.fetchone()
+                        if table_exists:
+                            print("✅ Tabla 'usuarios' encontrada")
+                        else:
+                            print("⚠️ Tabla 'usuarios' no encontrada")
+                    finally:
+                        cursor.close()
+                finally:
+                    connection.close()
                 return True
             return False
         except Error as e:
@@ -133,18 +173,23 @@ class DatabaseConfigLocal:
             # Conectar sin especificar base de datos
             config_without_db = self.DB_CONFIG.copy()
             config_without_db.pop('database', None)
+            for key in POOL_KEYS:
+                config_without_db.pop(key, None)
             
             connection = mysql.connector.connect(**config_without_db)
             if connection.is_connected():
-                cursor = connection.cursor()
-                
-                # Crear base de datos si no existe
-                cursor.execute("CREATE DATABASE IF NOT EXISTS modustackclean CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
-                print("✅ Base de datos 'modustackclean' creada/verificada")
-                
-                connection.commit()
-                cursor.close()
-                connection.close()
+                try:
+                    cursor = connection.cursor()
+                    try:
+                        # Crear base de datos si no existe
+                        cursor.execute("CREATE DATABASE IF NOT EXISTS modustackclean CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+                        print("✅ Base de datos 'modustackclean' creada/verificada")
+                        
+                        connection.commit()
+                    finally:
+                        cursor.close()
+                finally:
+                    connection.close()
                 return True
             return False
         except Error as e:
@@ -161,34 +206,49 @@ class DatabaseConfigLocal:
             # Luego conectar a la base de datos específica
             connection = self.get_connection()
             if connection:
-                cursor = connection.cursor()
-                
-                # Crear tabla usuarios
-                create_usuarios_table = """
-                CREATE TABLE IF NOT EXISTS usuarios (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    nombre VARCHAR(100) NOT NULL,
-                    correo VARCHAR(150) UNIQUE NOT NULL,
-                    password VARCHAR(255) NOT NULL,
-                    rol ENUM('admin', 'usuario') DEFAULT 'usuario',
-                    estado TINYINT(1) DEFAULT 1,
-                    creado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    actualizado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
-                """
-                
-                cursor.execute(create_usuarios_table)
-                print("✅ Tabla 'usuarios' creada/verificada correctamente")
-                
-                connection.commit()
-                cursor.close()
-                connection.close()
+                try:
+                    cursor = connection.cursor()
+                    try:
+                        # Crear tabla usuarios
+                        create_usuarios_table = """
+                        CREATE TABLE IF NOT EXISTS usuarios (
+                            id INT AUTO_INCREMENT PRIMARY KEY,
+                            nombre VARCHAR(100) NOT NULL,
+                            correo VARCHAR(150) UNIQUE NOT NULL,
+                            password VARCHAR(255) NOT NULL,
+                            rol ENUM('admin', 'usuario') DEFAULT 'usuario',
+                            estado TINYINT(1) DEFAULT 1,
+                            creado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                            actualizado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                            INDEX idx_usuarios_creado_id (creado_en, id)
+                        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+                        """
+                        
+                        cursor.execute(create_usuarios_table)
+                        print("✅ Tabla 'usuarios' creada/verificada correctamente")
+                        
+                        # Índice de la paginación por cursor en tablas creadas antes de agregarlo
+                        try:
+                            cursor.execute("CREATE INDEX idx_usuarios_creado_id ON usuarios (creado_en, id)")
+                        except Error as e:
+                            if e.errno != 1061:  # ER_DUP_KEYNAME: el índice ya existe
+                                raise
+                        
+                        connection.commit()
+                    finally:
+                        cursor.close()
+                finally:
+                    connection.close()
                 return True
             return False
         except Error as e:
             print(f"❌ Error creando tablas: {e}")
             return False
     
+    def get_pool_stats(self):
+        """Obtener las métricas del pool de conexiones"""
+        return get_pool(self.DB_CONFIG).get_stats()
+    
     def get_connection_info(self):
         """Obtener información de la configuración de conexión"""
         return {
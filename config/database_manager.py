@@ -7,7 +7,10 @@ Gestor de base de datos con fallback automático entre local y remota
 
 import sys
 import os
-from typing import Optional, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # Agregar el directorio actual al path para importar módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,19 +18,51 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.database_config import DatabaseConfig
 from config.database_config_local import DatabaseConfigLocal
 from models.usuario_model import UsuarioModel
+from utils.ttl_cache import TTLCache
+
+# Timeout de la prueba de puerto de cada base de datos
+PROBE_TIMEOUT = 1.5
+
+# Tiempo máximo que se espera a la prueba completa (puerto + primera conexión del pool)
+PROBE_BUDGET = 3.0
+
+# Vigencia del resultado de la prueba (los fallos se reintentan antes)
+PROBE_TTL = 60.0
+PROBE_FAILURE_TTL = 10.0
+
+# Vigencia de los usuarios y conteos en caché (0 = sin caché)
+USER_CACHE_TTL = 30.0
+USER_CACHE_MAX_ENTRIES = 1024
+
+# Claves de la caché de lecturas
+CACHE_ALL = ("usuarios",)
+CACHE_COUNT = ("count",)
+
+# Resultado de la última prueba, compartido entre instancias
+_probe_cache = {}
+_probe_lock = threading.Lock()
 
 class DatabaseManager:
-    """Gestor de base de datos con fallback automático"""
+    """Gestor de base de datos con fallback automático
+    
+    Las lecturas de usuarios por ID, el listado completo y el conteo se
+    guardan en una caché LRU con vencimiento; las escrituras hechas a través
+    de este gestor invalidan lo que afectan. Cambios hechos por otros
+    procesos se ven como mucho cache_ttl segundos después.
+    """
     
-    def __init__(self):
+    def __init__(self, fast_probe: bool = True, cache_ttl: float = USER_CACHE_TTL):
         self.remote_config = DatabaseConfig()
         self.local_config = DatabaseConfigLocal()
         self.current_config = None
         self.usuario_model = None
         self.connection_type = None
+        self._schema_checked = False
+        self.cache_ttl = cache_ttl
+        self.cache = TTLCache(max_entries=USER_CACHE_MAX_ENTRIES, default_ttl=cache_ttl)
         
         # Intentar conectar automáticamente
-        self.initialize_connection()
+        self.initialize_connection(fast=fast_probe)
     
     def test_remote_connection(self) -> bool:
         """Probar conexión remota sin mostrar errores"""
@@ -43,16 +78,70 @@ class DatabaseManager:
         except Exception:
             return False
     
-    def initialize_connection(self) -> Tuple[bool, str]:
+    def probe_connections(self, use_cache: bool = True) -> Optional[str]:
+        """Probar remota y local en paralelo con timeouts cortos ("remote", "local" o None)"""
+        now = time.monotonic()
+        with _probe_lock:
+            if use_cache and _probe_cache and _probe_cache["expires"] > now:
+                return _probe_cache["type"]
+        
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=2)
+        futures = {
+            "remote": executor.submit(self.remote_config.probe, PROBE_TIMEOUT),
+            "local": executor.submit(self.local_config.probe, PROBE_TIMEOUT)
+        }
+        executor.shutdown(wait=False)
+        
+        # La remota tiene prioridad; la local solo se usa si la remota falla
+        connection_type = None
+        deadline = started + PROBE_BUDGET
+        for name in ("remote", "local"):
+            try:
+                if futures[name].result(timeout=max(0.0, deadline - time.monotonic())):
+                    connection_type = name
+                    break
+            except FutureTimeoutError:
+                print(f"⚠️ La prueba {name} no respondió en {PROBE_BUDGET:.0f} s")
+            except Exception as e:
+                print(f"⚠️ Error en la prueba {name}: {e}")
+        
+        print(f"⏱️ Prueba de conexión: {connection_type or 'sin conexión'} en {(time.monotonic() - started) * 1000:.0f} ms")
+        with _probe_lock:
+            ttl = PROBE_TTL if connection_type else PROBE_FAILURE_TTL
+            _probe_cache.update({"type": connection_type, "expires": time.monotonic() + ttl})
+        return connection_type
+    
+    def _use_connection(self, connection_type: str):
+        """Activar la configuración elegida"""
+        self.current_config = self.remote_config if connection_type == "remote" else self.local_config
+        self.connection_type = connection_type
+        self.usuario_model = UsuarioModel(self.current_config)
+        self._schema_checked = False
+        self.cache.clear()  # Otra base de datos: lo guardado ya no vale
+    
+    def initialize_connection(self, fast: bool = True) -> Tuple[bool, str]:
         """Inicializar conexión con fallback automático"""
         print("🔗 Inicializando conexión a base de datos...")
         
+        if fast:
+            connection_type = self.probe_connections()
+            if connection_type == "remote":
+                self._use_connection("remote")
+                print("✅ Conectado a base de datos REMOTA")
+                return True, "Conectado a base de datos remota"
+            if connection_type == "local":
+                self._use_connection("local")
+                print("✅ Conectado a base de datos LOCAL")
+                return True, "Conectado a base de datos local"
+            print("❌ No se pudo conectar a ninguna base de datos")
+            return False, "No se pudo conectar a ninguna base de datos"
+        
         # Intentar conexión remota primero
         print("1️⃣ Probando conexión remota...")
         if self.test_remote_connection():
-            self.current_config = self.remote_config
-            self.connection_type = "remote"
-            self.usuario_model = UsuarioModel(self.current_config)
+            self._use_connection("remote")
+            self._schema_checked = True
             print("✅ Conectado a base de datos REMOTA")
             return True, "Conectado a base de datos remota"
         else:
@@ -61,9 +150,8 @@ class DatabaseManager:
         # Fallback a conexión local
         print("2️⃣ Probando conexión local (fallback)...")
         if self.test_local_connection():
-            self.current_config = self.local_config
-            self.connection_type = "local"
-            self.usuario_model = UsuarioModel(self.current_config)
+            self._use_connection("local")
+            self._schema_checked = True
             print("✅ Conectado a base de datos LOCAL")
             return True, "Conectado a base de datos local"
         else:
@@ -71,6 +159,19 @@ class DatabaseManager:
         
         return False, "No se pudo conectar a ninguna base de datos"
     
+    def _ensure_ready(self) -> bool:
+        """Verificar la conexión y, la primera vez, el esquema"""
+        if not self.is_connected():
+            return False
+        
+        if not self._schema_checked:
+            self._schema_checked = True
+            if self.current_config.check_schema():
+                print("✅ Tabla 'usuarios' encontrada")
+            else:
+                print("⚠️ Tabla 'usuarios' no encontrada")
+        return True
+    
     def get_connection_info(self) -> dict:
         """Obtener información de la conexión actual"""
         if not self.current_config:
@@ -79,8 +180,33 @@ class DatabaseManager:
         info = self.current_config.get_connection_info()
         info["status"] = "connected"
         info["type"] = self.connection_type
+        info["pool"] = self.current_config.get_pool_stats()
+        info["cache"] = self.get_cache_stats()
         return info
     
+    def get_cache_stats(self) -> dict:
+        """Obtener aciertos y fallos de la caché de usuarios"""
+        return self.cache.get_stats()
+    
+    def _cached(self, key, load):
+        """Leer de la caché o, si falta, cargar y guardar solo los resultados exitosos"""
+        if self.cache_ttl > 0:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        result = load()
+        if self.cache_ttl > 0 and result[0]:
+            self.cache.set(key, result)
+        return result
+    
+    def _invalidate_usuarios(self, user_id: Optional[int] = None, count: bool = False):
+        """Invalidar las lecturas afectadas por una escritura"""
+        self.cache.invalidate(CACHE_ALL)
+        if user_id is not None:
+            self.cache.invalidate(("usuario", user_id))
+        if count:
+            self.cache.invalidate(CACHE_COUNT)
+    
     def is_connected(self) -> bool:
         """Verificar si hay conexión activa"""
         return self.current_config is not None and self.usuario_model is not None
@@ -91,53 +217,104 @@ class DatabaseManager:
         self.current_config = None
         self.usuario_model = None
         self.connection_type = None
+        with _probe_lock:
+            _probe_cache.clear()
         return self.initialize_connection()
     
     def create_usuario(self, nombre: str, correo: str, password: str, rol: str = 'usuario') -> Tuple[bool, str, Optional[int]]:
         """Crear usuario usando la conexión activa"""
-        if not self.is_connected():
+        if not self._ensure_ready():
             return False, "No hay conexión a base de datos", None
         
-        return self.usuario_model.create_usuario(nombre, correo, password, rol)
+        result = self.usuario_model.create_usuario(nombre, correo, password, rol)
+        if result[0]:
+            self._invalidate_usuarios(count=True)
+        return result
+    
+    def bulk_create_usuarios(self, usuarios: List[dict], update_existing: bool = False,
+                             batch_size: int = 500) -> Tuple[bool, str, List[dict]]:
+        """Crear usuarios en lote usando la conexión activa"""
+        if not self._ensure_ready():
+            return False, "No hay conexión a base de datos", []
+        
+        result = self.usuario_model.bulk_create_usuarios(usuarios, update_existing, batch_size)
+        if result[0]:
+            self.cache.clear()
+        return result
+    
+    def bulk_update_usuarios(self, updates: List[dict], batch_size: int = 500) -> Tuple[bool, str, List[dict]]:
+        """Actualizar usuarios en lote usando la conexión activa"""
+        if not self._ensure_ready():
+            return False, "No hay conexión a base de datos", []
+        
+        result = self.usuario_model.bulk_update_usuarios(updates, batch_size)
+        if result[0]:
+            self.cache.clear()
+        return result
     
     def login_usuario(self, correo: str, password: str) -> Tuple[bool, str, Optional[dict]]:
         """Autenticar usuario usando la conexión activa"""
-        if not self.is_connected():
+        if not self._ensure_ready():
             return False, "No hay conexión a base de datos", None
         
         return self.usuario_model.login_usuario(correo, password)
     
     def get_usuario_by_id(self, user_id: int) -> Tuple[bool, str, Optional[dict]]:
         """Obtener usuario por ID usando la conexión activa"""
-        if not self.is_connected():
+        if not self._ensure_ready():
             return False, "No hay conexión a base de datos", None
         
-        return self.usuario_model.get_usuario_by_id(user_id)
+        success, message, usuario = self._cached(("usuario", user_id),
+                                                 lambda: self.usuario_model.get_usuario_by_id(user_id))
+        # Copia: quien llama puede modificar el dict sin alterar la caché
+        return success, message, dict(usuario) if usuario else usuario
     
     def get_all_usuarios(self) -> Tuple[bool, str, list]:
         """Obtener todos los usuarios usando la conexión activa"""
-        if not self.is_connected():
+        if not self._ensure_ready():
             return False, "No hay conexión a base de datos", []
         
-        return self.usuario_model.get_all_usuarios()
+        success, message, usuarios = self._cached(CACHE_ALL, self.usuario_model.get_all_usuarios)
+        return success, message, [dict(usuario) for usuario in usuarios]
+    
+    def get_usuarios_page(self, limit: int = 100, after: Optional[str] = None,
+                          fields: Optional[List[str]] = None) -> Tuple[bool, str, Dict]:
+        """Obtener una página de usuarios por cursor usando la conexión activa"""
+        if not self._ensure_ready():
+            return False, "No hay conexión a base de datos", {"usuarios": [], "next_cursor": None}
+        
+        return self.usuario_model.get_usuarios_page(limit, after, fields)
+    
+    def iter_usuarios(self, page_size: int = 100, fields: Optional[List[str]] = None) -> Iterator[dict]:
+        """Recorrer todos los usuarios página a página usando la conexión activa"""
+        if not self._ensure_ready():
+            raise RuntimeError("No hay conexión a base de datos")
+        
+        return self.usuario_model.iter_usuarios(page_size, fields)
     
     def update_usuario(self, user_id: int, **kwargs) -> Tuple[bool, str]:
         """Actualizar usuario usando la conexión activa"""
-        if not self.is_connected():
+        if not self._ensure_ready():
             return False, "No hay conexión a base de datos"
         
-        return self.usuario_model.update_usuario(user_id, **kwargs)
+        result = self.usuario_model.update_usuario(user_id, **kwargs)
+        if result[0]:
+            self._invalidate_usuarios(user_id)
+        return result
     
     def delete_usuario(self, user_id: int) -> Tuple[bool, str]:
         """Eliminar usuario usando la conexión activa"""
-        if not self.is_connected():
+        if not self._ensure_ready():
             return False, "No hay conexión a base de datos"
         
-        return self.usuario_model.delete_usuario(user_id)
+        result = self.usuario_model.delete_usuario(user_id)
+        if result[0]:
+            self._invalidate_usuarios(user_id, count=True)
+        return result
     
     def count_usuarios(self) -> Tuple[bool, str, int]:
         """Contar usuarios usando la conexión activa"""
-        if not self.is_connected():
+        if not self._ensure_ready():
             return False, "No hay conexión a base de datos", 0
         
-        return self.usuario_model.count_usuarios()
+        return self._cached(CACHE_COUNT, self.usuario_model.count_usuarios)
@@ -22,7 +22,9 @@ $method = $_SERVER['REQUEST_METHOD'] ?? 'GET';
 
 // Función para limpiar ruta
 function clean_path($path) {
-    $clean = str_replace('/modustackclean', '', $path);
+    // Quitar la query string (?limit=...&after=...) antes de comparar rutas
+    $clean = parse_url($path, PHP_URL_PATH) ?? '';
+    $clean = str_replace('/modustackclean', '', $clean);
     $clean = rtrim($clean, '/');
     return $clean;
 }
@@ -31,6 +33,21 @@ $clean_path = clean_path($path);
 
 // Función para responder JSON y terminar ejecución
 function respuesta_json($ok, $mensaje, $data = null, $codigo_http = 200) {
+    global $method;
+    
+    // ETag del contenido (sin timestamp): un GET repetido sin cambios responde 304 sin cuerpo
+    if ($method === 'GET' && $codigo_http === 200) {
+        $etag = '"' . md5(json_encode([$ok, $mensaje, $data], JSON_UNESCAPED_UNICODE)) . '"';
+        header('ETag: ' . $etag);
+        header('Cache-Control: private, no-cache');
+        
+        $if_none_match = $_SERVER['HTTP_IF_NONE_MATCH'] ?? '';
+        if ($if_none_match !== '' && trim($if_none_match) === $etag) {
+            http_response_code(304);
+            exit;
+        }
+    }
+    
     http_response_code($codigo_http);
     echo json_encode([
         "ok"      => $ok,
@@ -64,6 +81,8 @@ if ($clean_path === '' || $clean_path === '/') {
         "endpoints" => [
             "ping" => "/api/ping",
             "usuarios" => "/api/usuarios",
+            "usuario" => "/api/usuarios/{id}",
+            "conteo" => "/api/usuarios/count",
             "prueba" => "/api/prueba",
             "health" => "/api/health",
             "info" => "/api/info"
@@ -86,6 +105,8 @@ if ($clean_path === '/api/info') {
         "endpoints" => [
             "ping" => "/api/ping",
             "usuarios" => "/api/usuarios",
+            "usuario" => "/api/usuarios/{id}",
+            "conteo" => "/api/usuarios/count",
             "prueba" => "/api/prueba",
             "health" => "/api/health",
             "info" => "/api/info"
@@ -93,14 +114,49 @@ if ($clean_path === '/api/info') {
     ]);
 }
 
-// Endpoint usuarios
+// Endpoint usuarios (paginación por cursor sobre creado_en, id)
 if ($clean_path === '/api/usuarios' && $method === 'GET') {
     try {
-        $conexion = conectar_bd();
+        $campos_permitidos = ['id', 'nombre', 'correo', 'rol', 'estado', 'creado_en', 'actualizado_en'];
+        $campos = $campos_permitidos;
+        if (!empty($_GET['fields'])) {
+            $pedidos = array_map('trim', explode(',', $_GET['fields']));
+            $desconocidos = array_diff($pedidos, $campos_permitidos);
+            if ($desconocidos) {
+                respuesta_json(false, "Campos no permitidos: " . implode(', ', $desconocidos), [], 400);
+            }
+            // id y creado_en forman el cursor y se incluyen siempre
+            $campos = array_values(array_filter($campos_permitidos, function ($campo) use ($pedidos) {
+                return in_array($campo, $pedidos, true) || $campo === 'id' || $campo === 'creado_en';
+            }));
+        }
+        
+        $limit = max(1, min((int) ($_GET['limit'] ?? 50), 500));
+        $consulta = 'SELECT ' . implode(', ', $campos) . ' FROM usuarios';
+        $tipos = '';
+        $valores = [];
         
-        $limit = 50;
-        $stmt = $conexion->prepare('SELECT id, nombre, correo, rol, estado, creado_en FROM usuarios LIMIT ?');
-        $stmt->bind_param('i', $limit);
+        if (!empty($_GET['after'])) {
+            $separador = strrpos($_GET['after'], '|');
+            $cursor_fecha = $separador === false ? '' : substr($_GET['after'], 0, $separador);
+            $cursor_id = $separador === false ? '' : substr($_GET['after'], $separador + 1);
+            if ($cursor_fecha === '' || !ctype_digit($cursor_id)) {
+                respuesta_json(false, "Cursor inválido", [], 400);
+            }
+            $cursor_id = (int) $cursor_id;
+            $consulta .= ' WHERE creado_en < ? OR (creado_en = ? AND id < ?)';
+            $tipos .= 'ssi';
+            array_push($valores, $cursor_fecha, $cursor_fecha, $cursor_id);
+        }
+        
+        // Una fila de más indica que hay otra página
+        $consulta .= ' ORDER BY creado_en DESC, id DESC LIMIT ?';
+        $tipos .= 'i';
+        $valores[] = $limit + 1;
+        
+        $conexion = conectar_bd();
+        $stmt = $conexion->prepare($consulta);
+        $stmt->bind_param($tipos, ...$valores);
         
         if (!$stmt->execute()) {
             throw new Exception('Error ejecutando consulta: ' . $stmt->error);
@@ -109,9 +165,17 @@ if ($clean_path === '/api/usuarios' && $method === 'GET') {
         $res = $stmt->get_result();
         $data = $res->fetch_all(MYSQLI_ASSOC);
         
+        $next_cursor = null;
+        if (count($data) > $limit) {
+            $data = array_slice($data, 0, $limit);
+            $ultimo = $data[$limit - 1];
+            $next_cursor = $ultimo['creado_en'] . '|' . $ultimo['id'];
+        }
+        
         respuesta_json(true, "Usuarios obtenidos exitosamente", [
             "usuarios" => $data,
-            "count" => count($data)
+            "count" => count($data),
+            "next_cursor" => $next_cursor
         ]);
         
     } catch (Exception $e) {
@@ -125,6 +189,69 @@ if ($clean_path === '/api/usuarios' && $method === 'GET') {
     }
 }
 
+// Endpoint conteo de usuarios
+if ($clean_path === '/api/usuarios/count' && $method === 'GET') {
+    try {
+        $conexion = conectar_bd();
+        
+        $resultado = $conexion->query('SELECT COUNT(*) AS total FROM usuarios');
+        
+        if (!$resultado) {
+            throw new Exception('Error ejecutando consulta: ' . $conexion->error);
+        }
+        
+        $fila = $resultado->fetch_assoc();
+        
+        respuesta_json(true, "Conteo exitoso", [
+            "count" => (int) $fila['total']
+        ]);
+        
+    } catch (Exception $e) {
+        respuesta_json(false, "Error contando usuarios", [
+            "error" => $e->getMessage()
+        ], 500);
+    } finally {
+        if (isset($conexion)) {
+            $conexion->close();
+        }
+    }
+}
+
+// Endpoint usuario por ID
+if (preg_match('#^/api/usuarios/(\d+)$#', $clean_path, $coincidencia) && $method === 'GET') {
+    try {
+        $conexion = conectar_bd();
+        
+        $id = (int) $coincidencia[1];
+        $stmt = $conexion->prepare('SELECT id, nombre, correo, rol, estado, creado_en FROM usuarios WHERE id = ?');
+        $stmt->bind_param('i', $id);
+        
+        if (!$stmt->execute()) {
+            throw new Exception('Error ejecutando consulta: ' . $stmt->error);
+        }
+        
+        $res = $stmt->get_result();
+        $usuario = $res->fetch_assoc();
+        
+        if (!$usuario) {
+            respuesta_json(false, "Usuario no encontrado", [], 404);
+        }
+        
+        respuesta_json(true, "Usuario encontrado", [
+            "usuario" => $usuario
+        ]);
+        
+    } catch (Exception $e) {
+        respuesta_json(false, "Error obteniendo usuario", [
+            "error" => $e->getMessage()
+        ], 500);
+    } finally {
+        if (isset($conexion)) {
+            $conexion->close();
+        }
+    }
+}
+
 // Endpoint login
 if ($clean_path === '/api/login' && $method === 'POST') {
     try {
@@ -251,6 +378,8 @@ respuesta_json(false, "Endpoint no encontrado", [
     "available_endpoints" => [
         "/api/ping",
         "/api/usuarios",
+        "/api/usuarios/{id}",
+        "/api/usuarios/count",
         "/api/prueba",
         "/api/health",
         "/api/info"
@@ -5,6 +5,8 @@ ModuStackClean - Aplicación Principal
 Sistema de gestión y organización de archivos
 """
 
+import multiprocessing
+
 import flet as ft
 from config.app_config import AppConfig
 from config.api_manager import APIManager
@@ -18,7 +20,7 @@ class ModuStackCleanApp:
     
     def __init__(self):
         self.config = AppConfig()
-        self.api_manager = APIManager()
+        self.api_manager = APIManager()  # El ping corre en segundo plano
         self.session_manager = SessionManager()
         self.current_page = None
         self.current_view = None
@@ -114,4 +116,7 @@ def main():
     ft.app(target=app.main)
 
 if __name__ == "__main__":
+    # En el exe de PyInstaller los workers de ProcessPoolExecutor relanzan
+    # este módulo; sin esto abrirían nuevas ventanas en lugar de trabajar
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -7,24 +7,64 @@ Operaciones CRUD para la tabla usuarios
 
 import mysql.connector
 from mysql.connector import Error
-import hashlib
 import json
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
+
+from utils.password_hasher import PasswordHasher, get_default_hasher
+
+# Columnas que se pueden pedir en los listados (nunca la contraseña)
+USUARIO_FIELDS = ('id', 'nombre', 'correo', 'rol', 'estado', 'creado_en', 'actualizado_en')
+
+# Tamaño de página por defecto y máximo de los listados por cursor
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Filas por sentencia en las operaciones masivas
+BULK_BATCH_SIZE = 500
+
+# Roles válidos (ENUM de la tabla)
+ROLES = ('admin', 'usuario')
+
+# Campos que se pueden modificar en una actualización
+UPDATABLE_FIELDS = ('nombre', 'correo', 'password', 'rol', 'estado')
+
+# Consultas fijas que se preparan una vez por conexión del pool. El cursor
+# preparado reutiliza la sentencia solo si recibe el mismo objeto de texto,
+# por eso deben usarse siempre estas constantes.
+LOGIN_QUERY = ("SELECT id, nombre, correo, password, rol, estado, creado_en, actualizado_en "
+               "FROM usuarios WHERE correo = %s AND estado = 1")
+BY_ID_QUERY = "SELECT id, nombre, correo, rol, estado, creado_en, actualizado_en FROM usuarios WHERE id = %s"
+COUNT_QUERY = "SELECT COUNT(*) AS total FROM usuarios"
+
+def encode_cursor(usuario: Dict) -> str:
+    """Cursor de paginación a partir de la última fila de una página"""
+    creado_en = usuario['creado_en']
+    if isinstance(creado_en, datetime):
+        creado_en = creado_en.strftime('%Y-%m-%d %H:%M:%S')
+    return f"{creado_en}|{usuario['id']}"
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Separar un cursor en (creado_en, id)"""
+    creado_en, _, user_id = cursor.rpartition('|')
+    if not creado_en or not user_id.isdigit():
+        raise ValueError(f"Cursor inválido: {cursor}")
+    return creado_en, int(user_id)
 
 class UsuarioModel:
     """Modelo para manejar operaciones CRUD de usuarios"""
     
-    def __init__(self, db_config):
+    def __init__(self, db_config, hasher: Optional[PasswordHasher] = None):
         self.db_config = db_config
+        self.hasher = hasher or get_default_hasher()
     
     def _hash_password(self, password: str) -> str:
-        """Encriptar contraseña usando SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Encriptar contraseña con sal (scrypt o PBKDF2 según AppConfig)"""
+        return self.hasher.hash(password)
     
     def _verify_password(self, password: str, hashed_password: str) -> bool:
-        """Verificar contraseña"""
-        return self._hash_password(password) == hashed_password
+        """Verificar contraseña (acepta también los hashes SHA-256 antiguos)"""
+        return self.hasher.verify(password, hashed_password)
     
     def create_usuario(self, nombre: str, correo: str, password: str, rol: str = 'usuario') -> Tuple[bool, str, Optional[int]]:
         """Crear un nuevo usuario (CREATE)"""
@@ -33,37 +73,275 @@ class UsuarioModel:
             if not connection:
                 return False, "Error de conexión a la base de datos", None
             
-            cursor = connection.cursor()
-            
-            # Verificar si el correo ya existe
-            cursor.execute("SELECT id FROM usuarios WHERE correo = %s", (correo,))
-            if cursor.fetchone():
-                cursor.close()
+            try:
+                cursor = connection.cursor()
+                try:
+                    # Verificar si el correo ya existe
+                    cursor.execute("SELECT id FROM usuarios WHERE correo = %s", (correo,))
+                    if cursor.fetchone():
+                        return False, "El correo ya está registrado", None
+                    
+                    # Encriptar contraseña
+                    hashed_password = self._hash_password(password)
+                    
+                    # Insertar nuevo usuario
+                    insert_query = """
+                    INSERT INTO usuarios (nombre, correo, password, rol) 
+                    VALUES (%s, %s, %s, %s)
+                    """
+                    cursor.execute(insert_query, (nombre, correo, hashed_password, rol))
+                    
+                    # Obtener el ID del usuario creado
+                    user_id = cursor.lastrowid
+                    
+                    connection.commit()
+                finally:
+                    cursor.close()
+            finally:
                 connection.close()
-                return False, "El correo ya está registrado", None
-            
-            # Encriptar contraseña
-            hashed_password = self._hash_password(password)
-            
-            # Insertar nuevo usuario
-            insert_query = """
-            INSERT INTO usuarios (nombre, correo, password, rol) 
-            VALUES (%s, %s, %s, %s)
-            """
-            cursor.execute(insert_query, (nombre, correo, hashed_password, rol))
-            
-            # Obtener el ID del usuario creado
-            user_id = cursor.lastrowid
-            
-            connection.commit()
-            cursor.close()
-            connection.close()
             
             return True, "Usuario creado exitosamente", user_id
             
         except Error as e:
             return False, f"Error creando usuario: {str(e)}", None
     
+    def bulk_create_usuarios(self, usuarios: List[Dict], update_existing: bool = False,
+                             batch_size: int = BULK_BATCH_SIZE) -> Tuple[bool, str, List[Dict]]:
+        """Crear muchos usuarios en una transacción con inserciones multi-fila
+        
+        Cada usuario es un dict con nombre, correo, password y rol opcional.
+        Se valida todo en memoria y luego, por lote, una consulta averigua
+        qué correos ya existen y un solo INSERT ... ON DUPLICATE KEY UPDATE
+        inserta el resto (o, con update_existing, actualiza los existentes).
+        Devuelve un resultado por fila en el orden de entrada con el estado
+        created, updated, duplicate o invalid.
+        """
+        outcomes = [{"index": index, "correo": (usuario.get('correo') or '').strip(), "id": None,
+                     "status": None, "error": None} for index, usuario in enumerate(usuarios)]
+        
+        # Validación en memoria (incluye correos repetidos dentro de la misma carga)
+        rows = []
+        seen = set()
+        for outcome, usuario in zip(outcomes, usuarios):
+            error = self._validate_new(usuario)
+            key = outcome["correo"].lower()
+            if not error and key in seen:
+                error = "Correo repetido en la carga"
+            if error:
+                outcome["status"], outcome["error"] = "invalid", error
+                continue
+            seen.add(key)
+            rows.append((outcome, usuario))
+        
+        if not rows:
+            return False, "No hay usuarios válidos para crear", outcomes
+        
+        # Los hashes con sal son costosos: se reparten en el pool del hasher
+        hashes = self.hasher.hash_many([usuario['password'] for _, usuario in rows])
+        rows = [(outcome, (usuario['nombre'].strip(), outcome["correo"], hashed, usuario.get('rol') or 'usuario'))
+                for (outcome, usuario), hashed in zip(rows, hashes)]
+        
+        if update_existing:
+            on_duplicate = "nombre = VALUES(nombre), password = VALUES(password), rol = VALUES(rol)"
+        else:
+            on_duplicate = "id = id"  # Carrera con otra alta: se conserva la fila existente
+        insert_query = f"""
+        INSERT INTO usuarios (nombre, correo, password, rol) 
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE {on_duplicate}
+        """
+        
+        def write(cursor, batch):
+            existing = self._ids_by_correo(cursor, [outcome["correo"] for outcome, _ in batch])
+            values = []
+            for outcome, row in batch:
+                user_id = existing.get(outcome["correo"].lower())
+                if user_id is None:
+                    outcome["status"] = "created"
+                    values.append(row)
+                else:
+                    outcome["id"] = user_id
+                    if update_existing:
+                        outcome["status"] = "updated"
+                        values.append(row)
+                    else:
+                        outcome["status"], outcome["error"] = "duplicate", "El correo ya está registrado"
+            if not values:
+                return
+            cursor.executemany(insert_query, values)
+            
+            created = [outcome for outcome, _ in batch if outcome["status"] == "created"]
+            if created:
+                ids = self._ids_by_correo(cursor, [outcome["correo"] for outcome in created])
+                for outcome in created:
+                    outcome["id"] = ids.get(outcome["correo"].lower())
+        
+        success, message = self._run_batches(rows, batch_size, write)
+        if not success:
+            for outcome, _ in rows:
+                outcome["status"], outcome["id"], outcome["error"] = "failed", None, message
+            return False, f"Error en la carga masiva: {message}", outcomes
+        
+        summary = self._summarize(outcomes)
+        return True, f"Carga masiva completada: {summary}", outcomes
+    
+    def bulk_update_usuarios(self, updates: List[Dict],
+                             batch_size: int = BULK_BATCH_SIZE) -> Tuple[bool, str, List[Dict]]:
+        """Actualizar muchos usuarios en una transacción
+        
+        Cada actualización es un dict con id y los campos a cambiar. Por
+        lote se consultan juntos los ids existentes y los correos en uso, y
+        las filas que cambian las mismas columnas se envían con un solo
+        executemany. Estados por fila: updated, not_found, conflict o invalid.
+        """
+        outcomes = [{"index": index, "id": update.get('id'), "status": None, "error": None}
+                    for index, update in enumerate(updates)]
+        
+        rows = []
+        seen_ids = set()
+        seen_correos = set()
+        for outcome, update in zip(outcomes, updates):
+            fields = {field: update[field] for field in UPDATABLE_FIELDS if update.get(field) is not None}
+            error = self._validate_update(update.get('id'), fields)
+            if not error and update['id'] in seen_ids:
+                error = "Usuario repetido en la carga"
+            if not error and 'correo' in fields:
+                fields['correo'] = fields['correo'].strip()
+                if fields['correo'].lower() in seen_correos:
+                    error = "Correo repetido en la carga"
+            if error:
+                outcome["status"], outcome["error"] = "invalid", error
+                continue
+            seen_ids.add(update['id'])
+            if 'correo' in fields:
+                seen_correos.add(fields['correo'].lower())
+            rows.append((outcome, fields))
+        
+        if not rows:
+            return False, "No hay actualizaciones válidas", outcomes
+        
+        with_password = [fields for _, fields in rows if 'password' in fields]
+        for fields, hashed in zip(with_password, self.hasher.hash_many([fields['password'] for fields in with_password])):
+            fields['password'] = hashed
+        
+        def write(cursor, batch):
+            ids = [outcome["id"] for outcome, _ in batch]
+            placeholders = ', '.join(['%s'] * len(ids))
+            cursor.execute(f"SELECT id FROM usuarios WHERE id IN ({placeholders})", ids)
+            existing = {row[0] for row in cursor.fetchall()}
+            owners = self._ids_by_correo(cursor, [fields['correo'] for _, fields in batch if 'correo' in fields])
+            
+            groups: Dict[Tuple[str, ...], List[Tuple]] = {}
+            for outcome, fields in batch:
+                if outcome["id"] not in existing:
+                    outcome["status"], outcome["error"] = "not_found", "Usuario no encontrado"
+                    continue
+                owner = owners.get(fields['correo'].lower()) if 'correo' in fields else None
+                if owner is not None and owner != outcome["id"]:
+                    outcome["status"], outcome["error"] = "conflict", "El correo ya está en uso por otro usuario"
+                    continue
+                outcome["status"] = "updated"
+                columns = tuple(field for field in UPDATABLE_FIELDS if field in fields)
+                groups.setdefault(columns, []).append(tuple(fields[field] for field in columns) + (outcome["id"],))
+            
+            for columns, values in groups.items():
+                assignments = ', '.join(f"{column} = %s" for column in columns)
+                cursor.executemany(f"UPDATE usuarios SET {assignments} WHERE id = %s", values)
+        
+        success, message = self._run_batches(rows, batch_size, write)
+        if not success:
+            for outcome, _ in rows:
+                outcome["status"], outcome["error"] = "failed", message
+            return False, f"Error en la actualización masiva: {message}", outcomes
+        
+        summary = self._summarize(outcomes)
+        return True, f"Actualización masiva completada: {summary}", outcomes
+    
+    def _run_batches(self, rows: List, batch_size: int, write) -> Tuple[bool, str]:
+        """Ejecutar write(cursor, lote) por lotes dentro de una sola transacción"""
+        connection = self.db_config.get_connection()
+        if not connection:
+            return False, "Error de conexión a la base de datos"
+        
+        batch_size = max(1, batch_size)
+        autocommit = None
+        cursor = None
+        try:
+            autocommit = connection.autocommit
+            connection.autocommit = False
+            cursor = connection.cursor()
+            for start in range(0, len(rows), batch_size):
+                write(cursor, rows[start:start + batch_size])
+            connection.commit()
+            return True, "OK"
+        except Error as e:
+            try:
+                connection.rollback()
+            except Error:
+                pass
+            return False, str(e)
+        finally:
+            try:
+                if cursor is not None:
+                    cursor.close()
+                if autocommit is not None:
+                    connection.autocommit = autocommit
+            except Error:
+                # No se pudo restaurar: no devolverla al pool en ese estado
+                discard = getattr(connection, 'discard', None)
+                if discard:
+                    discard()
+            finally:
+                connection.close()
+    
+    @staticmethod
+    def _ids_by_correo(cursor, correos: List[str]) -> Dict[str, int]:
+        """Obtener en una consulta los ids de los correos que ya existen"""
+        if not correos:
+            return {}
+        placeholders = ', '.join(['%s'] * len(correos))
+        cursor.execute(f"SELECT id, correo FROM usuarios WHERE correo IN ({placeholders})", correos)
+        return {correo.lower(): user_id for user_id, correo in cursor.fetchall()}
+    
+    @staticmethod
+    def _validate_new(usuario: Dict) -> Optional[str]:
+        """Validar en memoria los datos de un usuario nuevo"""
+        if not (usuario.get('nombre') or '').strip():
+            return "El nombre es requerido"
+        correo = (usuario.get('correo') or '').strip()
+        if '@' not in correo or '.' not in correo:
+            return "Correo inválido"
+        if not usuario.get('password'):
+            return "La contraseña es requerida"
+        if usuario.get('rol') and usuario['rol'] not in ROLES:
+            return f"Rol inválido: {usuario['rol']}"
+        return None
+    
+    @staticmethod
+    def _validate_update(user_id, fields: Dict) -> Optional[str]:
+        """Validar en memoria una actualización"""
+        if not isinstance(user_id, int):
+            return "ID de usuario inválido"
+        if not fields:
+            return "No se proporcionaron campos para actualizar"
+        if 'nombre' in fields and not str(fields['nombre']).strip():
+            return "El nombre es requerido"
+        if 'correo' in fields and ('@' not in fields['correo'] or '.' not in fields['correo']):
+            return "Correo inválido"
+        if 'rol' in fields and fields['rol'] not in ROLES:
+            return f"Rol inválido: {fields['rol']}"
+        if 'estado' in fields and fields['estado'] not in (0, 1):
+            return f"Estado inválido: {fields['estado']}"
+        return None
+    
+    @staticmethod
+    def _summarize(outcomes: List[Dict]) -> str:
+        """Resumir los estados de una operación masiva"""
+        counts: Dict[str, int] = {}
+        for outcome in outcomes:
+            counts[outcome["status"]] = counts.get(outcome["status"], 0) + 1
+        return ', '.join(f"{count} {status}" for status, count in counts.items())
+    
     def get_usuario_by_id(self, user_id: int) -> Tuple[bool, str, Optional[Dict]]:
         """Obtener usuario por ID (READ)"""
         try:
@@ -71,22 +349,53 @@ class UsuarioModel:
             if not connection:
                 return False, "Error de conexión a la base de datos", None
             
-            cursor = connection.cursor(dictionary=True)
-            
-            cursor.execute("SELECT id, nombre, correo, rol, estado, creado_en, actualizado_en FROM usuarios WHERE id = %s", (user_id,))
-            usuario = cursor.fetchone()
-            
-            cursor.close()
-            connection.close()
+            try:
+                rows = self._fetch_prepared(connection, BY_ID_QUERY, (user_id,))
+            finally:
+                connection.close()
             
-            if usuario:
-                return True, "Usuario encontrado", usuario
+            if rows:
+                return True, "Usuario encontrado", rows[0]
             else:
                 return False, "Usuario no encontrado", None
                 
         except Error as e:
             return False, f"Error obteniendo usuario: {str(e)}", None
     
+    def _fetch_prepared(self, connection, query: str, params: Tuple = ()) -> List[Dict]:
+        """Ejecutar una consulta fija con su sentencia preparada en el servidor
+        
+        En una conexión del pool el cursor preparado se guarda en su slot y
+        se reutiliza mientras viva la conexión física: MySQL analiza la
+        consulta una sola vez y cada llamada solo envía los parámetros. Sin
+        pool se prepara, se usa y se cierra.
+        """
+        slot = getattr(connection, 'slot', None)
+        if slot is None:
+            cursor = connection.cursor(prepared=True, dictionary=True)
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+        
+        statements = slot.setdefault('prepared', {})
+        cursor = statements.get(query)
+        if cursor is None:
+            cursor = connection.cursor(prepared=True, dictionary=True)
+            statements[query] = cursor
+        try:
+            cursor.execute(query, params)
+            # Leer todo: una fila pendiente impediría reutilizar el cursor
+            return cursor.fetchall()
+        except Error:
+            statements.pop(query, None)
+            try:
+                cursor.close()
+            except Error:
+                pass
+            raise
+    
     def get_usuario_by_email(self, correo: str) -> Tuple[bool, str, Optional[Dict]]:
         """Obtener usuario por correo electrónico"""
         try:
@@ -94,13 +403,15 @@ class UsuarioModel:
             if not connection:
                 return False, "Error de conexión a la base de datos", None
             
-            cursor = connection.cursor(dictionary=True)
-            
-            cursor.execute("SELECT * FROM usuarios WHERE correo = %s", (correo,))
-            usuario = cursor.fetchone()
-            
-            cursor.close()
-            connection.close()
+            try:
+                cursor = connection.cursor(dictionary=True)
+                try:
+                    cursor.execute("SELECT * FROM usuarios WHERE correo = %s", (correo,))
+                    usuario = cursor.fetchone()
+                finally:
+                    cursor.close()
+            finally:
+                connection.close()
             
             if usuario:
                 return True, "Usuario encontrado", usuario
@@ -117,116 +428,201 @@ class UsuarioModel:
             if not connection:
                 return False, "Error de conexión a la base de datos", []
             
-            cursor = connection.cursor(dictionary=True)
-            
-            cursor.execute("SELECT id, nombre, correo, rol, estado, creado_en, actualizado_en FROM usuarios ORDER BY creado_en DESC")
-            usuarios = cursor.fetchall()
-            
-            cursor.close()
-            connection.close()
+            try:
+                cursor = connection.cursor(dictionary=True)
+                try:
+                    cursor.execute("SELECT id, nombre, correo, rol, estado, creado_en, actualizado_en FROM usuarios ORDER BY creado_en DESC")
+                    usuarios = cursor.fetchall()
+                finally:
+                    cursor.close()
+            finally:
+                connection.close()
             
             return True, f"Se encontraron {len(usuarios)} usuarios", usuarios
                 
         except Error as e:
             return False, f"Error obteniendo usuarios: {str(e)}", []
     
+    def get_usuarios_page(self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None,
+                          fields: Optional[List[str]] = None) -> Tuple[bool, str, Dict]:
+        """Obtener una página de usuarios ordenada por (creado_en, id) descendente
+        
+        La página siguiente se pide con el next_cursor devuelto; la consulta
+        continúa desde esa fila por el índice en lugar de saltar filas con
+        OFFSET. id y creado_en se incluyen siempre porque forman el cursor.
+        """
+        page = {"usuarios": [], "next_cursor": None}
+        try:
+            columns = self._project(fields)
+            limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        except ValueError as e:
+            return False, str(e), page
+        
+        query = f"SELECT {', '.join(columns)} FROM usuarios"
+        params = []
+        if after:
+            try:
+                creado_en, last_id = decode_cursor(after)
+            except ValueError as e:
+                return False, str(e), page
+            query += " WHERE creado_en < %s OR (creado_en = %s AND id < %s)"
+            params = [creado_en, creado_en, last_id]
+        query += " ORDER BY creado_en DESC, id DESC LIMIT %s"
+        params.append(limit + 1)
+        
+        try:
+            connection = self.db_config.get_connection()
+            if not connection:
+                return False, "Error de conexión a la base de datos", page
+            
+            try:
+                cursor = connection.cursor(dictionary=True)
+                try:
+                    cursor.execute(query, params)
+                    usuarios = cursor.fetchall()
+                finally:
+                    cursor.close()
+            finally:
+                connection.close()
+            
+            # Se pide una fila de más para saber si hay otra página
+            if len(usuarios) > limit:
+                usuarios = usuarios[:limit]
+                page["next_cursor"] = encode_cursor(usuarios[-1])
+            page["usuarios"] = usuarios
+            return True, f"Se encontraron {len(usuarios)} usuarios", page
+                
+        except Error as e:
+            return False, f"Error obteniendo usuarios: {str(e)}", page
+    
+    def iter_usuarios(self, page_size: int = DEFAULT_PAGE_SIZE,
+                      fields: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Recorrer todos los usuarios página a página con memoria constante
+        
+        A diferencia del resto del modelo, un error de base de datos se
+        propaga como RuntimeError para no confundirlo con el final del listado.
+        """
+        after = None
+        while True:
+            success, message, page = self.get_usuarios_page(page_size, after, fields)
+            if not success:
+                raise RuntimeError(message)
+            yield from page["usuarios"]
+            after = page["next_cursor"]
+            if not after:
+                return
+    
+    @staticmethod
+    def _project(fields: Optional[List[str]]) -> List[str]:
+        """Validar las columnas pedidas (id y creado_en siempre incluidas)"""
+        if not fields:
+            return list(USUARIO_FIELDS)
+        unknown = [field for field in fields if field not in USUARIO_FIELDS]
+        if unknown:
+            raise ValueError(f"Campos no permitidos: {', '.join(unknown)}")
+        return [field for field in USUARIO_FIELDS if field in fields or field in ('id', 'creado_en')]
+    
     def update_usuario(self, user_id: int, nombre: str = None, correo: str = None, 
                       password: str = None, rol: str = None, estado: int = None) -> Tuple[bool, str]:
-        """Actualizar usuario (UPDATE)"""
+        """Actualizar usuario (UPDATE)
+        
+        Una sola sentencia: la existencia se deduce de rowcount (la conexión
+        usa FOUND_ROWS, así que cuenta filas encontradas aunque no cambien) y
+        el correo duplicado del índice único.
+        """
+        # Construir query de actualización dinámicamente
+        update_fields = []
+        values = []
+        
+        if nombre is not None:
+            update_fields.append("nombre = %s")
+            values.append(nombre)
+        
+        if correo is not None:
+            update_fields.append("correo = %s")
+            values.append(correo)
+        
+        if password is not None:
+            hashed_password = self._hash_password(password)
+            update_fields.append("password = %s")
+            values.append(hashed_password)
+        
+        if rol is not None:
+            update_fields.append("rol = %s")
+            values.append(rol)
+        
+        if estado is not None:
+            update_fields.append("estado = %s")
+            values.append(estado)
+        
+        if not update_fields:
+            return False, "No se proporcionaron campos para actualizar"
+        
+        # Agregar el ID al final de los valores
+        values.append(user_id)
+        
         try:
             connection = self.db_config.get_connection()
             if not connection:
                 return False, "Error de conexión a la base de datos"
             
-            cursor = connection.cursor()
-            
-            # Verificar si el usuario existe
-            cursor.execute("SELECT id FROM usuarios WHERE id = %s", (user_id,))
-            if not cursor.fetchone():
-                cursor.close()
-                connection.close()
-                return False, "Usuario no encontrado"
-            
-            # Construir query de actualización dinámicamente
-            update_fields = []
-            values = []
-            
-            if nombre is not None:
-                update_fields.append("nombre = %s")
-                values.append(nombre)
-            
-            if correo is not None:
-                # Verificar si el correo ya existe en otro usuario
-                cursor.execute("SELECT id FROM usuarios WHERE correo = %s AND id != %s", (correo, user_id))
-                if cursor.fetchone():
+            try:
+                cursor = connection.cursor()
+                try:
+                    update_query = f"UPDATE usuarios SET {', '.join(update_fields)} WHERE id = %s"
+                    cursor.execute(update_query, values)
+                    found = cursor.rowcount
+                    self._commit(connection)
+                finally:
                     cursor.close()
-                    connection.close()
-                    return False, "El correo ya está en uso por otro usuario"
-                update_fields.append("correo = %s")
-                values.append(correo)
-            
-            if password is not None:
-                hashed_password = self._hash_password(password)
-                update_fields.append("password = %s")
-                values.append(hashed_password)
-            
-            if rol is not None:
-                update_fields.append("rol = %s")
-                values.append(rol)
-            
-            if estado is not None:
-                update_fields.append("estado = %s")
-                values.append(estado)
-            
-            if not update_fields:
-                cursor.close()
+            finally:
                 connection.close()
-                return False, "No se proporcionaron campos para actualizar"
-            
-            # Agregar el ID al final de los valores
-            values.append(user_id)
-            
-            # Ejecutar actualización
-            update_query = f"UPDATE usuarios SET {', '.join(update_fields)} WHERE id = %s"
-            cursor.execute(update_query, values)
-            
-            connection.commit()
-            cursor.close()
-            connection.close()
             
+            if not found:
+                return False, "Usuario no encontrado"
             return True, "Usuario actualizado exitosamente"
             
         except Error as e:
+            if e.errno == 1062:  # ER_DUP_ENTRY: índice único de correo
+                return False, "El correo ya está en uso por otro usuario"
             return False, f"Error actualizando usuario: {str(e)}"
     
     def delete_usuario(self, user_id: int) -> Tuple[bool, str]:
-        """Eliminar usuario (DELETE)"""
+        """Eliminar usuario (DELETE) en una sola sentencia"""
         try:
             connection = self.db_config.get_connection()
             if not connection:
                 return False, "Error de conexión a la base de datos"
             
-            cursor = connection.cursor()
-            
-            # Verificar si el usuario existe
-            cursor.execute("SELECT id FROM usuarios WHERE id = %s", (user_id,))
-            if not cursor.fetchone():
-                cursor.close()
+            try:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute("DELETE FROM usuarios WHERE id = %s", (user_id,))
+                    found = cursor.rowcount
+                    self._commit(connection)
+                finally:
+                    cursor.close()
+            finally:
                 connection.close()
-                return False, "Usuario no encontrado"
-            
-            # Eliminar usuario
-            cursor.execute("DELETE FROM usuarios WHERE id = %s", (user_id,))
-            
-            connection.commit()
-            cursor.close()
-            connection.close()
             
+            if not found:
+                return False, "Usuario no encontrado"
             return True, "Usuario eliminado exitosamente"
             
         except Error as e:
             return False, f"Error eliminando usuario: {str(e)}"
     
+    @staticmethod
+    def _commit(connection):
+        """Confirmar solo si quedó una transacción abierta
+        
+        Con autocommit la sentencia ya quedó confirmada y COMMIT sería otro
+        viaje al servidor. in_transaction se lee del estado del último
+        paquete, sin consultar al servidor (a diferencia de autocommit).
+        """
+        if connection.in_transaction:
+            connection.commit()
+    
     def login_usuario(self, correo: str, password: str) -> Tuple[bool, str, Optional[Dict]]:
         """Autenticar usuario"""
         try:
@@ -234,21 +630,22 @@ class UsuarioModel:
             if not connection:
                 return False, "Error de conexión a la base de datos", None
             
-            cursor = connection.cursor(dictionary=True)
-            
             # Buscar usuario por correo
-            cursor.execute("SELECT * FROM usuarios WHERE correo = %s AND estado = 1", (correo,))
-            usuario = cursor.fetchone()
-            
-            cursor.close()
-            connection.close()
+            try:
+                rows = self._fetch_prepared(connection, LOGIN_QUERY, (correo,))
+            finally:
+                connection.close()
             
-            if not usuario:
+            if not rows:
                 return False, "Usuario no encontrado o inactivo", None
+            usuario = rows[0]
             
-            # Verificar contraseña
-            if not self._verify_password(password, usuario['password']):
+            # Verificar contraseña (y migrar hashes SHA-256 antiguos o de otro costo)
+            valid, new_hash = self.hasher.verify_and_update(password, usuario['password'])
+            if not valid:
                 return False, "Contraseña incorrecta", None
+            if new_hash:
+                self._store_rehash(usuario['id'], new_hash)
             
             # Remover contraseña del resultado
             usuario.pop('password', None)
@@ -258,6 +655,25 @@ class UsuarioModel:
         except Error as e:
             return False, f"Error en login: {str(e)}", None
     
+    def _store_rehash(self, user_id: int, new_hash: str):
+        """Guardar el hash actualizado tras un login correcto (si falla, se reintenta en el próximo)"""
+        try:
+            connection = self.db_config.get_connection()
+            if not connection:
+                return
+            try:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute("UPDATE usuarios SET password = %s WHERE id = %s", (new_hash, user_id))
+                    self._commit(connection)
+                finally:
+                    cursor.close()
+            finally:
+                connection.close()
+            print(f"🔐 Hash de contraseña actualizado para el usuario {user_id}")
+        except Error as e:
+            print(f"⚠️ No se pudo actualizar el hash de contraseña: {e}")
+    
     def count_usuarios(self) -> Tuple[bool, str, int]:
         """Contar total de usuarios"""
         try:
@@ -265,13 +681,10 @@ class UsuarioModel:
             if not connection:
                 return False, "Error de conexión a la base de datos", 0
             
-            cursor = connection.cursor()
-            
-            cursor.execute("SELECT COUNT(*) FROM usuarios")
-            count = cursor.fetchone()[0]
-            
-            cursor.close()
-            connection.close()
+            try:
+                count = self._fetch_prepared(connection, COUNT_QUERY)[0]['total']
+            finally:
+                connection.close()
             
             return True, f"Total de usuarios: {count}", count
                 
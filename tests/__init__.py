@@ -9,6 +9,20 @@
 # - setup_database.py: Configuración de BD remota
 # - setup_database_local.py: Configuración de BD local
 # - test_integration.py: Test de integración completa
+# - test_file_scanner.py: Test del motor de escaneo de archivos
+# - test_file_index.py: Test del índice persistente de archivos
+# - test_duplicate_finder.py: Test del buscador de duplicados
+# - test_file_hasher.py: Test del hash de archivos por mmap y readinto
+# - test_file_organizer.py: Test del organizador de archivos por reglas
+# - test_move_journal.py: Test del diario de movimientos (reanudar y deshacer)
+# - test_file_watcher.py: Test del vigilante de archivos (inotify y sondeo)
+# - test_connection_pool.py: Test del pool de conexiones MySQL
+# - test_database_probe.py: Test de la prueba rápida de conexión
+# - test_api_manager.py: Test del arranque sin bloqueo del gestor de API
+# - test_ttl_cache.py: Test de la caché LRU con vencimiento
+# - test_usuario_model.py: Test de las consultas del modelo de usuario
+# - test_password_hasher.py: Test del hash de contraseñas con sal
+# - test_database_cache.py: Test de la caché de usuarios del gestor de BD
 # - INDICE_TESTS.md: Índice de navegación de tests
 #
 # © 2025 RuloSoluciones. Todos los derechos reservados.
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark del Hash de Archivos - ModuStackClean
+Compara lecturas con buffer, readinto y mmap sobre un archivo grande
+"""
+
+import sys
+import os
+import hashlib
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_hasher import hash_file
+
+FILE_SIZE = 512 * 1024 * 1024
+
+def legacy_hash(path):
+    """Hash original: f.read() crea un objeto bytes por bloque"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def measure(label, hasher, path):
+    """Medir el rendimiento de un método de hash"""
+    start = time.perf_counter()
+    result = hasher(path)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {FILE_SIZE / (1024 * 1024) / elapsed:>10,.0f} MB/s  ({elapsed:.3f} s)")
+    return result
+
+def main():
+    """Función principal del benchmark"""
+    print("🚀 BENCHMARK DEL HASH DE ARCHIVOS")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as base:
+        path = os.path.join(base, "instalador.zip")
+        with open(path, "wb") as f:
+            block = os.urandom(1024 * 1024)
+            for _ in range(FILE_SIZE // len(block)):
+                f.write(block)
+        print(f"📊 Archivo de prueba: {FILE_SIZE / (1024 * 1024):,.0f} MB (en caché del sistema)\n")
+
+        expected = measure("f.read() por bloque (original)", legacy_hash, path)
+        reads = measure("readinto sobre bytearray", lambda p: hash_file(p, use_mmap=False), path)
+        mapped = measure("mmap + memoryview", hash_file, path)
+        assert expected == reads == mapped, "❌ Todos los métodos deben dar el mismo hash"
+
+    print("\n✅ Benchmark completado")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark del Filtro de Archivos - ModuStackClean
+Mide coincidencias por segundo sobre un corpus sintético de nombres
+"""
+
+import sys
+import os
+import random
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_matcher import FileMatcher
+
+CORPUS_SIZE = 1_000_000
+EXTENSIONS = ['.exe', '.zip', '.rar', '.msi']
+CORPUS_EXTENSIONS = ['.exe', '.ZIP', '.rar', '.msi', '.txt', '.pdf', '.jpg', '.png', '.docx',
+                     '.mp3', '.mp4', '.tar.gz', '.log', '.py', '']
+
+def build_corpus(size=CORPUS_SIZE, seed=42):
+    """Crear un corpus reproducible de nombres de archivo"""
+    rng = random.Random(seed)
+    stems = ["setup", "informe", "foto", "backup", "instalador", "cancion", "video", "notas"]
+    return [
+        f"{rng.choice(stems)}_{i}{rng.choice(CORPUS_EXTENSIONS)}"
+        for i in range(size)
+    ]
+
+def legacy_match(name):
+    """Filtro original: any() sobre una lista reconstruida por archivo"""
+    file_lower = name.lower()
+    return any(file_lower.endswith(ext) for ext in ['.exe', '.zip', '.rar', '.msi'])
+
+def measure(label, match, corpus):
+    """Medir el tiempo de un filtro sobre el corpus"""
+    start = time.perf_counter()
+    matches = sum(1 for name in corpus if match(name))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {len(corpus) / elapsed:>14,.0f} nombres/s  ({matches:,} coincidencias, {elapsed:.3f} s)")
+    return matches
+
+def main():
+    """Función principal del benchmark"""
+    print("🚀 BENCHMARK DEL FILTRO DE ARCHIVOS")
+    print("=" * 50)
+    corpus = build_corpus()
+    print(f"📊 Corpus sintético: {len(corpus):,} nombres\n")
+
+    expected = measure("any() por archivo (original)", legacy_match, corpus)
+
+    matcher = FileMatcher(extensions=EXTENSIONS)
+    found = measure("FileMatcher (conjunto de sufijos)", matcher.matches_name, corpus)
+    assert found == expected, "❌ El filtro compilado debe dar las mismas coincidencias"
+
+    with_patterns = FileMatcher(extensions=EXTENSIONS, patterns=["backup_*", "*.tar.gz"])
+    measure("FileMatcher + patrones glob", with_patterns.matches_name, corpus)
+
+    print("\n✅ Benchmark completado")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
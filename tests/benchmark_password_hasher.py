@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark del Hash de Contraseñas - ModuStackClean
+Mide verificaciones de login por segundo para cada costo, en serie y con logins simultáneos
+"""
+
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.password_hasher import PasswordHasher
+
+LOGINS = 24
+CONCURRENT_CLIENTS = 8
+
+SETTINGS = [
+    ("scrypt n=2^13", dict(algorithm="scrypt", scrypt_n=2 ** 13)),
+    ("scrypt n=2^14 (defecto)", dict(algorithm="scrypt", scrypt_n=2 ** 14)),
+    ("scrypt n=2^15", dict(algorithm="scrypt", scrypt_n=2 ** 15)),
+    ("pbkdf2 300k", dict(algorithm="pbkdf2_sha256", pbkdf2_iterations=300_000)),
+    ("pbkdf2 600k", dict(algorithm="pbkdf2_sha256", pbkdf2_iterations=600_000)),
+]
+
+def measure(hasher, encoded, clients):
+    """Logins por segundo con `clients` sesiones verificando a la vez"""
+    start = time.perf_counter()
+    if clients == 1:
+        for _ in range(LOGINS):
+            assert hasher.verify("secreto", encoded)
+    else:
+        with ThreadPoolExecutor(max_workers=clients) as sessions:
+            assert all(sessions.map(lambda _: hasher.verify("secreto", encoded), range(LOGINS)))
+    return LOGINS / (time.perf_counter() - start)
+
+def main():
+    """Función principal del benchmark"""
+    print("🚀 BENCHMARK DEL HASH DE CONTRASEÑAS")
+    print("=" * 50)
+    workers = os.cpu_count() or 1
+    print(f"📊 {LOGINS} logins por medición, {CONCURRENT_CLIENTS} sesiones simultáneas, pool de {workers} hilos\n")
+    print(f"{'Costo':<26} {'ms/hash':>8} {'serie':>10} {'simultáneo':>12} {'con pool':>10}")
+
+    for label, options in SETTINGS:
+        direct = PasswordHasher(**options)
+        pooled = PasswordHasher(workers=workers, **options)
+        encoded = direct.hash("secreto")
+        try:
+            serial = measure(direct, encoded, 1)
+            concurrent = measure(direct, encoded, CONCURRENT_CLIENTS)
+            with_pool = measure(pooled, encoded, CONCURRENT_CLIENTS)
+        finally:
+            pooled.shutdown()
+        print(f"{label:<26} {1000 / serial:>8.1f} {serial:>8.1f}/s {concurrent:>10.1f}/s {with_pool:>8.1f}/s")
+
+    print("\n✅ Benchmark completado")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
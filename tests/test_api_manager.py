@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Gestor de API - ModuStackClean
+Test para verificar el arranque sin bloqueo, los avisos de estado, las búsquedas y la caché del APIManager
+"""
+
+import sys
+import os
+import copy
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.api_manager import APIManager
+
+USUARIOS = [{"id": i, "nombre": f"Usuario {i}", "correo": f"u{i}@test.com",
+             "creado_en": f"2025-01-0{1 + i // 2} 00:00:00"} for i in range(1, 6)]
+
+class _PingHandler(BaseHTTPRequestHandler):
+    """Servidor de prueba que imita la API PHP"""
+    delay = 0.0
+    legacy = False  # Sin /api/usuarios/{id} ni /api/usuarios/count
+    paths = []
+
+    def do_GET(self):
+        self.paths.append(self.path)
+        parts = urlsplit(self.path.replace("/modustackclean", ""))
+        path, query = parts.path, parse_qs(parts.query)
+        if path == "/api/ping":
+            time.sleep(self.delay)
+            self._respond(200, True, "pong", {"server": "test"})
+        elif path == "/api/usuarios":
+            self._respond(200, True, "Usuarios obtenidos exitosamente", self._usuarios_page(query))
+        elif path == "/api/usuarios/count" and not self.legacy:
+            self._respond(200, True, "Conteo exitoso", {"count": len(USUARIOS)})
+        elif path.startswith("/api/usuarios/") and path.rsplit("/", 1)[1].isdigit() and not self.legacy:
+            user_id = int(path.rsplit("/", 1)[1])
+            found = [usuario for usuario in USUARIOS if usuario["id"] == user_id]
+            if found:
+                self._respond(200, True, "Usuario encontrado", {"usuario": found[0]})
+            else:
+                self._respond(404, False, "Usuario no encontrado", [])
+        else:
+            self._respond(404, False, "Endpoint no encontrado", {})
+
+    def _usuarios_page(self, query):
+        """Página por cursor (creado_en, id) descendente, como la API PHP"""
+        ordered = sorted(USUARIOS, key=lambda usuario: (usuario["creado_en"], usuario["id"]), reverse=True)
+        if "after" in query:
+            creado_en, _, last_id = query["after"][0].rpartition("|")
+            ordered = [usuario for usuario in ordered if (usuario["creado_en"], usuario["id"]) < (creado_en, int(last_id))]
+        limit = int(query.get("limit", ["50"])[0])
+        page = ordered[:limit]
+        if "fields" in query:
+            fields = query["fields"][0].split(",") + ["id", "creado_en"]
+            page = [{key: value for key, value in usuario.items() if key in fields} for usuario in page]
+        next_cursor = f"{page[-1]['creado_en']}|{page[-1]['id']}" if len(ordered) > limit else None
+        return {"usuarios": page, "count": len(page), "next_cursor": next_cursor}
+
+    def _respond(self, code, ok, mensaje, data):
+        body = json.dumps({"ok": ok, "mensaje": mensaje, "data": data}).encode("utf-8")
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if code == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(code)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def _with_server(delay, test, legacy=False):
+    """Ejecutar un test contra un servidor local de la API"""
+    handler = type("Handler", (_PingHandler,), {"delay": delay, "legacy": legacy, "paths": []})
+    server = HTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        return test(f"http://127.0.0.1:{server.server_address[1]}", handler.paths)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def _manager_for(url, auto_check=True):
+    """Crear un APIManager apuntando al servidor local"""
+    manager = APIManager(auto_check=False)
+    manager.api_base_url = url
+    if auto_check:
+        manager.start_background_check()
+    return manager
+
+def test_constructor_does_not_block():
+    """Test de constructor sin ping síncrono"""
+    print("🧪 TEST: Constructor sin bloqueo")
+
+    def test(url, paths):
+        started = time.monotonic()
+        manager = _manager_for(url)
+        elapsed = time.monotonic() - started
+        assert elapsed < 0.2, f"❌ El arranque no debe esperar al ping ({elapsed:.2f} s)"
+        assert manager.get_connection_info()["status"] == "checking", "❌ El estado inicial debe ser 'checking'"
+        assert manager.wait_for_check(5), "❌ El ping debe terminar"
+        assert manager.is_connected(), "❌ El ping debe conectar"
+        return True
+
+    _with_server(0.5, test)
+    print("✅ Constructor sin bloqueo correcto")
+    return True
+
+def test_status_listener():
+    """Test de aviso a los listeners al terminar el ping"""
+    print("🧪 TEST: Listeners de estado")
+
+    def test(url, paths):
+        manager = _manager_for(url, auto_check=False)
+        received = []
+        done = threading.Event()
+
+        def listener(status):
+            received.append(status)
+            if status != "checking":
+                done.set()
+
+        manager.add_status_listener(listener)
+        manager.add_status_listener(listener)
+        manager.start_background_check()
+        assert done.wait(5), "❌ El listener debe recibir el resultado"
+        assert received == ["checking", "connected"], f"❌ Un aviso por cambio de estado: {received}"
+
+        manager.remove_status_listener(listener)
+        manager._set_status("disconnected")
+        assert received == ["checking", "connected"], "❌ Un listener quitado no debe recibir avisos"
+        return True
+
+    _with_server(0.1, test)
+    print("✅ Listeners de estado correctos")
+    return True
+
+def test_no_auto_check_does_not_block():
+    """Test de peticiones sin verificación lanzada"""
+    print("🧪 TEST: Sin verificación automática")
+
+    def test(url, paths):
+        manager = _manager_for(url, auto_check=False)
+        assert manager.get_connection_info()["status"] == "disconnected", "❌ Sin ping no debe quedar en 'checking'"
+        started = time.monotonic()
+        success, message, _ = manager.make_api_request("/api/usuarios")
+        elapsed = time.monotonic() - started
+        assert elapsed < 0.5, f"❌ La petición no debe esperar un ping que nunca se lanzó ({elapsed:.2f} s)"
+        assert not success and "/api/usuarios" not in paths, f"❌ Sin verificar la API no se consulta: {message}"
+
+        assert manager.test_connection(), "❌ La verificación manual debe conectar"
+        assert manager.make_api_request("/api/ping")[0], "❌ Tras verificar la petición debe completarse"
+        return True
+
+    _with_server(0, test)
+    print("✅ Sin verificación automática correcto")
+    return True
+
+def test_request_waits_for_check():
+    """Test de petición que espera al ping en curso"""
+    print("🧪 TEST: Petición durante la verificación")
+
+    def test(url, paths):
+        manager = _manager_for(url)
+        success, message, data = manager.make_api_request("/api/ping")
+        assert manager.is_connected(), "❌ La petición debe esperar el resultado del ping"
+        assert success, f"❌ La petición debe completarse: {message}"
+        return True
+
+    _with_server(0.3, test)
+    print("✅ Petición durante la verificación correcta")
+    return True
+
+def test_unreachable_api():
+    """Test de API sin respuesta en modo offline"""
+    print("🧪 TEST: API sin respuesta")
+
+    # Puerto cerrado: conexión rechazada de inmediato
+    closed_url = _with_server(0, lambda url, paths: url)
+    manager = _manager_for(closed_url)
+    assert manager.wait_for_check(5), "❌ El ping debe terminar"
+    assert manager.get_connection_info()["status"] == "disconnected", "❌ Sin API el estado debe ser 'disconnected'"
+    success, message, _ = manager.login_usuario("user@test.com", "clave")
+    assert not success and "offline" in message, "❌ El login debe sugerir el modo offline"
+
+    print("✅ API sin respuesta correcta")
+    return True
+
+def test_usuario_lookup_endpoints():
+    """Test de búsqueda por ID y conteo sin descargar el listado"""
+    print("🧪 TEST: Endpoints de búsqueda")
+
+    def test(url, paths):
+        manager = _manager_for(url)
+        success, _, usuario = manager.get_usuario_by_id(3)
+        assert success and usuario["id"] == 3, "❌ Debe encontrar el usuario por ID"
+        success, message, usuario = manager.get_usuario_by_id(99)
+        assert not success and message == "Usuario no encontrado", f"❌ ID inexistente: {message}"
+        success, _, count = manager.count_usuarios()
+        assert success and count == len(USUARIOS), "❌ Debe contar los usuarios"
+        assert "/api/usuarios" not in paths, "❌ No debe descargar el listado completo"
+        return True
+
+    _with_server(0, test)
+    print("✅ Endpoints de búsqueda correctos")
+    return True
+
+def test_lookup_falls_back_on_legacy_api():
+    """Test de búsqueda contra una API sin los endpoints nuevos"""
+    print("🧪 TEST: API anterior")
+
+    def test(url, paths):
+        manager = _manager_for(url)
+        success, _, usuario = manager.get_usuario_by_id(2)
+        assert success and usuario["id"] == 2, "❌ Debe recurrir al listado completo"
+        success, _, count = manager.count_usuarios()
+        assert success and count == len(USUARIOS), "❌ El conteo debe recurrir al listado"
+        return True
+
+    _with_server(0, test, legacy=True)
+    print("✅ API anterior correcta")
+    return True
+
+def test_response_cache():
+    """Test de caché de respuestas con vigencia y revalidación por ETag"""
+    print("🧪 TEST: Caché de respuestas")
+
+    def test(url, paths):
+        manager = _manager_for(url)
+        first = manager.get_all_usuarios()
+        second = manager.get_all_usuarios()
+        assert first == second, "❌ La respuesta guardada debe ser igual"
+        assert paths.count("/api/usuarios") == 1, "❌ Una lectura vigente no debe ir a la red"
+
+        # Cada llamada recibe su copia: modificarla no altera la caché
+        expected = copy.deepcopy(first)
+        first[2][0]["nombre"] = "Modificado"
+        second[2].append({"id": 99})
+        assert manager.get_all_usuarios() == expected, "❌ Modificar un resultado no debe alterar la caché"
+
+        # Al vencer se revalida: el servidor responde 304 y no se descarga de nuevo
+        manager.cache.get_entry("GET /api/usuarios").expires_at = 0
+        revalidated = manager.get_all_usuarios()
+        assert revalidated == expected, "❌ Un 304 debe devolver la respuesta guardada"
+        revalidated[2].clear()
+        assert manager.get_all_usuarios() == expected, "❌ La respuesta revalidada también debe copiarse"
+        assert paths.count("/api/usuarios") == 2, "❌ La entrada vencida debe revalidarse"
+        assert manager.get_cache_stats()["revalidated"] == 1, "❌ El 304 debe contarse como revalidación"
+
+        # Una escritura invalida el recurso completo
+        manager.count_usuarios()
+        assert manager.invalidate_cache("/api/usuarios/3") == 2, "❌ Debe invalidar listado y conteo"
+        manager.get_all_usuarios()
+        assert paths.count("/api/usuarios") == 3, "❌ Tras invalidar debe volver a la red"
+
+        manager.make_api_request("/api/prueba")
+        manager.make_api_request("/api/prueba")
+        assert paths.count("/api/prueba") == 2, "❌ Los endpoints sin vigencia no se guardan"
+        return True
+
+    _with_server(0, test)
+    print("✅ Caché de respuestas correcta")
+    return True
+
+def test_keyset_pagination():
+    """Test de paginación por cursor y proyección de campos"""
+    print("🧪 TEST: Paginación por cursor")
+
+    def test(url, paths):
+        manager = _manager_for(url)
+        success, _, page = manager.get_usuarios_page(limit=2, fields=["nombre"])
+        assert success and len(page["usuarios"]) == 2, "❌ La página debe respetar el límite"
+        assert set(page["usuarios"][0]) == {"id", "nombre", "creado_en"}, "❌ Solo los campos pedidos y el cursor"
+        assert page["next_cursor"], "❌ Debe indicar la página siguiente"
+
+        walked = [usuario["id"] for usuario in manager.iter_usuarios(page_size=2)]
+        expected = [usuario["id"] for usuario in sorted(
+            USUARIOS, key=lambda usuario: (usuario["creado_en"], usuario["id"]), reverse=True)]
+        assert walked == expected, f"❌ El recorrido debe cubrir todos sin repetir: {walked}"
+        assert sum(1 for path in paths if path.startswith("/api/usuarios?")) == 4, "❌ Una petición por página"
+        return True
+
+    _with_server(0, test)
+    print("✅ Paginación por cursor correcta")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DEL GESTOR DE API")
+    print("=" * 50)
+
+    try:
+        test_constructor_does_not_block()
+        test_status_listener()
+        test_no_auto_check_does_not_block()
+        test_request_waits_for_check()
+        test_unreachable_api()
+        test_usuario_lookup_endpoints()
+        test_lookup_falls_back_on_legacy_api()
+        test_response_cache()
+        test_keyset_pagination()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DEL GESTOR DE API PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Pool de Conexiones - ModuStackClean
+Test para verificar el préstamo, la devolución y la verificación de conexiones
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mysql.connector.errors import PoolError, OperationalError
+from config.connection_pool import ConnectionPool
+
+class FakeConnection:
+    """Conexión de prueba que registra las llamadas recibidas"""
+
+    def __init__(self, **config):
+        self.config = config
+        self.closed = False
+        self.alive = True
+        self.pings = 0
+        self.in_transaction = False
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        self.pings += 1
+        if not self.alive:
+            raise OperationalError("MySQL server has gone away")
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+def _pool(**kwargs):
+    """Crear un pool con conexiones de prueba"""
+    created = []
+    def connect(**config):
+        connection = FakeConnection(**config)
+        created.append(connection)
+        return connection
+    config = {'host': 'localhost', 'database': 'modustackclean', 'pool_name': 'test_pool', 'pool_size': 2}
+    return ConnectionPool(config, pool_size=2, connect=connect, **kwargs), created
+
+def test_reuse_connections():
+    """Test de reutilización de conexiones devueltas"""
+    print("🧪 TEST: Reutilización de conexiones")
+
+    pool, created = _pool()
+    for _ in range(10):
+        connection = pool.get_connection()
+        connection.close()
+
+    stats = pool.get_stats()
+    assert len(created) == 1, f"❌ Solo debía abrirse una conexión, se abrieron {len(created)}"
+    assert stats["borrowed"] == 10 and stats["returned"] == 10, f"❌ Métricas incorrectas: {stats}"
+    assert stats["reused"] == 9, f"❌ Se esperaban 9 reutilizaciones: {stats}"
+    assert "pool_name" not in created[0].config, "❌ Las claves del pool no deben llegar a la conexión"
+    assert not created[0].closed, "❌ close() debe devolver la conexión, no cerrarla"
+
+    print("✅ Reutilización correcta")
+    return True
+
+def test_borrow_waits_and_times_out():
+    """Test de espera y timeout cuando el pool está agotado"""
+    print("🧪 TEST: Pool agotado")
+
+    pool, _ = _pool(borrow_timeout=0.2)
+    first = pool.get_connection()
+    second = pool.get_connection()
+
+    try:
+        pool.get_connection()
+        assert False, "❌ Debía fallar por timeout"
+    except PoolError:
+        pass
+
+    # Un préstamo en espera recibe la conexión devuelta por otro hilo
+    threading.Timer(0.05, first.close).start()
+    third = pool.get_connection(timeout=2)
+    third.close()
+    second.close()
+
+    stats = pool.get_stats()
+    assert stats["timeouts"] == 1, f"❌ Se esperaba un timeout: {stats}"
+    assert stats["peak_in_use"] == 2 and stats["in_use"] == 0, f"❌ Uso incorrecto: {stats}"
+
+    print("✅ Pool agotado correcto")
+    return True
+
+def test_health_check_and_rollback():
+    """Test de verificación de conexiones inactivas y rollback al devolver"""
+    print("🧪 TEST: Verificación de conexiones")
+
+    pool, created = _pool(health_check_interval=0)
+    connection = pool.get_connection()
+    connection.in_transaction = True
+    connection.close()
+    assert created[0].rollbacks == 1, "❌ Una transacción abierta debe deshacerse al devolver"
+
+    created[0].alive = False
+    replacement = pool.get_connection()
+    replacement.close()
+
+    stats = pool.get_stats()
+    assert len(created) == 2, "❌ Una conexión caída debe reemplazarse"
+    assert created[0].closed, "❌ La conexión caída debe cerrarse"
+    assert stats["discarded"] == 1 and stats["open"] == 1, f"❌ Métricas incorrectas: {stats}"
+
+    print("✅ Verificación de conexiones correcta")
+    return True
+
+def test_lost_connection_is_reclaimed():
+    """Test de recuperación de préstamos sin close() y descarte explícito"""
+    print("🧪 TEST: Conexiones perdidas")
+
+    pool, created = _pool(borrow_timeout=0.2)
+
+    def forget():
+        connection = pool.get_connection()
+        connection.in_transaction = True
+        raise OperationalError("fallo antes de close()")
+
+    for _ in range(3):
+        try:
+            forget()
+        except OperationalError:
+            pass
+
+    stats = pool.get_stats()
+    assert stats["reclaimed"] == 3 and stats["in_use"] == 0, f"❌ Los préstamos perdidos deben liberarse: {stats}"
+    assert stats["open"] == 0 and stats["idle"] == 0, f"❌ Una conexión perdida no vuelve a prestarse: {stats}"
+    assert not any(connection.rollbacks for connection in created), "❌ El recolector no debe hablar con el servidor"
+
+    connection = pool.get_connection()
+    connection.discard()
+    connection.close()
+    stats = pool.get_stats()
+    assert created[-1].closed and stats["open"] == 0 and stats["in_use"] == 0, f"❌ Descarte incorrecto: {stats}"
+
+    print("✅ Conexiones perdidas correctas")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DEL POOL DE CONEXIONES")
+    print("=" * 50)
+
+    try:
+        test_reuse_connections()
+        test_borrow_waits_and_times_out()
+        test_health_check_and_rollback()
+        test_lost_connection_is_reclaimed()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DEL POOL DE CONEXIONES PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
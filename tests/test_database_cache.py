@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la Caché de Usuarios - ModuStackClean
+Test para verificar la caché de lecturas del DatabaseManager y su invalidación
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import database_manager
+from config.database_config import DatabaseConfig
+from config.database_config_local import DatabaseConfigLocal
+from config.database_manager import DatabaseManager
+
+class FakeUsuarioModel:
+    """Modelo de prueba que cuenta las consultas recibidas"""
+
+    def __init__(self):
+        self.usuarios = {1: {"id": 1, "nombre": "Uno"}, 2: {"id": 2, "nombre": "Dos"}}
+        self.queries = 0
+
+    def get_usuario_by_id(self, user_id):
+        self.queries += 1
+        usuario = self.usuarios.get(user_id)
+        if usuario:
+            return True, "Usuario encontrado", dict(usuario)
+        return False, "Usuario no encontrado", None
+
+    def get_all_usuarios(self):
+        self.queries += 1
+        return True, "OK", [dict(usuario) for usuario in self.usuarios.values()]
+
+    def count_usuarios(self):
+        self.queries += 1
+        return True, "OK", len(self.usuarios)
+
+    def create_usuario(self, nombre, correo, password, rol='usuario'):
+        user_id = max(self.usuarios) + 1
+        self.usuarios[user_id] = {"id": user_id, "nombre": nombre}
+        return True, "Usuario creado exitosamente", user_id
+
+    def update_usuario(self, user_id, nombre=None, **kwargs):
+        self.usuarios[user_id]["nombre"] = nombre
+        return True, "Usuario actualizado exitosamente"
+
+    def delete_usuario(self, user_id):
+        del self.usuarios[user_id]
+        return True, "Usuario eliminado exitosamente"
+
+def _manager(cache_ttl=database_manager.USER_CACHE_TTL):
+    """Crear un DatabaseManager sobre el modelo de prueba sin tocar MySQL"""
+    originals = (DatabaseConfig.probe, DatabaseConfigLocal.probe)
+    DatabaseConfig.probe = lambda self, timeout=1.5: False
+    DatabaseConfigLocal.probe = lambda self, timeout=1.5: True
+    database_manager._probe_cache.clear()
+    try:
+        manager = DatabaseManager(cache_ttl=cache_ttl)
+    finally:
+        DatabaseConfig.probe, DatabaseConfigLocal.probe = originals
+        database_manager._probe_cache.clear()
+    manager._schema_checked = True
+    manager.usuario_model = FakeUsuarioModel()
+    return manager
+
+def test_read_through():
+    """Test de lecturas repetidas servidas desde la caché"""
+    print("🧪 TEST: Lecturas desde la caché")
+
+    manager = _manager()
+    model = manager.usuario_model
+    for _ in range(5):
+        assert manager.get_usuario_by_id(1)[2]["nombre"] == "Uno", "❌ Debe devolver el usuario"
+        assert manager.count_usuarios()[2] == 2, "❌ Debe devolver el conteo"
+        assert len(manager.get_all_usuarios()[2]) == 2, "❌ Debe devolver el listado"
+    assert model.queries == 3, f"❌ Solo la primera lectura debe ir a la base ({model.queries})"
+
+    manager.get_usuario_by_id(1)[2]["nombre"] = "Modificado"
+    assert manager.get_usuario_by_id(1)[2]["nombre"] == "Uno", "❌ Modificar el resultado no altera la caché"
+
+    manager.get_usuario_by_id(99)
+    manager.get_usuario_by_id(99)
+    assert model.queries == 5, "❌ Los usuarios inexistentes no se guardan"
+
+    stats = manager.get_cache_stats()
+    assert stats["hits"] == 14 and stats["misses"] == 5, f"❌ Métricas incorrectas: {stats}"
+
+    print("✅ Lecturas desde la caché correctas")
+    return True
+
+def test_write_invalidation():
+    """Test de invalidación por escrituras del mismo gestor"""
+    print("🧪 TEST: Invalidación por escrituras")
+
+    manager = _manager()
+    manager.get_usuario_by_id(1)
+    manager.count_usuarios()
+    manager.get_all_usuarios()
+
+    manager.update_usuario(1, nombre="Nuevo")
+    assert manager.get_usuario_by_id(1)[2]["nombre"] == "Nuevo", "❌ La actualización debe invalidar el usuario"
+    assert manager.get_all_usuarios()[2][0]["nombre"] == "Nuevo", "❌ La actualización debe invalidar el listado"
+
+    manager.create_usuario("Tres", "tres@test.com", "clave")
+    assert manager.count_usuarios()[2] == 3, "❌ El alta debe invalidar el conteo"
+
+    manager.delete_usuario(1)
+    assert not manager.get_usuario_by_id(1)[0], "❌ El borrado debe invalidar el usuario"
+    assert manager.count_usuarios()[2] == 2, "❌ El borrado debe invalidar el conteo"
+
+    print("✅ Invalidación por escrituras correcta")
+    return True
+
+def test_expiration_and_disable():
+    """Test de vencimiento y de caché desactivada"""
+    print("🧪 TEST: Vencimiento de la caché")
+
+    manager = _manager(cache_ttl=0.1)
+    manager.count_usuarios()
+    time.sleep(0.15)
+    manager.count_usuarios()
+    assert manager.usuario_model.queries == 2, "❌ Una entrada vencida debe volver a la base"
+
+    manager = _manager(cache_ttl=0)
+    manager.count_usuarios()
+    manager.count_usuarios()
+    assert manager.usuario_model.queries == 2, "❌ Con cache_ttl=0 no se guarda nada"
+
+    print("✅ Vencimiento de la caché correcto")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DE LA CACHÉ DE USUARIOS")
+    print("=" * 50)
+
+    try:
+        test_read_through()
+        test_write_invalidation()
+        test_expiration_and_disable()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DE LA CACHÉ DE USUARIOS PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la Prueba Rápida de Conexión - ModuStackClean
+Test para verificar la prueba en paralelo y la caché del DatabaseManager
+"""
+
+import sys
+import os
+import socket
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import database_manager
+from config.connection_pool import get_pool
+from config.database_config import DatabaseConfig
+from config.database_config_local import DatabaseConfigLocal
+from config.database_manager import DatabaseManager
+
+def _with_probes(remote, local, test):
+    """Ejecutar un test reemplazando las pruebas de remota y local"""
+    calls = []
+    originals = (DatabaseConfig.probe, DatabaseConfigLocal.probe)
+
+    def make_probe(name, delay, result):
+        def probe(self, timeout=1.5):
+            calls.append(name)
+            time.sleep(delay)
+            return result
+        return probe
+
+    DatabaseConfig.probe = make_probe("remote", *remote)
+    DatabaseConfigLocal.probe = make_probe("local", *local)
+    database_manager._probe_cache.clear()
+    try:
+        return test(calls)
+    finally:
+        DatabaseConfig.probe, DatabaseConfigLocal.probe = originals
+        database_manager._probe_cache.clear()
+
+def test_probes_run_concurrently():
+    """Test de pruebas en paralelo con prioridad de la remota"""
+    print("🧪 TEST: Pruebas en paralelo")
+
+    def test(calls):
+        started = time.monotonic()
+        manager = DatabaseManager()
+        elapsed = time.monotonic() - started
+        assert manager.connection_type == "remote", "❌ La remota tiene prioridad si responde"
+        assert elapsed < 0.5, f"❌ Las pruebas deben ejecutarse en paralelo ({elapsed:.2f} s)"
+        assert not manager._schema_checked, "❌ El esquema se verifica en el primer uso, no al iniciar"
+        return True
+
+    _with_probes((0.3, True), (0.3, True), test)
+    print("✅ Pruebas en paralelo correctas")
+    return True
+
+def test_unreachable_remote_falls_back():
+    """Test de fallback a local cuando la remota no responde"""
+    print("🧪 TEST: Remota sin respuesta")
+
+    original_budget = database_manager.PROBE_BUDGET
+    database_manager.PROBE_BUDGET = 0.3
+
+    def test(calls):
+        started = time.monotonic()
+        manager = DatabaseManager()
+        elapsed = time.monotonic() - started
+        assert manager.connection_type == "local", "❌ Debe usarse la base local"
+        assert elapsed < 1.0, f"❌ El inicio no debe bloquearse por la remota ({elapsed:.2f} s)"
+        return True
+
+    try:
+        _with_probes((3.0, True), (0.0, True), test)
+    finally:
+        database_manager.PROBE_BUDGET = original_budget
+
+    print("✅ Fallback a local correcto")
+    return True
+
+def test_probe_cache():
+    """Test de reutilización del resultado de la prueba"""
+    print("🧪 TEST: Caché de la prueba")
+
+    def test(calls):
+        DatabaseManager()
+        DatabaseManager()
+        assert calls.count("remote") == 1, f"❌ La segunda instancia debe usar la caché: {calls}"
+
+        manager = DatabaseManager()
+        manager.reconnect()
+        assert calls.count("remote") == 2, "❌ reconnect() debe volver a probar"
+        return True
+
+    _with_probes((0.0, False), (0.0, True), test)
+    print("✅ Caché de la prueba correcta")
+    return True
+
+def test_probe_port_and_timeout():
+    """Test de la prueba real: puerto configurado y connect_timeout acotado"""
+    print("🧪 TEST: Puerto y timeout de la prueba")
+
+    connects = []
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    port = listener.getsockname()[1]
+    try:
+        for config_class in (DatabaseConfig, DatabaseConfigLocal):
+            config = config_class()
+            config.DB_CONFIG = {'host': '127.0.0.1', 'port': port, 'connect_timeout': 10,
+                                'pool_name': f"test_probe_{config_class.__name__}"}
+            get_pool(config.DB_CONFIG, connect=lambda **kwargs: connects.append(kwargs) or object())
+            assert config.probe(timeout=1.5), "❌ El puerto configurado está abierto"
+            assert connects[-1]['port'] == port, "❌ La conexión debe usar el puerto configurado"
+            assert connects[-1]['connect_timeout'] == 1, \
+                f"❌ El connect_timeout debe acotarse al de la prueba: {connects[-1]['connect_timeout']}"
+    finally:
+        listener.close()
+
+    config = DatabaseConfig()
+    config.DB_CONFIG = {'host': '127.0.0.1', 'port': port, 'pool_name': 'test_probe_closed'}
+    assert not config.probe(timeout=0.5), "❌ Un puerto cerrado debe fallar"
+
+    print("✅ Puerto y timeout de la prueba correctos")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DE LA PRUEBA RÁPIDA DE CONEXIÓN")
+    print("=" * 50)
+
+    try:
+        test_probes_run_concurrently()
+        test_unreachable_remote_falls_back()
+        test_probe_cache()
+        test_probe_port_and_timeout()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DE LA PRUEBA RÁPIDA PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Buscador de Duplicados - ModuStackClean
+Test para verificar la detección de duplicados por tamaño y contenido
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.duplicate_finder import DuplicateFinder, PARTIAL_CHUNK
+from utils.file_index import FileIndex
+from utils.file_scanner import scan_directory
+from utils.scan_results import ScanResultStore
+
+def _write(path, content):
+    """Crear un archivo de prueba"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+def _create_tree(base):
+    """Crear archivos duplicados, parecidos y únicos"""
+    big = os.urandom(3 * PARTIAL_CHUNK)
+    # Mismo tamaño e inicio que big, pero distinto final: lo descarta el hash parcial
+    big_tail = big[:-1] + bytes([(big[-1] + 1) % 256])
+    # Mismo tamaño, inicio y final que big, distinto en el medio: lo descarta el hash completo
+    middle = 3 * PARTIAL_CHUNK // 2
+    big_middle = big[:middle] + bytes([(big[middle] + 1) % 256]) + big[middle + 1:]
+
+    _write(os.path.join(base, "Downloads", "setup.exe"), big)
+    _write(os.path.join(base, "Downloads", "copia", "setup (1).exe"), big)
+    _write(os.path.join(base, "Desktop", "setup.exe"), big)
+    _write(os.path.join(base, "Downloads", "otro.exe"), big_tail)
+    _write(os.path.join(base, "Downloads", "parecido.exe"), big_middle)
+    _write(os.path.join(base, "Downloads", "a.zip"), b"contenido")
+    _write(os.path.join(base, "Desktop", "a.zip"), b"contenido")
+    _write(os.path.join(base, "Desktop", "unico.zip"), b"sin pareja posible")
+
+def test_find_duplicates():
+    """Test de detección de grupos de duplicados"""
+    print("🧪 TEST: Detección de duplicados")
+
+    with tempfile.TemporaryDirectory() as base:
+        _create_tree(base)
+
+        finder = DuplicateFinder()
+        groups = finder.find(scan_directory(base))
+
+        names = [sorted(os.path.basename(r.path) for r in group.records) for group in groups]
+        assert names == [["setup (1).exe", "setup.exe", "setup.exe"], ["a.zip", "a.zip"]], \
+            f"❌ Grupos incorrectos: {names}"
+        assert groups[0].wasted_bytes == 2 * 3 * PARTIAL_CHUNK, "❌ Espacio recuperable incorrecto"
+
+        stats = finder.stats
+        assert stats["size_candidates"] == 7, f"❌ Candidatos por tamaño incorrectos: {stats}"
+        assert stats["partial_candidates"] == 6, f"❌ El hash parcial debía descartar un archivo: {stats}"
+        assert stats["full_hashed"] == 6, f"❌ Hashes completos incorrectos: {stats}"
+
+        store = ScanResultStore(memory_limit=3)
+        store.extend(scan_directory(base))
+        try:
+            streamed = DuplicateFinder(use_processes=False).find(store)
+        finally:
+            store.clear()
+        assert [group.hash for group in streamed] == [group.hash for group in groups], \
+            "❌ El almacén con desborde debe dar los mismos grupos"
+
+    print("✅ Detección de duplicados correcta")
+    return True
+
+def test_cached_hashes():
+    """Test de reutilización de hashes guardados en el índice"""
+    print("🧪 TEST: Hashes desde el índice")
+
+    with tempfile.TemporaryDirectory() as base:
+        root = os.path.join(base, "arbol")
+        _create_tree(root)
+        index = FileIndex(os.path.join(base, "index.db"))
+
+        finder = DuplicateFinder(index=index, use_processes=False)
+        first = finder.find(index.scan(root))
+        second = finder.find(index.scan(root))
+
+        assert len(first) == len(second) == 2, "❌ Ambas búsquedas deben encontrar 2 grupos"
+        assert finder.stats["full_hashed"] == 0, "❌ La segunda búsqueda no debía leer archivos completos"
+        assert finder.stats["cached_hashes"] == 6, f"❌ Hashes en caché incorrectos: {finder.stats}"
+        index.close()
+
+    print("✅ Hashes desde el índice correctos")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DEL BUSCADOR DE DUPLICADOS")
+    print("=" * 50)
+
+    try:
+        test_find_duplicates()
+        test_cached_hashes()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DEL BUSCADOR DE DUPLICADOS PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Hash de Archivos - ModuStackClean
+Test para verificar los hashes por mmap y por readinto
+"""
+
+import sys
+import os
+import hashlib
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import file_hasher
+from utils.file_hasher import hash_file, hash_head_tail
+
+def _write(path, content):
+    """Crear un archivo de prueba"""
+    with open(path, "wb") as f:
+        f.write(content)
+
+def test_hash_backends():
+    """Test de igualdad entre mmap, readinto y hashlib"""
+    print("🧪 TEST: Backends de hash")
+
+    original_threshold = file_hasher.MMAP_THRESHOLD
+    file_hasher.MMAP_THRESHOLD = 1024
+    try:
+        with tempfile.TemporaryDirectory() as base:
+            for size in (0, 1, 1023, 1024, 3 * 1024 * 1024 + 7):
+                path = os.path.join(base, f"archivo_{size}.zip")
+                content = os.urandom(size)
+                _write(path, content)
+
+                expected = hashlib.sha256(content).hexdigest()
+                with_mmap = hash_file(path, chunk_size=64 * 1024)
+                with_reads = hash_file(path, use_mmap=False, chunk_size=64 * 1024)
+                assert with_mmap == expected, f"❌ Hash por mmap incorrecto para {size} bytes"
+                assert with_reads == expected, f"❌ Hash por readinto incorrecto para {size} bytes"
+
+            assert hash_file(os.path.join(base, "no_existe.zip")) is None, "❌ Un archivo inexistente devuelve None"
+    finally:
+        file_hasher.MMAP_THRESHOLD = original_threshold
+
+    print("✅ Backends de hash correctos")
+    return True
+
+def test_head_tail_hash():
+    """Test del hash parcial de inicio y final"""
+    print("🧪 TEST: Hash parcial")
+
+    with tempfile.TemporaryDirectory() as base:
+        content = os.urandom(10 * 1024)
+        changed_middle = content[:5000] + b"X" + content[5001:]
+        changed_tail = content[:-1] + b"X"
+        for name, data in (("a", content), ("b", changed_middle), ("c", changed_tail)):
+            _write(os.path.join(base, name), data)
+
+        size = len(content)
+        a, b, c = (hash_head_tail(os.path.join(base, name), size, 1024) for name in "abc")
+        assert a == b, "❌ Un cambio en el medio no debe afectar al hash parcial"
+        assert a != c, "❌ Un cambio al final debe afectar al hash parcial"
+
+    print("✅ Hash parcial correcto")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DEL HASH DE ARCHIVOS")
+    print("=" * 50)
+
+    try:
+        test_hash_backends()
+        test_head_tail_hash()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DEL HASH DE ARCHIVOS PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Índice de Archivos - ModuStackClean
+Test para verificar el índice persistente y el re-escaneo incremental
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_index import FileIndex
+
+def _write(path, content=b"data"):
+    """Crear un archivo de prueba"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+def test_incremental_rescan():
+    """Test de re-escaneo que solo re-lista carpetas modificadas"""
+    print("🧪 TEST: Re-escaneo incremental")
+
+    with tempfile.TemporaryDirectory() as base:
+        root = os.path.join(base, "Downloads")
+        _write(os.path.join(root, "a.zip"))
+        _write(os.path.join(root, "viejos", "b.exe"))
+
+        index = FileIndex(os.path.join(base, "index.db"))
+        first = sorted(r.name for r in index.scan(root))
+        assert first == ["a.zip", "b.exe"], f"❌ Primer escaneo incorrecto: {first}"
+
+        # Sin cambios: ninguna carpeta se vuelve a listar
+        relisted = []
+        original = index._relist_directory
+        index._relist_directory = lambda path, mtime: relisted.append(path) or original(path, mtime)
+        second = sorted(r.name for r in index.scan(root))
+        assert second == first, "❌ El índice debe devolver los mismos archivos"
+        assert relisted == [], f"❌ No se esperaban carpetas re-listadas: {relisted}"
+
+        # Un archivo nuevo y una carpeta eliminada
+        _write(os.path.join(root, "nuevo.msi"))
+        os.remove(os.path.join(root, "viejos", "b.exe"))
+        os.rmdir(os.path.join(root, "viejos"))
+        os.utime(root, (os.stat(root).st_atime, os.stat(root).st_mtime + 5))
+
+        third = sorted(r.name for r in index.scan(root))
+        assert third == ["a.zip", "nuevo.msi"], f"❌ Re-escaneo incorrecto: {third}"
+        assert relisted == [root], f"❌ Solo debía re-listarse la raíz: {relisted}"
+        assert index.count_files() == 2, "❌ El índice debe olvidar los archivos eliminados"
+        index.close()
+
+    print("✅ Re-escaneo incremental correcto")
+    return True
+
+def test_hash_persistence():
+    """Test de conservación del hash mientras el archivo no cambie"""
+    print("🧪 TEST: Hash persistente")
+
+    with tempfile.TemporaryDirectory() as base:
+        root = os.path.join(base, "Documents")
+        _write(os.path.join(root, "c.rar"))
+
+        index = FileIndex(os.path.join(base, "index.db"))
+        record = next(index.scan(root, full=True))
+        index.set_hash(record.path, "abc123")
+        list(index.scan(root, full=True))
+
+        assert index.get_hash(record.path, record.size, record.mtime) == "abc123", "❌ El hash debe conservarse"
+        assert index.get_hash(record.path, record.size + 1, record.mtime) is None, "❌ Un archivo cambiado no tiene hash"
+        index.close()
+
+    print("✅ Hash persistente correcto")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DEL ÍNDICE DE ARCHIVOS")
+    print("=" * 50)
+
+    try:
+        test_incremental_rescan()
+        test_hash_persistence()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DEL ÍNDICE DE ARCHIVOS PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Organizador de Archivos - ModuStackClean
+Test para verificar el plan de organización y los movimientos por lotes
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.app_config import AppConfig
+from utils.file_organizer import FileOrganizer, move_file
+from utils import file_organizer
+from utils.file_scanner import scan_directory
+
+def _write(path, content=b"data"):
+    """Crear un archivo de prueba"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+def _create_tree(base):
+    """Crear una carpeta de descargas desordenada"""
+    downloads = os.path.join(base, "Downloads")
+    _write(os.path.join(downloads, "setup.exe"), b"nuevo instalador")
+    _write(os.path.join(downloads, "backup.zip"))
+    _write(os.path.join(downloads, "notas.txt"))
+    _write(os.path.join(downloads, "sin_regla.xyz"))
+    # Ya organizado y con un nombre que colisiona con setup.exe
+    _write(os.path.join(downloads, "Instaladores", "setup.exe"), b"instalador viejo")
+    return downloads
+
+def test_plan_is_dry_run():
+    """Test del plan de organización sin mover archivos"""
+    print("🧪 TEST: Vista previa de la organización")
+
+    with tempfile.TemporaryDirectory() as base:
+        downloads = _create_tree(base)
+        organizer = FileOrganizer.from_config(AppConfig())
+        moves = organizer.plan(scan_directory(downloads))
+
+        targets = sorted(os.path.relpath(move.destination, downloads) for move in moves)
+        assert targets == sorted([
+            os.path.join("Comprimidos", "backup.zip"),
+            os.path.join("Documentos", "notas.txt"),
+            os.path.join("Instaladores", "setup (1).exe"),
+        ]), f"❌ Plan incorrecto: {targets}"
+        assert os.path.exists(os.path.join(downloads, "setup.exe")), "❌ El plan no debe mover archivos"
+        assert not os.path.exists(os.path.join(downloads, "Comprimidos")), "❌ El plan no debe crear carpetas"
+        assert FileOrganizer.summarize(moves) == {"Comprimidos": 1, "Documentos": 1, "Instaladores": 1}, \
+            "❌ Resumen por categoría incorrecto"
+
+    print("✅ Vista previa correcta")
+    return True
+
+def test_execute_in_batches():
+    """Test de ejecución del plan por lotes"""
+    print("🧪 TEST: Ejecución por lotes")
+
+    with tempfile.TemporaryDirectory() as base:
+        downloads = _create_tree(base)
+        organizer = FileOrganizer.from_config(AppConfig())
+        organizer.batch_size = 2
+        moves = organizer.plan(scan_directory(downloads))
+
+        batches = []
+        results = organizer.execute(moves, on_batch=lambda done, total: batches.append((done, total)))
+
+        assert all(result.success for result in results), f"❌ Movimientos fallidos: {results}"
+        assert batches == [(2, 3), (3, 3)], f"❌ Lotes incorrectos: {batches}"
+        assert organizer.stats["moved"] == 3, "❌ Deben moverse 3 archivos"
+        with open(os.path.join(downloads, "Instaladores", "setup.exe"), "rb") as f:
+            assert f.read() == b"instalador viejo", "❌ No se debe sobrescribir un archivo existente"
+        with open(os.path.join(downloads, "Instaladores", "setup (1).exe"), "rb") as f:
+            assert f.read() == b"nuevo instalador", "❌ El archivo movido debe conservar su contenido"
+        assert os.path.exists(os.path.join(downloads, "sin_regla.xyz")), "❌ Archivos sin regla no se mueven"
+
+    print("✅ Ejecución por lotes correcta")
+    return True
+
+def test_cross_device_fallback():
+    """Test de copia verificada cuando el rename no es posible"""
+    print("🧪 TEST: Copia entre discos")
+
+    with tempfile.TemporaryDirectory() as base:
+        source = os.path.join(base, "origen", "grande.zip")
+        destination = os.path.join(base, "destino", "grande.zip")
+        _write(source, os.urandom(256 * 1024))
+        os.makedirs(os.path.dirname(destination))
+        with open(source, "rb") as f:
+            content = f.read()
+
+        # Simular discos distintos: os.replace falla con EXDEV solo para el origen
+        original_replace = file_organizer.os.replace
+        def fake_replace(src, dst):
+            if src == source:
+                raise OSError(file_organizer.errno.EXDEV, "Cross-device link")
+            return original_replace(src, dst)
+
+        file_organizer.os.replace = fake_replace
+        try:
+            move_file(source, destination)
+        finally:
+            file_organizer.os.replace = original_replace
+
+        assert not os.path.exists(source), "❌ El origen debe borrarse tras la copia verificada"
+        assert not os.path.exists(destination + ".partial"), "❌ No deben quedar temporales"
+        with open(destination, "rb") as f:
+            assert f.read() == content, "❌ La copia debe ser idéntica"
+
+    print("✅ Copia entre discos correcta")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DEL ORGANIZADOR DE ARCHIVOS")
+    print("=" * 50)
+
+    try:
+        test_plan_is_dry_run()
+        test_execute_in_batches()
+        test_cross_device_fallback()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DEL ORGANIZADOR DE ARCHIVOS PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
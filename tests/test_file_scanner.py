@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Motor de Escaneo - ModuStackClean
+Test para verificar la búsqueda de archivos en segundo plano
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_scanner import FileScanner, FileRecord, scan_directory
+from utils.file_matcher import FileMatcher
+from utils.scan_results import ScanResultStore
+from utils.scan_progress import ScanProgress
+
+def _create_tree(base):
+    """Crear un árbol de prueba con archivos buscados y no buscados"""
+    for folder in ["Downloads", os.path.join("Downloads", "sub"), "Desktop"]:
+        os.makedirs(os.path.join(base, folder), exist_ok=True)
+
+    files = {
+        os.path.join("Downloads", "setup.exe"): b"x" * 10,
+        os.path.join("Downloads", "notas.txt"): b"nada",
+        os.path.join("Downloads", "sub", "backup.ZIP"): b"y" * 20,
+        os.path.join("Desktop", "instalador.msi"): b"z" * 30,
+    }
+    for name, content in files.items():
+        with open(os.path.join(base, name), "wb") as f:
+            f.write(content)
+
+def test_background_scan():
+    """Test de escaneo en segundo plano con resultados parciales"""
+    print("🧪 TEST: Escaneo en segundo plano")
+
+    with tempfile.TemporaryDirectory() as base:
+        _create_tree(base)
+        roots = [os.path.join(base, "Downloads"), os.path.join(base, "Desktop"), os.path.join(base, "NoExiste")]
+
+        batches = []
+        completed = []
+        scanner = FileScanner(batch_size=1)
+        assert scanner.start(
+            roots,
+            on_batch=lambda root, paths: batches.append((root, paths)),
+            on_complete=lambda results, cancelled: completed.append((results, cancelled))
+        ), "❌ El escaneo no se inició"
+        assert scanner.wait(10), "❌ El escaneo no terminó a tiempo"
+
+        assert len(completed) == 1, "❌ on_complete debe llamarse una sola vez"
+        results, cancelled = completed[0]
+        assert not cancelled, "❌ El escaneo no debería estar cancelado"
+
+        found = sorted(record.name for records in results.values() for record in records)
+        assert found == ["backup.ZIP", "instalador.msi", "setup.exe"], f"❌ Resultados incorrectos: {found}"
+        assert len(batches) == 3, "❌ Se esperaban lotes parciales por archivo"
+
+    print("✅ Escaneo en segundo plano correcto")
+    return True
+
+def test_scandir_records():
+    """Test del recorrido con os.scandir y metadatos en el registro"""
+    print("🧪 TEST: Registros con metadatos del DirEntry")
+
+    with tempfile.TemporaryDirectory() as base:
+        _create_tree(base)
+
+        records = {r.name: r for r in scan_directory(base, name_filter=lambda n: not n.endswith(".txt"))}
+        assert set(records) == {"setup.exe", "backup.ZIP", "instalador.msi"}, f"❌ Registros incorrectos: {sorted(records)}"
+
+        backup = records["backup.ZIP"]
+        stat = os.stat(backup.path)
+        assert backup.size == 20, "❌ Tamaño incorrecto"
+        assert backup.mtime == stat.st_mtime, "❌ Fecha de modificación incorrecta"
+        assert backup.directory == os.path.join(base, "Downloads", "sub"), "❌ Carpeta incorrecta"
+
+    print("✅ Registros con metadatos correctos")
+    return True
+
+def test_root_progress():
+    """Test del progreso por raíz con varias raíces en paralelo"""
+    print("🧪 TEST: Progreso por raíz")
+
+    with tempfile.TemporaryDirectory() as base:
+        _create_tree(base)
+        downloads = os.path.join(base, "Downloads")
+        desktop = os.path.join(base, "Desktop")
+        missing = os.path.join(base, "NoExiste")
+
+        updates = []
+        scanner = FileScanner(max_workers=2, max_workers_per_device=1)
+        scanner.start([downloads, desktop, missing, downloads],
+                      on_root_progress=lambda root, status: updates.append((root, status["state"])))
+        assert scanner.wait(10), "❌ El escaneo no terminó a tiempo"
+
+        status = scanner.get_root_status()
+        assert len(status) == 3, "❌ Las raíces duplicadas deben escanearse una sola vez"
+        assert status[downloads] == {"state": "completada", "found": 2}, f"❌ Estado incorrecto: {status[downloads]}"
+        assert status[desktop] == {"state": "completada", "found": 1}, f"❌ Estado incorrecto: {status[desktop]}"
+        assert status[missing]["state"] == "omitida", "❌ Una raíz inexistente debe omitirse"
+        assert (downloads, "escaneando") in updates, "❌ Falta la notificación de inicio"
+
+    print("✅ Progreso por raíz correcto")
+    return True
+
+def test_file_matcher():
+    """Test del filtro de extensiones, patrones y predicados"""
+    print("🧪 TEST: Filtro de archivos")
+
+    matcher = FileMatcher(extensions=["ZIP", ".tar.gz"], patterns=["setup*"])
+    assert matcher.matches_name("Backup.Zip"), "❌ Las extensiones no distinguen mayúsculas"
+    assert matcher.matches_name("datos.tar.gz"), "❌ Extensión compuesta no reconocida"
+    assert matcher.matches_name("SETUP_v2.txt"), "❌ Patrón glob no reconocido"
+    assert not matcher.matches_name("notas.txt"), "❌ Nombre que no debía coincidir"
+
+    now = 1_000_000_000.0
+    by_size_and_age = FileMatcher(extensions=[".exe"], min_size=100, max_age_days=7, reference_time=now)
+    recent = FileRecord("/x/a.exe", "a.exe", 500, now - 3600, now - 3600)
+    old = recent._replace(mtime=now - 30 * 24 * 3600)
+    small = recent._replace(size=10)
+    assert by_size_and_age.matches(recent), "❌ Archivo reciente y grande debía coincidir"
+    assert not by_size_and_age.matches(old), "❌ Archivo antiguo no debía coincidir"
+    assert not by_size_and_age.matches(small), "❌ Archivo pequeño no debía coincidir"
+
+    by_size_and_age.add_predicate(lambda record: "tmp" not in record.path)
+    assert not by_size_and_age.matches(recent._replace(path="/tmp/a.exe")), "❌ Predicado propio ignorado"
+
+    print("✅ Filtro de archivos correcto")
+    return True
+
+def test_paginated_results():
+    """Test del almacén paginado con desborde a disco"""
+    print("🧪 TEST: Resultados paginados")
+
+    store = ScanResultStore(page_size=4, memory_limit=5)
+    records = [FileRecord(f"/r/f{i}.zip", f"f{i}.zip", i, 0.0, 0.0) for i in range(13)]
+    store.extend(records[:3])
+    store.extend(records[3:13])
+
+    assert len(store) == 13, "❌ Conteo de resultados incorrecto"
+    assert store.total_pages == 4, "❌ Número de páginas incorrecto"
+    assert store.get_page(0) == records[0:4], "❌ Página en memoria incorrecta"
+    assert store.get_page(1) == records[4:8], "❌ Página mixta memoria/disco incorrecta"
+    assert store.get_page(3) == records[12:13], "❌ Última página incorrecta"
+    assert store.get_page(4) == [], "❌ Una página fuera de rango debe estar vacía"
+    assert list(store.iter_records(chunk_size=3)) == records, "❌ El recorrido por bloques debe cubrir memoria y disco"
+
+    spill_path = store._spill_path
+    assert spill_path and os.path.exists(spill_path), "❌ Se esperaba desborde a disco"
+    store.clear()
+    assert len(store) == 0 and not os.path.exists(spill_path), "❌ clear() debe borrar el desborde"
+
+    print("✅ Resultados paginados correctos")
+    return True
+
+def test_incremental_results():
+    """Test de cambios sueltos sobre el almacén con desborde"""
+    print("🧪 TEST: Cambios incrementales en resultados")
+
+    store = ScanResultStore(page_size=4, memory_limit=3)
+    records = [FileRecord(f"/r/d{i % 3}/f{i}.zip", f"f{i}.zip", i, 0.0, 0.0) for i in range(10)]
+    store.extend(records)
+
+    # Quitar una carpeta completa (en memoria y en disco) y un archivo suelto
+    assert store.remove_trees(["/r/d1", "/r/d0/f9.zip"]) == 4, "❌ Debía quitar 4 registros"
+    remaining = [record for record in records if "/d1/" not in record.path and record.path != "/r/d0/f9.zip"]
+    assert list(store) == remaining, "❌ Los registros restantes deben conservar su orden"
+    assert store.get_page(1) == remaining[4:6], "❌ Las páginas deben seguir siendo contiguas tras quitar"
+
+    # Actualizar en su lugar y agregar al final
+    modified = remaining[4]._replace(size=999)
+    new = FileRecord("/r/d2/nuevo.zip", "nuevo.zip", 1, 0.0, 0.0)
+    assert store.upsert([modified, new]) == 1, "❌ Solo el archivo nuevo se agrega"
+    assert len(store) == 7 and modified in list(store) and new in list(store), "❌ Upsert incorrecto"
+    assert remaining[4] not in list(store), "❌ El registro modificado debe reemplazarse"
+
+    store.clear()
+    print("✅ Cambios incrementales en resultados correctos")
+    return True
+
+def test_cancel_and_pause():
+    """Test de cancelación y pausa del escaneo"""
+    print("🧪 TEST: Cancelación y pausa")
+
+    with tempfile.TemporaryDirectory() as base:
+        _create_tree(base)
+
+        scanner = FileScanner()
+        scanner.start([base])
+        scanner.pause()
+        scanner.cancel()
+        assert scanner.wait(10), "❌ Un escaneo pausado debe poder cancelarse"
+        assert not scanner.is_running, "❌ El escaneo debería haber terminado"
+        assert not scanner.is_paused(), "❌ Un escaneo terminado no está pausado"
+
+    print("✅ Cancelación y pausa correctas")
+    return True
+
+def test_scan_progress():
+    """Test de los contadores de progreso del escaneo"""
+    print("🧪 TEST: Progreso del escaneo")
+
+    with tempfile.TemporaryDirectory() as base:
+        _create_tree(base)
+
+        updates = []
+        progress = ScanProgress(interval=0.0, expected_files=8)
+        scanner = FileScanner(progress=progress)
+        scanner.start([base], on_progress=updates.append)
+        assert scanner.wait(10), "❌ El escaneo no terminó a tiempo"
+
+        stats = scanner.get_progress()
+        assert stats["finished"], "❌ El progreso debería marcarse como terminado"
+        assert stats["directories"] == 4, f"❌ Se esperaban 4 carpetas, se obtuvieron {stats['directories']}"
+        assert stats["files_seen"] == 4, f"❌ Se esperaban 4 archivos vistos, se obtuvieron {stats['files_seen']}"
+        assert stats["matches"] == 3, f"❌ Se esperaban 3 coincidencias, se obtuvieron {stats['matches']}"
+        assert stats["bytes_matched"] == 60, "❌ Los bytes encontrados no coinciden"
+        assert stats["percent"] == 0.5, "❌ El porcentaje debe calcularse sobre expected_files"
+        assert updates and updates[-1]["finished"], "❌ on_progress debe recibir el snapshot final"
+
+    print("✅ Progreso del escaneo correcto")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DEL MOTOR DE ESCANEO")
+    print("=" * 50)
+
+    try:
+        test_background_scan()
+        test_scandir_records()
+        test_root_progress()
+        test_file_matcher()
+        test_paginated_results()
+        test_incremental_results()
+        test_cancel_and_pause()
+        test_scan_progress()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DEL MOTOR DE ESCANEO PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Vigilante de Archivos - ModuStackClean
+Test para verificar que el índice se mantiene al día sin re-escanear
+"""
+
+import sys
+import os
+import errno
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_index import FileIndex
+from utils import file_watcher
+from utils.file_watcher import FileWatcher
+
+def _write(path, content=b"data"):
+    """Crear un archivo de prueba"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+def _touch_dir(path):
+    """Adelantar el mtime de una carpeta (la resolución del mtime puede ser gruesa)"""
+    st = os.stat(path)
+    os.utime(path, (st.st_atime, st.st_mtime + 5))
+
+def _wait_for(condition, timeout=5.0):
+    """Esperar a que se cumpla una condición"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+def _names(index, root):
+    """Nombres registrados bajo una raíz"""
+    return sorted(record.name for record in index.files_under(root))
+
+def _check_watcher(use_inotify):
+    """Crear, borrar y agregar carpetas con el vigilante activo"""
+    with tempfile.TemporaryDirectory() as base:
+        root = os.path.join(base, "Downloads")
+        _write(os.path.join(root, "a.zip"))
+        _write(os.path.join(root, "viejos", "b.exe"))
+
+        index = FileIndex(os.path.join(base, "index.db"))
+        for _ in index.scan(root):
+            pass
+
+        batches = []
+        watcher = FileWatcher(index=index, on_changes=batches.append, debounce=0.1,
+                              poll_interval=0.1, use_inotify=use_inotify)
+        watcher.start([root])
+        try:
+            _write(os.path.join(root, "nuevo.msi"))
+            if not use_inotify:
+                _touch_dir(root)
+            assert _wait_for(lambda: "nuevo.msi" in _names(index, root)), \
+                f"❌ El archivo nuevo debe llegar al índice ({watcher.backend_name})"
+            record = index.get_file(os.path.join(root, "nuevo.msi"))
+            assert record and record.size == 4, "❌ get_file debe devolver el registro indexado"
+
+            _write(os.path.join(root, "carpeta", "c.rar"))
+            os.remove(os.path.join(root, "viejos", "b.exe"))
+            os.rmdir(os.path.join(root, "viejos"))
+            if not use_inotify:
+                _touch_dir(root)
+            assert _wait_for(lambda: _names(index, root) == ["a.zip", "c.rar", "nuevo.msi"]), \
+                f"❌ Índice incorrecto: {_names(index, root)}"
+            assert batches, "❌ on_changes debe recibir los cambios"
+        finally:
+            watcher.stop()
+            index.close()
+        return watcher.backend_name
+
+def test_polling_watcher():
+    """Test del vigilante por sondeo de carpetas"""
+    print("🧪 TEST: Vigilancia por sondeo")
+    backend = _check_watcher(use_inotify=False)
+    assert backend == "sondeo", f"❌ Backend inesperado: {backend}"
+    print("✅ Vigilancia por sondeo correcta")
+    return True
+
+def test_inotify_watcher():
+    """Test del vigilante con inotify (solo Linux)"""
+    print("🧪 TEST: Vigilancia con inotify")
+    if not sys.platform.startswith("linux"):
+        print("⏭️ inotify solo está disponible en Linux")
+        return True
+    _check_watcher(use_inotify=True)
+    print("✅ Vigilancia con inotify correcta")
+    return True
+
+def test_inotify_limit_falls_back():
+    """Test de respaldo por sondeo al agotar las vigilancias de inotify"""
+    print("🧪 TEST: Límite de vigilancias de inotify")
+    if not sys.platform.startswith("linux"):
+        print("⏭️ inotify solo está disponible en Linux")
+        return True
+
+    backends = []
+    original_add_watch = file_watcher._InotifyBackend._add_watch
+
+    def limited_add_watch(backend, path):
+        if backend not in backends:
+            backends.append(backend)
+        if len(backend._paths) >= 1:
+            raise OSError(errno.ENOSPC, "Límite de vigilancias de inotify alcanzado")
+        original_add_watch(backend, path)
+
+    file_watcher._InotifyBackend._add_watch = limited_add_watch
+    try:
+        with tempfile.TemporaryDirectory() as base:
+            os.makedirs(os.path.join(base, "a", "b"))
+            watcher = FileWatcher(poll_interval=0.1)
+            watcher.start([base])
+            watcher.stop()
+    finally:
+        file_watcher._InotifyBackend._add_watch = original_add_watch
+
+    assert watcher.backend_name == "sondeo", f"❌ Debía usar sondeo: {watcher.backend_name}"
+    assert backends and backends[0]._fd == -1, "❌ El descriptor de inotify debe cerrarse"
+
+    print("✅ Límite de vigilancias de inotify correcto")
+    return True
+
+def test_debounce_coalescing():
+    """Test de agrupación de eventos por ruta"""
+    print("🧪 TEST: Agrupación de eventos")
+
+    watcher = FileWatcher(debounce=10)
+    for _ in range(100):
+        watcher._emit("/tmp/descarga.zip", "created")
+        watcher._emit("/tmp/descarga.zip", "modified")
+    watcher._emit("/tmp/borrado.exe", "created")
+    watcher._emit("/tmp/borrado.exe", "deleted")
+
+    assert watcher.flush() == {}, "❌ No se debe entregar antes del debounce"
+    changes = watcher.flush(force=True)
+    assert changes == {"/tmp/descarga.zip": "modified", "/tmp/borrado.exe": "deleted"}, \
+        f"❌ Cambios agrupados incorrectos: {changes}"
+
+    print("✅ Agrupación de eventos correcta")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DEL VIGILANTE DE ARCHIVOS")
+    print("=" * 50)
+
+    try:
+        test_polling_watcher()
+        test_inotify_watcher()
+        test_inotify_limit_falls_back()
+        test_debounce_coalescing()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DEL VIGILANTE DE ARCHIVOS PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Diario de Movimientos - ModuStackClean
+Test para verificar la reanudación y el deshacer de una organización
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.app_config import AppConfig
+from utils.file_organizer import FileOrganizer
+from utils.file_scanner import scan_directory
+from utils.move_journal import MoveJournal
+
+def _create_downloads(base, count=10):
+    """Crear una carpeta de descargas con instaladores"""
+    downloads = os.path.join(base, "Downloads")
+    os.makedirs(downloads)
+    for i in range(count):
+        with open(os.path.join(downloads, f"setup_{i}.exe"), "wb") as f:
+            f.write(b"x" * i)
+    return downloads
+
+def _organizer():
+    """Crear un organizador con lotes pequeños"""
+    organizer = FileOrganizer.from_config(AppConfig())
+    organizer.batch_size = 3
+    return organizer
+
+def test_resume_interrupted_run():
+    """Test de reanudación tras una interrupción"""
+    print("🧪 TEST: Reanudar organización interrumpida")
+
+    with tempfile.TemporaryDirectory() as base:
+        downloads = _create_downloads(base)
+        journal_dir = os.path.join(base, "journals")
+        organizer = _organizer()
+        moves = organizer.plan(scan_directory(downloads))
+
+        # Interrumpir tras el primer lote
+        batches = []
+        journal = MoveJournal.create(journal_dir)
+        organizer.execute(moves, on_batch=lambda done, total: batches.append(done),
+                          should_stop=lambda: len(batches) >= 1, journal=journal)
+        assert organizer.stats["moved"] == 3, "❌ Solo debía ejecutarse el primer lote"
+
+        # Simular que el último resultado no llegó al diario antes del corte
+        with open(journal.path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        with open(journal.path, "w", encoding="utf-8") as f:
+            f.writelines(lines[:-1])
+
+        incomplete = MoveJournal.find_incomplete(journal_dir)
+        assert len(incomplete) == 1, "❌ Debe detectarse un diario incompleto"
+        results = _organizer().resume(incomplete[0])
+
+        assert len(results) == 7, f"❌ Se esperaban 7 movimientos pendientes, hubo {len(results)}"
+        assert all(result.success for result in results), "❌ La reanudación no debe fallar"
+        assert MoveJournal.find_incomplete(journal_dir) == [], "❌ El diario debe quedar completo"
+        assert sorted(os.listdir(downloads)) == ["Instaladores"], "❌ Todos los archivos deben moverse"
+        assert len(os.listdir(os.path.join(downloads, "Instaladores"))) == 10, "❌ Faltan archivos"
+
+    print("✅ Reanudación correcta")
+    return True
+
+def test_rollback():
+    """Test de deshacer una organización completa"""
+    print("🧪 TEST: Deshacer organización")
+
+    with tempfile.TemporaryDirectory() as base:
+        downloads = _create_downloads(base)
+        before = sorted(os.listdir(downloads))
+        organizer = _organizer()
+
+        journal = MoveJournal.create(os.path.join(base, "journals"))
+        organizer.execute(organizer.plan(scan_directory(downloads)), journal=journal)
+        assert journal.completed, "❌ El diario debe marcarse como completo"
+
+        undone = _organizer().rollback(MoveJournal(journal.path))
+        assert undone == 10, f"❌ Se esperaban 10 movimientos deshechos, hubo {undone}"
+        assert sorted(os.listdir(downloads)) == before, "❌ Los archivos deben volver a su lugar"
+
+    print("✅ Deshacer correcto")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DEL DIARIO DE MOVIMIENTOS")
+    print("=" * 50)
+
+    try:
+        test_resume_interrupted_run()
+        test_rollback()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DEL DIARIO DE MOVIMIENTOS PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
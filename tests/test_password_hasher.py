@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Hash de Contraseñas - ModuStackClean
+Test para verificar hash con sal, compatibilidad SHA-256 y migración al iniciar sesión
+"""
+
+import sys
+import os
+import hashlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.password_hasher import PasswordHasher, parse_hash
+
+# Costos bajos para que los tests sean rápidos
+FAST_SCRYPT_N = 2 ** 10
+
+def test_hash_and_verify():
+    """Test de hash con sal y verificación"""
+    print("🧪 TEST: Hash con sal")
+
+    for hasher in (PasswordHasher(scrypt_n=FAST_SCRYPT_N),
+                   PasswordHasher(algorithm="pbkdf2_sha256", pbkdf2_iterations=1000)):
+        first = hasher.hash("secreto")
+        second = hasher.hash("secreto")
+        assert first != second, "❌ La sal debe hacer distinto cada hash"
+        assert first.startswith(hasher.algorithm + "$"), f"❌ Formato inesperado: {first}"
+        assert hasher.verify("secreto", first), "❌ La contraseña correcta debe verificarse"
+        assert not hasher.verify("otra", first), "❌ Una contraseña incorrecta no debe verificarse"
+        assert not hasher.needs_rehash(first), "❌ Un hash con el costo actual no se rehace"
+
+    assert not PasswordHasher().verify("secreto", "no-es-un-hash"), "❌ Un hash inválido no verifica"
+
+    print("✅ Hash con sal correcto")
+    return True
+
+def test_legacy_rehash():
+    """Test de compatibilidad con SHA-256 y migración"""
+    print("🧪 TEST: Migración de hashes antiguos")
+
+    hasher = PasswordHasher(scrypt_n=FAST_SCRYPT_N)
+    legacy = hashlib.sha256("secreto".encode()).hexdigest()
+    assert hasher.needs_rehash(legacy), "❌ Un hash SHA-256 debe migrarse"
+
+    valid, new_hash = hasher.verify_and_update("secreto", legacy)
+    assert valid and new_hash and new_hash.startswith("scrypt$"), "❌ Debe devolver un hash scrypt nuevo"
+    assert hasher.verify_and_update("otra", legacy) == (False, None), "❌ Sin contraseña correcta no se migra"
+
+    stronger = PasswordHasher(scrypt_n=FAST_SCRYPT_N * 2)
+    assert stronger.needs_rehash(new_hash), "❌ Un cambio de costo debe rehacer el hash"
+    assert parse_hash(stronger.hash("x"))[1][0] == FAST_SCRYPT_N * 2, "❌ El costo debe guardarse en el hash"
+
+    print("✅ Migración de hashes antiguos correcta")
+    return True
+
+def test_worker_pool():
+    """Test de hash y verificación en el pool de hilos"""
+    print("🧪 TEST: Pool de verificación")
+
+    hasher = PasswordHasher(scrypt_n=FAST_SCRYPT_N, workers=2)
+    try:
+        hashes = hasher.hash_many([f"clave{i}" for i in range(6)])
+        assert len(set(hashes)) == 6, "❌ Cada contraseña debe tener su hash"
+        assert all(hasher.verify(f"clave{i}", hashed) for i, hashed in enumerate(hashes)), \
+            "❌ Todas deben verificarse desde el pool"
+    finally:
+        hasher.shutdown()
+
+    print("✅ Pool de verificación correcto")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DEL HASH DE CONTRASEÑAS")
+    print("=" * 50)
+
+    try:
+        test_hash_and_verify()
+        test_legacy_rehash()
+        test_worker_pool()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DEL HASH DE CONTRASEÑAS PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
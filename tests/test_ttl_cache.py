@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la Caché LRU con Vencimiento - ModuStackClean
+Test para verificar vigencia, expulsión LRU, revalidación e invalidación
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ttl_cache import TTLCache
+
+def test_expiration():
+    """Test de vencimiento de entradas"""
+    print("🧪 TEST: Vencimiento")
+
+    cache = TTLCache(default_ttl=0.1)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=10)
+    assert cache.get("a") == 1, "❌ La entrada vigente debe leerse"
+    time.sleep(0.15)
+    assert cache.get("a") is None, "❌ La entrada vencida no debe leerse"
+    assert cache.get("b") == 2, "❌ La vigencia es por entrada"
+
+    entry = cache.get_entry("a")
+    assert entry is not None and not entry.fresh, "❌ La entrada vencida se conserva para revalidar"
+    assert cache.touch("a", ttl=10), "❌ touch() debe renovar la entrada"
+    assert cache.get("a") == 1, "❌ La entrada renovada vuelve a leerse"
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 3 and stats["misses"] == 1, f"❌ Métricas incorrectas: {stats}"
+    assert stats["revalidated"] == 1, "❌ La renovación debe contarse"
+
+    print("✅ Vencimiento correcto")
+    return True
+
+def test_lru_eviction():
+    """Test de expulsión de la entrada menos usada"""
+    print("🧪 TEST: Expulsión LRU")
+
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None, "❌ Debe expulsar la menos usada"
+    assert cache.get("a") == 1 and cache.get("c") == 3, "❌ Las usadas deben conservarse"
+    assert cache.get_stats()["evictions"] == 1, "❌ La expulsión debe contarse"
+
+    print("✅ Expulsión LRU correcta")
+    return True
+
+def test_invalidation():
+    """Test de invalidación por clave, prefijo y completa"""
+    print("🧪 TEST: Invalidación")
+
+    cache = TTLCache()
+    cache.set("GET /api/usuarios", [1])
+    cache.set("GET /api/usuarios/count", 1)
+    cache.set("GET /api/info", {})
+    cache.set(("usuario", 1), {})
+
+    assert cache.invalidate_prefix("GET /api/usuarios") == 2, "❌ Debe quitar las claves con el prefijo"
+    assert cache.get("GET /api/info") == {}, "❌ Las demás claves no se tocan"
+    assert cache.invalidate(("usuario", 1)), "❌ Debe quitar la clave indicada"
+    assert not cache.invalidate(("usuario", 1)), "❌ Una clave ausente no se invalida"
+    cache.clear()
+    assert len(cache) == 0, "❌ clear() debe vaciar la caché"
+
+    print("✅ Invalidación correcta")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DE LA CACHÉ LRU CON VENCIMIENTO")
+    print("=" * 50)
+
+    try:
+        test_expiration()
+        test_lru_eviction()
+        test_invalidation()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DE LA CACHÉ PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
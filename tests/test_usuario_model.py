@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test del Modelo de Usuario - ModuStackClean
+Test para verificar las consultas del UsuarioModel sin servidor MySQL
+"""
+
+import sys
+import os
+import hashlib
+import re
+import sqlite3
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mysql.connector.errors import DatabaseError, IntegrityError
+from config.connection_pool import ConnectionPool
+from models.usuario_model import UsuarioModel, decode_cursor, encode_cursor
+from utils.password_hasher import PasswordHasher
+
+def _to_sqlite(query):
+    """Traducir la sintaxis de MySQL usada por el modelo a SQLite"""
+    query = query.replace("%s", "?")
+    query = query.replace("ON DUPLICATE KEY UPDATE", "ON CONFLICT(correo) DO UPDATE SET")
+    return re.sub(r"VALUES\((\w+)\)", r"excluded.\1", query)
+
+class SQLiteCursor:
+    """Cursor con la interfaz de mysql.connector sobre SQLite"""
+
+    def __init__(self, connection, dictionary=False):
+        self._cursor = connection._database.cursor()
+        self._dictionary = dictionary
+        self.statements = connection.statements
+
+    def execute(self, query, params=()):
+        self.statements.append(query)
+        try:
+            self._cursor.execute(_to_sqlite(query), tuple(params))
+        except sqlite3.IntegrityError as e:
+            raise IntegrityError(msg=str(e), errno=1062)
+        except sqlite3.OperationalError as e:
+            raise DatabaseError(msg=str(e))
+
+    def executemany(self, query, seq_params):
+        self.statements.append(query)
+        self._cursor.executemany(_to_sqlite(query), [tuple(params) for params in seq_params])
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {column[0]: value for column, value in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+class SQLiteConnection:
+    """Conexión de prueba: close() no cierra la base en memoria"""
+
+    def __init__(self, database):
+        self._database = database
+        self.statements = []
+        self.autocommit = True
+        self.commits = 0
+        self.cursors = 0
+        self.prepared = 0
+
+    def cursor(self, dictionary=False, prepared=False, **kwargs):
+        self.cursors += 1
+        self.prepared += prepared
+        return SQLiteCursor(self, dictionary)
+
+    def commit(self):
+        self.commits += 1
+        self._database.commit()
+
+    def rollback(self):
+        self._database.rollback()
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._database, name)
+
+class SQLiteConfig:
+    """Configuración de prueba con la tabla usuarios en memoria"""
+
+    def __init__(self, usuarios=0):
+        self.database = sqlite3.connect(":memory:")
+        self.database.execute("""
+            CREATE TABLE usuarios (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nombre TEXT NOT NULL,
+                correo TEXT UNIQUE NOT NULL COLLATE NOCASE,
+                password TEXT NOT NULL,
+                rol TEXT DEFAULT 'usuario',
+                estado INTEGER DEFAULT 1,
+                creado_en TEXT DEFAULT CURRENT_TIMESTAMP,
+                actualizado_en TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # Varios usuarios por segundo: el id desempata dentro del mismo creado_en
+        for i in range(1, usuarios + 1):
+            self.database.execute(
+                "INSERT INTO usuarios (nombre, correo, password, creado_en) VALUES (?, ?, 'x', ?)",
+                (f"Usuario {i}", f"u{i}@test.com", f"2025-01-01 00:00:{i // 3:02d}")
+            )
+        self.database.commit()
+        self.connection = SQLiteConnection(self.database)
+
+    def get_connection(self):
+        return self.connection
+
+class PooledSQLiteConfig(SQLiteConfig):
+    """Configuración de prueba que presta la conexión con el pool real"""
+
+    def __init__(self, usuarios=0):
+        super().__init__(usuarios)
+        self.pool = ConnectionPool({'pool_name': 'test_sqlite'}, pool_size=1, borrow_timeout=0.5,
+                                   connect=lambda **config: self.connection)
+
+    def get_connection(self):
+        return self.pool.get_connection()
+
+def test_cursor_roundtrip():
+    """Test de codificación del cursor"""
+    print("🧪 TEST: Cursor de paginación")
+
+    cursor = encode_cursor({"id": 42, "creado_en": "2025-01-01 10:00:00"})
+    assert decode_cursor(cursor) == ("2025-01-01 10:00:00", 42), "❌ El cursor debe decodificarse igual"
+    try:
+        decode_cursor("sin-id")
+        assert False, "❌ Un cursor inválido debe rechazarse"
+    except ValueError:
+        pass
+
+    print("✅ Cursor de paginación correcto")
+    return True
+
+def test_keyset_pages():
+    """Test de páginas por cursor sin repetir ni saltar usuarios"""
+    print("🧪 TEST: Páginas por cursor")
+
+    config = SQLiteConfig(usuarios=10)
+    model = UsuarioModel(config)
+
+    success, _, page = model.get_usuarios_page(limit=4, fields=["nombre"])
+    assert success and len(page["usuarios"]) == 4, "❌ La página debe respetar el límite"
+    assert set(page["usuarios"][0]) == {"id", "nombre", "creado_en"}, "❌ Solo los campos pedidos y el cursor"
+    assert "OFFSET" not in config.connection.statements[-1], "❌ La paginación no debe usar OFFSET"
+
+    walked = [usuario["id"] for usuario in model.iter_usuarios(page_size=3)]
+    ordered = [row[0] for row in config.database.execute(
+        "SELECT id FROM usuarios ORDER BY creado_en DESC, id DESC")]
+    assert walked == ordered, f"❌ El recorrido debe cubrir todos en orden: {walked}"
+
+    success, message, _ = model.get_usuarios_page(fields=["password"])
+    assert not success and "password" in message, "❌ La contraseña no se puede proyectar"
+
+    print("✅ Páginas por cursor correctas")
+    return True
+
+def test_bulk_create():
+    """Test de alta masiva con resultado por fila"""
+    print("🧪 TEST: Alta masiva")
+
+    config = SQLiteConfig(usuarios=2)
+    model = UsuarioModel(config)
+    usuarios = [{"nombre": f"Nuevo {i}", "correo": f"nuevo{i}@test.com", "password": "clave"} for i in range(7)]
+    usuarios += [
+        {"nombre": "Existente", "correo": "U1@test.com", "password": "clave"},
+        {"nombre": "Repetido", "correo": "nuevo0@test.com", "password": "clave"},
+        {"nombre": "", "correo": "sin-nombre@test.com", "password": "clave"},
+        {"nombre": "Rol", "correo": "rol@test.com", "password": "clave", "rol": "root"}
+    ]
+
+    success, message, outcomes = model.bulk_create_usuarios(usuarios, batch_size=3)
+    statuses = [outcome["status"] for outcome in outcomes]
+    assert success, f"❌ La carga debe completarse: {message}"
+    assert statuses == ["created"] * 7 + ["duplicate", "invalid", "invalid", "invalid"], f"❌ Estados: {statuses}"
+    assert all(outcome["id"] for outcome in outcomes[:8]), "❌ Las filas creadas y existentes deben traer su id"
+    inserts = [statement for statement in config.connection.statements if "INSERT" in statement]
+    assert len(inserts) == 3, f"❌ Un INSERT por lote, no por usuario ({len(inserts)})"
+    assert config.connection.commits == 1, "❌ Todo debe confirmarse en una sola transacción"
+    assert config.connection.autocommit is True, "❌ Se debe restaurar el autocommit de la conexión"
+
+    success, _, outcomes = model.bulk_create_usuarios(
+        [{"nombre": "Renombrado", "correo": "u2@test.com", "password": "otra"}], update_existing=True)
+    assert success and outcomes[0]["status"] == "updated", "❌ Con update_existing el existente se actualiza"
+    nombre = config.database.execute("SELECT nombre FROM usuarios WHERE correo = 'u2@test.com'").fetchone()[0]
+    assert nombre == "Renombrado", "❌ El upsert debe modificar la fila existente"
+
+    print("✅ Alta masiva correcta")
+    return True
+
+def test_bulk_update():
+    """Test de actualización masiva con resultado por fila"""
+    print("🧪 TEST: Actualización masiva")
+
+    config = SQLiteConfig(usuarios=4)
+    model = UsuarioModel(config)
+    success, message, outcomes = model.bulk_update_usuarios([
+        {"id": 1, "nombre": "Uno"},
+        {"id": 2, "nombre": "Dos"},
+        {"id": 3, "correo": "u4@test.com"},
+        {"id": 99, "nombre": "Nadie"},
+        {"id": 4, "estado": 0, "rol": "admin"},
+        {"id": 1, "nombre": "Otra vez"}
+    ])
+    statuses = [outcome["status"] for outcome in outcomes]
+    assert success, f"❌ La actualización debe completarse: {message}"
+    assert statuses == ["updated", "updated", "conflict", "not_found", "updated", "invalid"], f"❌ Estados: {statuses}"
+    rows = dict(config.database.execute("SELECT id, nombre FROM usuarios").fetchall())
+    assert rows[1] == "Uno" and rows[2] == "Dos", "❌ Los cambios deben aplicarse"
+    estado, rol = config.database.execute("SELECT estado, rol FROM usuarios WHERE id = 4").fetchone()
+    assert estado == 0 and rol == "admin", "❌ Deben aplicarse todas las columnas pedidas"
+    assert config.connection.commits == 1, "❌ Todo debe confirmarse en una sola transacción"
+
+    print("✅ Actualización masiva correcta")
+    return True
+
+def test_single_statement_writes():
+    """Test de actualización y borrado en una sola sentencia"""
+    print("🧪 TEST: Escrituras en una sentencia")
+
+    config = SQLiteConfig(usuarios=3)
+    model = UsuarioModel(config)
+    statements = config.connection.statements
+
+    success, _ = model.update_usuario(1, nombre="Uno")
+    assert success and len(statements) == 1, f"❌ Una sola sentencia por actualización: {statements}"
+    success, message = model.update_usuario(99, nombre="Nadie")
+    assert not success and message == "Usuario no encontrado", f"❌ ID inexistente: {message}"
+    success, message = model.update_usuario(2, correo="u3@test.com")
+    assert not success and message == "El correo ya está en uso por otro usuario", f"❌ Correo duplicado: {message}"
+    success, message = model.update_usuario(2)
+    assert not success and len(statements) == 3, "❌ Sin campos no debe consultar la base"
+
+    del statements[:]
+    success, _ = model.delete_usuario(3)
+    assert success and len(statements) == 1, "❌ Una sola sentencia por borrado"
+    success, message = model.delete_usuario(3)
+    assert not success and message == "Usuario no encontrado", f"❌ Borrado repetido: {message}"
+
+    print("✅ Escrituras en una sentencia correctas")
+    return True
+
+def test_prepared_statement_cache():
+    """Test de sentencias preparadas reutilizadas por conexión del pool"""
+    print("🧪 TEST: Sentencias preparadas")
+
+    config = PooledSQLiteConfig(usuarios=3)
+    model = UsuarioModel(config)
+    password = model._hash_password("x")
+    config.database.execute("UPDATE usuarios SET password = ?", (password,))
+    config.database.commit()
+
+    for _ in range(5):
+        success, _, usuario = model.login_usuario("u1@test.com", "x")
+        assert success and "password" not in usuario, "❌ El login no debe devolver la contraseña"
+        assert model.get_usuario_by_id(2)[2]["correo"] == "u2@test.com", "❌ Debe encontrar el usuario por ID"
+        assert model.count_usuarios()[2] == 3, "❌ El conteo debe ser correcto"
+
+    connection = config.connection
+    assert connection.prepared == 3 and connection.cursors == 3, \
+        f"❌ Un cursor preparado por consulta y conexión ({connection.prepared})"
+    login = [statement for statement in connection.statements if "estado = 1" in statement]
+    assert "SELECT *" not in login[0], "❌ El login debe pedir solo las columnas necesarias"
+
+    # Sin pool se prepara y se cierra en cada llamada
+    plain = UsuarioModel(SQLiteConfig(usuarios=1))
+    plain.count_usuarios()
+    plain.count_usuarios()
+    assert plain.db_config.connection.prepared == 2, "❌ Sin slot no se guarda el cursor"
+
+    print("✅ Sentencias preparadas correctas")
+    return True
+
+def test_failed_queries_return_connection():
+    """Test de devolución de la conexión al pool cuando la consulta falla"""
+    print("🧪 TEST: Conexión devuelta tras un error")
+
+    config = PooledSQLiteConfig(usuarios=2)
+    model = UsuarioModel(config, hasher=PasswordHasher(scrypt_n=2 ** 10))
+    config.database.execute("ALTER TABLE usuarios RENAME TO usuarios_tmp")
+
+    # Con pool_size=1, una sola conexión perdida haría fallar todas las siguientes
+    calls = [
+        lambda: model.create_usuario("Nuevo", "nuevo@test.com", "x"),
+        lambda: model.get_usuario_by_email("u1@test.com"),
+        lambda: model.get_all_usuarios(),
+        lambda: model.get_usuarios_page(limit=1),
+        lambda: model.get_usuario_by_id(1),
+        lambda: model.update_usuario(1, nombre="Otro"),
+        lambda: model.delete_usuario(1),
+        lambda: model.bulk_create_usuarios([{"nombre": "A", "correo": "a@test.com", "password": "x"}]),
+    ]
+    for call in calls:
+        assert not call()[0], "❌ La consulta debía fallar sin la tabla"
+    stats = config.pool.get_stats()
+    assert stats["in_use"] == 0 and stats["reclaimed"] == 0, f"❌ Conexiones sin devolver: {stats}"
+
+    config.database.execute("ALTER TABLE usuarios_tmp RENAME TO usuarios")
+    assert model.count_usuarios()[2] == 2, "❌ El pool debe seguir prestando la conexión"
+
+    print("✅ Conexión devuelta tras un error correcta")
+    return True
+
+def test_login_rehashes_legacy_password():
+    """Test de migración del hash SHA-256 al iniciar sesión"""
+    print("🧪 TEST: Migración del hash al iniciar sesión")
+
+    config = SQLiteConfig(usuarios=1)
+    model = UsuarioModel(config, hasher=PasswordHasher(scrypt_n=2 ** 10))
+    legacy = hashlib.sha256("secreto".encode()).hexdigest()
+    config.database.execute("UPDATE usuarios SET password = ? WHERE id = 1", (legacy,))
+
+    assert not model.login_usuario("u1@test.com", "otra")[0], "❌ Una contraseña incorrecta no inicia sesión"
+    stored = config.database.execute("SELECT password FROM usuarios WHERE id = 1").fetchone()[0]
+    assert stored == legacy, "❌ Sin login correcto el hash no cambia"
+
+    assert model.login_usuario("u1@test.com", "secreto")[0], "❌ El hash antiguo debe seguir funcionando"
+    stored = config.database.execute("SELECT password FROM usuarios WHERE id = 1").fetchone()[0]
+    assert stored.startswith("scrypt$"), "❌ El login debe guardar el hash nuevo"
+    assert model.login_usuario("u1@test.com", "secreto")[0], "❌ El hash nuevo debe verificarse"
+
+    print("✅ Migración del hash al iniciar sesión correcta")
+    return True
+
+def main():
+    """Función principal de test"""
+    print("🚀 INICIANDO TESTS DEL MODELO DE USUARIO")
+    print("=" * 50)
+
+    try:
+        test_cursor_roundtrip()
+        test_keyset_pages()
+        test_bulk_create()
+        test_bulk_update()
+        test_single_statement_writes()
+        test_prepared_statement_cache()
+        test_failed_queries_return_connection()
+        test_login_rehashes_legacy_password()
+
+        print("\n" + "=" * 50)
+        print("🎉 TODOS LOS TESTS DEL MODELO DE USUARIO PASARON")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERROR EN TEST: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Buscador de Duplicados - ModuStackClean
+Detección de archivos duplicados por tamaño, hash parcial y hash completo
+"""
+
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.file_hasher import HEAD_TAIL_CHUNK, hash_file, hash_head_tail
+from utils.file_scanner import FileRecord
+
+# Bytes leídos al inicio y al final de cada archivo para el hash parcial
+PARTIAL_CHUNK = HEAD_TAIL_CHUNK
+
+# Por debajo de este número de archivos no compensa arrancar un pool
+MIN_FILES_FOR_POOL = 4
+
+
+class DuplicateGroup(NamedTuple):
+    """Grupo de archivos con el mismo contenido"""
+    size: int
+    hash: str
+    records: List[FileRecord]
+
+    @property
+    def wasted_bytes(self) -> int:
+        """Bytes que se liberarían conservando una sola copia"""
+        return self.size * (len(self.records) - 1)
+
+
+def _full_hash_job(path: str) -> Tuple[str, Optional[str]]:
+    """Tarea de hash completo para el pool"""
+    return path, hash_file(path)
+
+
+class DuplicateFinder:
+    """Buscador de duplicados que lee el mínimo de bytes posible
+
+    1. Agrupa por tamaño: un archivo con tamaño único no tiene duplicados.
+    2. Calcula un hash de los primeros y últimos 64 KB de los candidatos.
+    3. Solo los que siguen empatados se leen completos, en un pool de hilos
+       (hashlib libera el GIL con bloques grandes). Con use_processes se usa
+       un pool de procesos; en el exe congelado requiere freeze_support().
+
+    Si se indica un FileIndex, los hashes completos se reutilizan mientras
+    el tamaño y el mtime del archivo no cambien.
+    """
+
+    def __init__(self, index=None, max_workers: Optional[int] = None, min_size: int = 1,
+                 use_processes: bool = False):
+        self.index = index
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.min_size = max(1, min_size)
+        self.use_processes = use_processes
+        self.stats = {}
+
+    def find(self, records: Iterable[FileRecord],
+             should_stop: Callable[[], bool] = None) -> List[DuplicateGroup]:
+        """Buscar grupos de duplicados, ordenados por espacio desperdiciado"""
+        self.stats = {
+            "files": 0,
+            "size_candidates": 0,
+            "partial_candidates": 0,
+            "full_hashed": 0,
+            "cached_hashes": 0,
+            "bytes_read": 0
+        }
+
+        # 1. Agrupar por tamaño (una ruta puede venir repetida de raíces solapadas).
+        # Si los registros se pueden recorrer dos veces (p. ej. ScanResultStore),
+        # una primera pasada solo cuenta tamaños y la segunda guarda únicamente
+        # los registros con tamaño repetido.
+        repeated_sizes = None
+        if iter(records) is not records:
+            size_counts = Counter(record.size for record in records if record.size >= self.min_size)
+            repeated_sizes = {size for size, count in size_counts.items() if count > 1}
+            del size_counts
+
+        by_size: Dict[int, Dict[str, FileRecord]] = {}
+        for record in records:
+            self.stats["files"] += 1
+            if record.size < self.min_size:
+                continue
+            if repeated_sizes is None or record.size in repeated_sizes:
+                by_size.setdefault(record.size, {})[record.path] = record
+        candidates = [list(group.values()) for group in by_size.values() if len(group) > 1]
+        self.stats["size_candidates"] = sum(len(group) for group in candidates)
+
+        # 2. Hash parcial dentro de cada grupo de tamaño
+        survivors = []
+        for group in candidates:
+            if should_stop and should_stop():
+                return []
+            survivors.extend(self._split_by_partial_hash(group))
+        self.stats["partial_candidates"] = sum(len(group) for group in survivors)
+
+        # 3. Hash completo de los sobrevivientes
+        hashes = self._full_hashes([record for group in survivors for record in group], should_stop)
+
+        duplicates = []
+        for group in survivors:
+            by_hash: Dict[str, List[FileRecord]] = {}
+            for record in group:
+                file_hash = hashes.get(record.path)
+                if file_hash:
+                    by_hash.setdefault(file_hash, []).append(record)
+            for file_hash, same in by_hash.items():
+                if len(same) > 1:
+                    duplicates.append(DuplicateGroup(same[0].size, file_hash, same))
+
+        duplicates.sort(key=lambda group: group.wasted_bytes, reverse=True)
+        return duplicates
+
+    def _split_by_partial_hash(self, group: List[FileRecord]) -> List[List[FileRecord]]:
+        """Separar un grupo de igual tamaño por hash parcial"""
+        size = group[0].size
+
+        # Si el hash parcial cubre todo el archivo, el completo no aporta nada más
+        if size <= 2 * PARTIAL_CHUNK:
+            return [group]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            partials = list(executor.map(lambda record: hash_head_tail(record.path, size, PARTIAL_CHUNK), group))
+        self.stats["bytes_read"] += len(group) * 2 * PARTIAL_CHUNK
+
+        by_partial: Dict[str, List[FileRecord]] = {}
+        for record, digest in zip(group, partials):
+            if digest:
+                by_partial.setdefault(digest, []).append(record)
+        return [same for same in by_partial.values() if len(same) > 1]
+
+    def _full_hashes(self, records: List[FileRecord], should_stop: Callable[[], bool] = None) -> Dict[str, str]:
+        """Obtener el hash completo de cada archivo, del índice o leyéndolo"""
+        hashes = {}
+        pending = []
+        for record in records:
+            cached = self.index.get_hash(record.path, record.size, record.mtime) if self.index else None
+            if cached:
+                hashes[record.path] = cached
+                self.stats["cached_hashes"] += 1
+            else:
+                pending.append(record)
+
+        if not pending:
+            return hashes
+
+        sizes = {record.path: record.size for record in pending}
+        paths = list(sizes)
+        for path, file_hash in self._hash_paths(paths, should_stop):
+            if not file_hash:
+                continue
+            hashes[path] = file_hash
+            self.stats["full_hashed"] += 1
+            self.stats["bytes_read"] += sizes[path]
+            if self.index:
+                self.index.set_hash(path, file_hash)
+        return hashes
+
+    def _hash_paths(self, paths: List[str], should_stop: Callable[[], bool] = None):
+        """Calcular hashes completos en un pool de hilos o procesos (o en este hilo si son pocos)"""
+        if len(paths) < MIN_FILES_FOR_POOL:
+            for path in paths:
+                if should_stop and should_stop():
+                    return
+                yield _full_hash_job(path)
+            return
+
+        executor = None
+        if self.use_processes:
+            try:
+                executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            except (OSError, NotImplementedError) as e:
+                print(f"⚠️ Pool de procesos no disponible, se usarán hilos: {e}")
+                self.use_processes = False
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="duplicate_finder")
+
+        with executor:
+            for result in executor.map(_full_hash_job, paths, chunksize=4):
+                if should_stop and should_stop():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    return
+                yield result
+
+    def log_summary(self, groups: List[DuplicateGroup]):
+        """Imprimir el resultado de la búsqueda para registro"""
+        wasted = sum(group.wasted_bytes for group in groups)
+        print(
+            f"📊 Duplicados: {len(groups)} grupos, {wasted / (1024 * 1024):.1f} MB recuperables — "
+            f"{self.stats['files']:,} archivos, {self.stats['size_candidates']:,} por tamaño, "
+            f"{self.stats['partial_candidates']:,} por hash parcial, {self.stats['full_hashed']:,} leídos completos "
+            f"({self.stats['cached_hashes']:,} desde el índice), "
+            f"{self.stats['bytes_read'] / (1024 * 1024):.1f} MB leídos"
+        )
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hash de Archivos - ModuStackClean
+Cálculo de hashes sin copias intermedias: mmap para archivos grandes y readinto como respaldo
+"""
+
+import hashlib
+import mmap
+import os
+from typing import Optional
+
+# A partir de este tamaño se usa mmap en lugar de lecturas
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# Tamaño de cada bloque entregado al hash
+CHUNK_SIZE = 1024 * 1024
+
+# Bytes leídos al inicio y al final para el hash parcial
+HEAD_TAIL_CHUNK = 64 * 1024
+
+
+def hash_file(path: str, algorithm: str = "sha256", use_mmap: bool = True,
+              chunk_size: int = CHUNK_SIZE) -> Optional[str]:
+    """Calcular el hash del contenido completo de un archivo (None si no se puede leer)
+
+    Los archivos grandes se mapean en memoria y se entregan al hash como
+    slices de memoryview, sin copiar bytes a objetos de Python. Si mmap no
+    está disponible (archivo vacío, bloqueado o en un sistema de archivos
+    que no lo soporta) se lee con readinto sobre un único bytearray.
+    """
+    try:
+        with open(path, "rb", buffering=0) as f:
+            size = os.fstat(f.fileno()).st_size
+            if use_mmap and size >= MMAP_THRESHOLD:
+                digest = hashlib.new(algorithm)
+                try:
+                    _update_from_mmap(digest, f, chunk_size)
+                    return digest.hexdigest()
+                except (OSError, ValueError):
+                    f.seek(0)
+
+            digest = hashlib.new(algorithm)
+            _update_from_reads(digest, f, chunk_size)
+            return digest.hexdigest()
+    except OSError:
+        return None
+
+
+def _update_from_mmap(digest, f, chunk_size: int):
+    """Alimentar el hash con slices de un mapeo de solo lectura"""
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+
+        view = memoryview(mapped)
+        try:
+            # Por bloques para que hashlib libere el GIL y el sistema lea por delante
+            for offset in range(0, len(view), chunk_size):
+                digest.update(view[offset:offset + chunk_size])
+        finally:
+            view.release()
+
+
+def _update_from_reads(digest, f, chunk_size: int):
+    """Alimentar el hash leyendo con readinto sobre un buffer reutilizado"""
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    try:
+        while True:
+            read = f.readinto(view)
+            if not read:
+                break
+            digest.update(view[:read])
+    finally:
+        view.release()
+
+
+def hash_head_tail(path: str, size: int, chunk_size: int = HEAD_TAIL_CHUNK) -> Optional[str]:
+    """Hash rápido de los primeros y últimos chunk_size bytes de un archivo"""
+    digest = hashlib.blake2b(digest_size=16)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            read = f.readinto(view)
+            digest.update(view[:read])
+            if size > 2 * chunk_size:
+                f.seek(size - chunk_size)
+                read = f.readinto(view)
+                digest.update(view[:read])
+            elif size > chunk_size:
+                read = f.readinto(view)
+                digest.update(view[:read])
+    except OSError:
+        return None
+    finally:
+        view.release()
+    return digest.hexdigest()
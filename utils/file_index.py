@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice de Archivos - ModuStackClean
+Índice persistente en SQLite con re-escaneo incremental por mtime de carpeta
+"""
+
+import os
+import sqlite3
+import stat
+import threading
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from utils.file_scanner import FileRecord
+
+# Ubicación por defecto del índice local
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".modustackclean", "file_index.db")
+
+# Carpetas procesadas entre cada commit
+COMMIT_EVERY = 200
+
+
+class FileIndex:
+    """Índice local de archivos descubiertos
+
+    Una carpeta solo se vuelve a listar cuando su mtime cambió desde el último
+    escaneo. El mtime de una carpeta cambia al crear, borrar o renombrar
+    entradas, pero no al modificar el contenido de un archivo; para esos
+    casos scan(full=True) fuerza el listado completo.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_INDEX_PATH):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._pending_dirs = 0
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self):
+        """Crear las tablas del índice si no existen"""
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS directories (
+                    path TEXT PRIMARY KEY,
+                    parent TEXT,
+                    mtime REAL NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    directory TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    extension TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    ctime REAL NOT NULL,
+                    hash TEXT
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_directories_parent ON directories(parent)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_directory ON files(directory)")
+            self._connection.commit()
+            cursor.close()
+
+    def close(self):
+        """Guardar cambios pendientes y cerrar el índice"""
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
+
+    def scan(self, root: str, name_filter: Callable[[str], bool] = None,
+             should_stop: Callable[[], bool] = None, on_directory: Callable[[int], None] = None,
+             full: bool = False) -> Iterator[FileRecord]:
+        """Recorrer una raíz usando el índice y re-listando solo las carpetas modificadas"""
+        pending = [root]
+        try:
+            while pending:
+                if should_stop and should_stop():
+                    return
+
+                current_dir = pending.pop()
+                try:
+                    dir_mtime = os.stat(current_dir).st_mtime
+                except OSError:
+                    self.remove_tree(current_dir)
+                    continue
+
+                if not full and self._get_directory_mtime(current_dir) == dir_mtime:
+                    subdirs, records = self._load_directory(current_dir)
+                else:
+                    subdirs, records = self._relist_directory(current_dir, dir_mtime)
+
+                pending.extend(subdirs)
+                if on_directory:
+                    on_directory(len(records))
+                for record in records:
+                    if name_filter is None or name_filter(record.name):
+                        yield record
+        finally:
+            with self._lock:
+                self._connection.commit()
+                self._pending_dirs = 0
+
+    def _get_directory_mtime(self, path: str) -> Optional[float]:
+        """Obtener el mtime registrado de una carpeta"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT mtime FROM directories WHERE path = ?", (path,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _load_directory(self, path: str) -> Tuple[List[str], List[FileRecord]]:
+        """Leer del índice las subcarpetas y archivos de una carpeta sin cambios"""
+        with self._lock:
+            subdirs = [row[0] for row in self._connection.execute(
+                "SELECT path FROM directories WHERE parent = ?", (path,)
+            )]
+            records = [FileRecord(*row) for row in self._connection.execute(
+                "SELECT path, name, size, mtime, ctime FROM files WHERE directory = ?", (path,)
+            )]
+        return subdirs, records
+
+    def _relist_directory(self, path: str, dir_mtime: float) -> Tuple[List[str], List[FileRecord]]:
+        """Listar una carpeta modificada y sincronizar el índice con su contenido"""
+        subdirs = []
+        records = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            entry_stat = entry.stat(follow_symlinks=False)
+                            records.append(FileRecord(entry.path, entry.name, entry_stat.st_size,
+                                                      entry_stat.st_mtime, entry_stat.st_ctime))
+                    except OSError:
+                        continue
+        except OSError:
+            return [], []
+
+        with self._lock:
+            cursor = self._connection.cursor()
+
+            # Eliminar subcarpetas que ya no existen junto con su contenido
+            known_subdirs = {row[0] for row in cursor.execute(
+                "SELECT path FROM directories WHERE parent = ?", (path,)
+            )}
+            for removed in known_subdirs.difference(subdirs):
+                self.remove_tree(removed)
+
+            # Eliminar archivos que ya no existen
+            present = {record.path for record in records}
+            known_files = {row[0] for row in cursor.execute(
+                "SELECT path FROM files WHERE directory = ?", (path,)
+            )}
+            cursor.executemany("DELETE FROM files WHERE path = ?",
+                               [(removed,) for removed in known_files - present])
+
+            # Insertar o actualizar archivos; el hash se conserva si el archivo no cambió
+            cursor.executemany("""
+                INSERT INTO files (path, directory, name, extension, size, mtime, ctime, hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, NULL)
+                ON CONFLICT(path) DO UPDATE SET
+                    size = excluded.size,
+                    mtime = excluded.mtime,
+                    ctime = excluded.ctime,
+                    hash = CASE WHEN files.size = excluded.size AND files.mtime = excluded.mtime
+                                THEN files.hash ELSE NULL END
+            """, [
+                (r.path, path, r.name, os.path.splitext(r.name)[1].lower(), r.size, r.mtime, r.ctime)
+                for r in records
+            ])
+
+            cursor.execute("""
+                INSERT INTO directories (path, parent, mtime) VALUES (?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET mtime = excluded.mtime
+            """, (path, os.path.dirname(path), dir_mtime))
+            cursor.close()
+
+            self._pending_dirs += 1
+            if self._pending_dirs >= COMMIT_EVERY:
+                self._connection.commit()
+                self._pending_dirs = 0
+
+        return subdirs, records
+
+    def remove_tree(self, path: str):
+        """Eliminar del índice una carpeta y todo su contenido"""
+        prefix = path.rstrip(os.sep) + os.sep
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM directories WHERE path = ? OR substr(path, 1, ?) = ?",
+                (path, len(prefix), prefix)
+            )
+            self._connection.execute(
+                "DELETE FROM files WHERE directory = ? OR substr(directory, 1, ?) = ?",
+                (path, len(prefix), prefix)
+            )
+
+    def upsert_file(self, path: str) -> Optional[FileRecord]:
+        """Registrar o actualizar un archivo a partir de su stat (lo elimina si ya no existe)"""
+        try:
+            file_stat = os.stat(path, follow_symlinks=False)
+        except OSError:
+            self.remove_path(path)
+            return None
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+
+        directory, name = os.path.split(path)
+        record = FileRecord(path, name, file_stat.st_size, file_stat.st_mtime, file_stat.st_ctime)
+        with self._lock:
+            self._connection.execute("""
+                INSERT INTO files (path, directory, name, extension, size, mtime, ctime, hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, NULL)
+                ON CONFLICT(path) DO UPDATE SET
+                    size = excluded.size,
+                    mtime = excluded.mtime,
+                    ctime = excluded.ctime,
+                    hash = CASE WHEN files.size = excluded.size AND files.mtime = excluded.mtime
+                                THEN files.hash ELSE NULL END
+            """, (path, directory, name, os.path.splitext(name)[1].lower(), record.size, record.mtime, record.ctime))
+        return record
+
+    def remove_path(self, path: str):
+        """Eliminar del índice un archivo o una carpeta con todo su contenido"""
+        with self._lock:
+            self._connection.execute("DELETE FROM files WHERE path = ?", (path,))
+            self.remove_tree(path)
+
+    def refresh_directory(self, path: str):
+        """Re-listar una carpeta y escanear las subcarpetas que el índice no conocía"""
+        try:
+            dir_mtime = os.stat(path).st_mtime
+        except OSError:
+            self.remove_path(path)
+            return
+
+        with self._lock:
+            known = {row[0] for row in self._connection.execute(
+                "SELECT path FROM directories WHERE parent = ?", (path,)
+            )}
+        subdirs, _ = self._relist_directory(path, dir_mtime)
+        for subdir in subdirs:
+            if subdir not in known:
+                for _ in self.scan(subdir):
+                    pass
+
+    def list_directories(self, root: str) -> List[Tuple[str, float]]:
+        """Obtener las carpetas registradas bajo una raíz con su mtime"""
+        prefix = root.rstrip(os.sep) + os.sep
+        with self._lock:
+            return self._connection.execute(
+                "SELECT path, mtime FROM directories WHERE path = ? OR substr(path, 1, ?) = ?",
+                (root, len(prefix), prefix)
+            ).fetchall()
+
+    def get_file(self, path: str) -> Optional[FileRecord]:
+        """Obtener el registro de un archivo sin tocar el disco"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT path, name, size, mtime, ctime FROM files WHERE path = ?", (path,)
+            ).fetchone()
+        return FileRecord(*row) if row else None
+
+    def files_under(self, root: str) -> List[FileRecord]:
+        """Obtener los archivos registrados bajo una raíz sin tocar el disco"""
+        prefix = root.rstrip(os.sep) + os.sep
+        with self._lock:
+            return [FileRecord(*row) for row in self._connection.execute(
+                "SELECT path, name, size, mtime, ctime FROM files "
+                "WHERE directory = ? OR substr(directory, 1, ?) = ?",
+                (root, len(prefix), prefix)
+            )]
+
+    def commit(self):
+        """Guardar los cambios pendientes"""
+        with self._lock:
+            self._connection.commit()
+            self._pending_dirs = 0
+
+    def get_hash(self, path: str, size: int, mtime: float) -> Optional[str]:
+        """Obtener el hash registrado si el archivo no cambió desde que se calculó"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT hash FROM files WHERE path = ? AND size = ? AND mtime = ?",
+                (path, size, mtime)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_hash(self, path: str, file_hash: str):
+        """Registrar el hash de contenido de un archivo"""
+        with self._lock:
+            self._connection.execute("UPDATE files SET hash = ? WHERE path = ?", (file_hash, path))
+            self._connection.commit()
+
+    def count_files(self, root: str = None) -> int:
+        """Contar los archivos registrados en el índice (opcionalmente bajo una raíz)"""
+        with self._lock:
+            if root is None:
+                return self._connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+            prefix = root.rstrip(os.sep) + os.sep
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM files WHERE directory = ? OR substr(directory, 1, ?) = ?",
+                (root, len(prefix), prefix)
+            ).fetchone()[0]
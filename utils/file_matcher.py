@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Filtro de Archivos - ModuStackClean
+Filtro configurable de extensiones, patrones y tamaño/antigüedad compilado una sola vez
+"""
+
+import fnmatch
+import re
+import time
+from typing import Callable, Iterable, List, Optional
+
+# Extensiones buscadas por defecto (ejecutables y comprimidos)
+DEFAULT_EXTENSIONS = ('.exe', '.zip', '.rar', '.msi')
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class FileMatcher:
+    """Filtro de archivos compilado en estructuras de búsqueda rápida
+
+    El nombre se evalúa con un conjunto de sufijos y una sola expresión
+    regular; los predicados de tamaño y antigüedad se evalúan sobre el
+    FileRecord, solo para los archivos cuyo nombre ya coincidió.
+    """
+
+    def __init__(self, extensions: Iterable[str] = DEFAULT_EXTENSIONS, patterns: Iterable[str] = (),
+                 min_size: Optional[int] = None, max_size: Optional[int] = None,
+                 min_age_days: Optional[float] = None, max_age_days: Optional[float] = None,
+                 reference_time: float = None):
+        extensions = [self._normalize_extension(ext) for ext in extensions if ext]
+        patterns = [pattern for pattern in patterns if pattern]
+
+        # Sufijos simples (".zip") en un conjunto; compuestos (".tar.gz") en una tupla
+        self._suffixes = frozenset(ext for ext in extensions if ext.count('.') == 1)
+        self._long_suffixes = tuple(ext for ext in extensions if ext.count('.') > 1)
+        self._pattern = (
+            re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns), re.IGNORECASE)
+            if patterns else None
+        )
+        self._match_all_names = not extensions and not patterns
+
+        now = reference_time if reference_time is not None else time.time()
+        self._predicates: List[Callable] = []
+        if min_size is not None:
+            self._predicates.append(lambda record: record.size >= min_size)
+        if max_size is not None:
+            self._predicates.append(lambda record: record.size <= max_size)
+        if min_age_days is not None:
+            newest_mtime = now - min_age_days * SECONDS_PER_DAY
+            self._predicates.append(lambda record: record.mtime <= newest_mtime)
+        if max_age_days is not None:
+            oldest_mtime = now - max_age_days * SECONDS_PER_DAY
+            self._predicates.append(lambda record: record.mtime >= oldest_mtime)
+
+    @staticmethod
+    def _normalize_extension(extension: str) -> str:
+        """Normalizar una extensión a minúsculas y con punto inicial"""
+        extension = extension.strip().lower()
+        return extension if extension.startswith('.') else f".{extension}"
+
+    @classmethod
+    def from_config(cls, config) -> "FileMatcher":
+        """Crear el filtro a partir de AppConfig"""
+        return cls(
+            extensions=getattr(config, 'SEARCH_EXTENSIONS', DEFAULT_EXTENSIONS),
+            patterns=getattr(config, 'SEARCH_PATTERNS', ()),
+            min_size=getattr(config, 'SEARCH_MIN_SIZE', None),
+            max_size=getattr(config, 'SEARCH_MAX_SIZE', None),
+            min_age_days=getattr(config, 'SEARCH_MIN_AGE_DAYS', None),
+            max_age_days=getattr(config, 'SEARCH_MAX_AGE_DAYS', None)
+        )
+
+    def add_predicate(self, predicate: Callable) -> "FileMatcher":
+        """Agregar un predicado propio sobre el FileRecord"""
+        self._predicates.append(predicate)
+        return self
+
+    @property
+    def has_record_predicates(self) -> bool:
+        """Indicar si hay predicados que necesitan tamaño o fechas"""
+        return bool(self._predicates)
+
+    def matches_name(self, name: str) -> bool:
+        """Verificar si el nombre del archivo coincide"""
+        if self._match_all_names:
+            return True
+
+        dot = name.rfind('.')
+        if dot >= 0 and name[dot:].lower() in self._suffixes:
+            return True
+        if self._long_suffixes and name.lower().endswith(self._long_suffixes):
+            return True
+        if self._pattern is not None and self._pattern.match(name):
+            return True
+        return False
+
+    def matches_record(self, record) -> bool:
+        """Verificar los predicados de tamaño, antigüedad y los agregados"""
+        for predicate in self._predicates:
+            if not predicate(record):
+                return False
+        return True
+
+    def matches(self, record) -> bool:
+        """Verificar nombre y predicados de un FileRecord"""
+        return self.matches_name(record.name) and self.matches_record(record)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Organizador de Archivos - ModuStackClean
+Motor de organización por reglas con vista previa y movimientos por lotes
+"""
+
+import errno
+import os
+import shutil
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from utils.file_hasher import hash_file
+from utils.file_matcher import FileMatcher
+from utils.file_scanner import FileRecord
+
+# Movimientos ejecutados entre cada notificación de progreso
+DEFAULT_BATCH_SIZE = 200
+
+# Sufijo del archivo temporal durante una copia entre discos
+PARTIAL_SUFFIX = ".partial"
+
+
+class OrganizeRule(NamedTuple):
+    """Regla de organización: los archivos que coinciden van a la carpeta de la categoría"""
+    category: str
+    matcher: FileMatcher
+
+
+class PlannedMove(NamedTuple):
+    """Movimiento calculado por el plan"""
+    source: str
+    destination: str
+    size: int
+    category: str
+
+
+class MoveResult(NamedTuple):
+    """Resultado de ejecutar un movimiento"""
+    move: PlannedMove
+    success: bool
+    error: Optional[str]
+
+
+def move_file(source: str, destination: str, verify: bool = True):
+    """Mover un archivo sin sobrescribir el destino
+
+    En el mismo disco se usa os.replace (un rename, sin copiar datos). Entre
+    discos se copia a un temporal, se verifica tamaño y hash, se renombra
+    al destino y solo entonces se borra el origen.
+    """
+    if os.path.lexists(destination):
+        raise FileExistsError(errno.EEXIST, "El destino ya existe", destination)
+
+    try:
+        same_device = os.stat(source).st_dev == os.stat(os.path.dirname(destination)).st_dev
+    except OSError:
+        same_device = False
+
+    if same_device:
+        try:
+            os.replace(source, destination)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+    _copy_and_verify(source, destination, verify)
+
+
+def _copy_and_verify(source: str, destination: str, verify: bool):
+    """Copiar entre discos verificando el contenido antes de borrar el origen"""
+    partial = destination + PARTIAL_SUFFIX
+    try:
+        shutil.copy2(source, partial)
+        if verify:
+            if os.path.getsize(partial) != os.path.getsize(source):
+                raise OSError(errno.EIO, "El tamaño de la copia no coincide", destination)
+            if hash_file(partial) != hash_file(source):
+                raise OSError(errno.EIO, "El contenido de la copia no coincide", destination)
+        os.replace(partial, destination)
+    except OSError:
+        try:
+            os.remove(partial)
+        except OSError:
+            pass
+        raise
+
+    os.remove(source)
+
+
+class FileOrganizer:
+    """Organizador de resultados de escaneo en carpetas por categoría
+
+    plan() solo calcula los movimientos (vista previa, sin tocar archivos);
+    execute() los aplica por lotes creando primero las carpetas de cada lote.
+    """
+
+    def __init__(self, rules: List[OrganizeRule], target_root: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, verify: bool = True):
+        self.rules = rules
+        self.target_root = target_root
+        self.batch_size = max(1, batch_size)
+        self.verify = verify
+        self.stats = {}
+
+    @classmethod
+    def from_config(cls, config) -> "FileOrganizer":
+        """Crear el organizador a partir de AppConfig"""
+        rules = [
+            OrganizeRule(rule["category"], FileMatcher(
+                extensions=rule.get("extensions", ()),
+                patterns=rule.get("patterns", ()),
+                min_size=rule.get("min_size"),
+                max_size=rule.get("max_size"),
+                min_age_days=rule.get("min_age_days"),
+                max_age_days=rule.get("max_age_days")
+            ))
+            for rule in getattr(config, 'ORGANIZER_RULES', [])
+        ]
+        return cls(
+            rules,
+            target_root=getattr(config, 'ORGANIZER_TARGET_DIR', None),
+            batch_size=getattr(config, 'ORGANIZER_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+        )
+
+    def category_for(self, record: FileRecord) -> Optional[str]:
+        """Obtener la categoría de la primera regla que coincide"""
+        for rule in self.rules:
+            if rule.matcher.matches(record):
+                return rule.category
+        return None
+
+    def plan(self, records: Iterable[FileRecord]) -> List[PlannedMove]:
+        """Calcular los movimientos sin modificar ningún archivo"""
+        moves = []
+        taken: Dict[str, Set[str]] = {}
+        seen = set()
+
+        for record in records:
+            if record.path in seen:
+                continue
+            seen.add(record.path)
+
+            category = self.category_for(record)
+            if category is None:
+                continue
+
+            # Ya está organizado: en la carpeta de destino o, sin destino fijo, en una carpeta de su categoría
+            if self.target_root is None:
+                if os.path.basename(record.directory).lower() == category.lower():
+                    continue
+                target_dir = os.path.join(record.directory, category)
+            else:
+                target_dir = os.path.join(self.target_root, category)
+                if os.path.normcase(os.path.normpath(record.directory)) == os.path.normcase(os.path.normpath(target_dir)):
+                    continue
+
+            if target_dir not in taken:
+                taken[target_dir] = self._existing_names(target_dir)
+            name = self._free_name(record.name, taken[target_dir])
+            moves.append(PlannedMove(record.path, os.path.join(target_dir, name), record.size, category))
+
+        return moves
+
+    @staticmethod
+    def _existing_names(directory: str) -> Set[str]:
+        """Listar una sola vez los nombres ya presentes en una carpeta de destino"""
+        try:
+            with os.scandir(directory) as entries:
+                return {entry.name.lower() for entry in entries}
+        except OSError:
+            return set()
+
+    @staticmethod
+    def _free_name(name: str, taken: Set[str]) -> str:
+        """Elegir un nombre libre agregando " (n)" si hace falta"""
+        candidate = name
+        stem, extension = os.path.splitext(name)
+        counter = 1
+        while candidate.lower() in taken:
+            candidate = f"{stem} ({counter}){extension}"
+            counter += 1
+        taken.add(candidate.lower())
+        return candidate
+
+    def execute(self, moves: List[PlannedMove], on_batch: Callable[[int, int], None] = None,
+                should_stop: Callable[[], bool] = None, journal=None) -> List[MoveResult]:
+        """Ejecutar los movimientos por lotes
+
+        Con un MoveJournal el plan se registra antes de mover nada y los
+        resultados se sincronizan al terminar cada lote.
+        """
+        move_ids = journal.record_plan(moves) if journal else None
+        return self._run(moves, move_ids, journal, on_batch, should_stop)
+
+    def resume(self, journal, on_batch: Callable[[int, int], None] = None,
+               should_stop: Callable[[], bool] = None) -> List[MoveResult]:
+        """Continuar una ejecución interrumpida sin volver a escanear"""
+        journal.reconcile()
+        move_ids = journal.pending()
+        print(f"🔁 Reanudando organización: {len(move_ids)} movimientos pendientes ({journal.path})")
+        return self._run([journal.moves[move_id] for move_id in move_ids], move_ids, journal,
+                         on_batch, should_stop)
+
+    def _run(self, moves: List[PlannedMove], move_ids: Optional[List[int]], journal,
+             on_batch: Callable[[int, int], None], should_stop: Callable[[], bool]) -> List[MoveResult]:
+        """Ejecutar movimientos por lotes registrando cada lote en el diario"""
+        results = []
+        self.stats = {"planned": len(moves), "moved": 0, "failed": 0, "bytes_moved": 0}
+        stopped = False
+
+        for start in range(0, len(moves), self.batch_size):
+            if should_stop and should_stop():
+                stopped = True
+                break
+
+            batch = moves[start:start + self.batch_size]
+            for directory in {os.path.dirname(move.destination) for move in batch}:
+                try:
+                    os.makedirs(directory, exist_ok=True)
+                except OSError as e:
+                    print(f"⚠️ No se pudo crear la carpeta {directory}: {e}")
+
+            for offset, move in enumerate(batch):
+                result = self._execute_move(move)
+                results.append(result)
+                if journal:
+                    journal.record_result(move_ids[start + offset], result.success, result.error)
+
+            if journal:
+                journal.flush()
+            if on_batch:
+                on_batch(len(results), len(moves))
+
+        if journal:
+            if stopped:
+                journal.close()
+            else:
+                journal.mark_complete()
+        return results
+
+    def rollback(self, journal, on_batch: Callable[[int, int], None] = None) -> int:
+        """Deshacer los movimientos completados de un diario, del último al primero"""
+        journal.reconcile()
+        move_ids = list(reversed(journal.done()))
+        self.stats = {"undone": 0, "failed": 0}
+        target_dirs = set()
+
+        for start in range(0, len(move_ids), self.batch_size):
+            for move_id in move_ids[start:start + self.batch_size]:
+                move = journal.moves[move_id]
+                target_dirs.add(os.path.dirname(move.destination))
+                try:
+                    os.makedirs(os.path.dirname(move.source), exist_ok=True)
+                    move_file(move.destination, move.source, self.verify)
+                except OSError as e:
+                    print(f"❌ No se pudo deshacer {move.destination}: {e}")
+                    self.stats["failed"] += 1
+                    continue
+                journal.record_undone(move_id)
+                self.stats["undone"] += 1
+
+            journal.flush()
+            if on_batch:
+                on_batch(min(start + self.batch_size, len(move_ids)), len(move_ids))
+
+        # Quitar las carpetas de categoría que quedaron vacías
+        for directory in target_dirs:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+
+        journal.mark_complete()
+        return self.stats["undone"]
+
+    def _execute_move(self, move: PlannedMove) -> MoveResult:
+        """Ejecutar un movimiento y registrar el resultado"""
+        try:
+            move_file(move.source, move.destination, self.verify)
+        except OSError as e:
+            self.stats["failed"] += 1
+            return MoveResult(move, False, str(e))
+
+        self.stats["moved"] += 1
+        self.stats["bytes_moved"] += move.size
+        return MoveResult(move, True, None)
+
+    @staticmethod
+    def summarize(moves: List[PlannedMove]) -> Dict[str, int]:
+        """Contar los movimientos de un plan por categoría"""
+        summary: Dict[str, int] = {}
+        for move in moves:
+            summary[move.category] = summary.get(move.category, 0) + 1
+        return summary
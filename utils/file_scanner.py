@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de Escaneo - ModuStackClean
+Búsqueda de archivos en hilos de trabajo, cancelable y con resultados parciales
+"""
+
+import os
+import platform
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from utils.file_matcher import FileMatcher
+from utils.scan_progress import ScanProgress
+
+# Carpetas estándar del usuario donde se busca
+STANDARD_FOLDERS = ("Desktop", "Downloads", "Documents", "Pictures", "Music", "Videos")
+
+# Tipos de unidad de Windows que se escanean (DRIVE_REMOVABLE, DRIVE_FIXED)
+_SCANNABLE_DRIVE_TYPES = (2, 3)
+
+
+class FileRecord(NamedTuple):
+    """Archivo encontrado con los metadatos leídos durante el recorrido"""
+    path: str
+    name: str
+    size: int
+    mtime: float
+    ctime: float
+
+    @property
+    def directory(self) -> str:
+        """Carpeta que contiene el archivo"""
+        return os.path.dirname(self.path)
+
+
+def scan_directory(root: str, name_filter: Callable[[str], bool] = None,
+                   should_stop: Callable[[], bool] = None,
+                   on_directory: Callable[[int], None] = None) -> Iterator[FileRecord]:
+    """Recorrer un árbol con os.scandir reutilizando el stat de cada DirEntry
+
+    Solo se consulta el stat de los archivos que pasan name_filter, y el
+    tamaño y las fechas viajan en el FileRecord para no volver al disco.
+    on_directory(file_count) se llama una vez por carpeta recorrida.
+    """
+    pending = [root]
+    while pending:
+        if should_stop and should_stop():
+            return
+
+        current_dir = pending.pop()
+        try:
+            entries = os.scandir(current_dir)
+        except OSError:
+            continue
+
+        file_count = 0
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    file_count += 1
+                    if name_filter and not name_filter(entry.name):
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                yield FileRecord(entry.path, entry.name, stat.st_size, stat.st_mtime, stat.st_ctime)
+
+        if on_directory:
+            on_directory(file_count)
+
+
+def detect_drives() -> List[str]:
+    """Detectar los discos locales del sistema"""
+    if platform.system() != "Windows":
+        return ["/"]
+
+    drives = []
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        bitmask = kernel32.GetLogicalDrives()
+        for index, letter in enumerate(string.ascii_uppercase):
+            if bitmask & (1 << index):
+                drive = f"{letter}:\\"
+                # Omitir unidades de red, CD-ROM y discos RAM
+                if kernel32.GetDriveTypeW(drive) in _SCANNABLE_DRIVE_TYPES:
+                    drives.append(drive)
+    except Exception as e:
+        print(f"⚠️ Error detectando discos con la API de Windows: {e}")
+        drives = [f"{letter}:\\" for letter in string.ascii_uppercase if os.path.exists(f"{letter}:\\")]
+
+    return drives or ["C:\\"]
+
+
+def get_standard_paths(drive: str, current_user: Optional[str] = None) -> List[str]:
+    """Obtener las rutas estándar de usuario que existen en un disco"""
+    candidates = []
+
+    if platform.system() == "Windows":
+        if current_user:
+            candidates.extend(os.path.join(drive, "Users", current_user, folder) for folder in STANDARD_FOLDERS)
+        candidates.extend(os.path.join(drive, "Users", "Public", folder) for folder in STANDARD_FOLDERS)
+        # Carpetas reubicadas a la raíz de discos secundarios (por ejemplo D:\Downloads)
+        candidates.extend(os.path.join(drive, folder) for folder in STANDARD_FOLDERS)
+
+    # Carpetas reales del perfil cuando el perfil está en este disco
+    home = os.path.expanduser("~")
+    if os.path.splitdrive(home)[0].upper() == os.path.splitdrive(drive)[0].upper():
+        candidates.extend(os.path.join(home, folder) for folder in STANDARD_FOLDERS)
+
+    paths = []
+    seen = set()
+    for path in candidates:
+        key = os.path.normcase(os.path.normpath(path))
+        if key not in seen and os.path.isdir(path):
+            seen.add(key)
+            paths.append(path)
+    return paths
+
+
+def _device_of(path: str):
+    """Identificar el dispositivo físico de una ruta"""
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+
+class FileScanner:
+    """Motor de escaneo de archivos que no bloquea el hilo de la interfaz"""
+
+    def __init__(self, matcher: FileMatcher = None, max_workers: int = None,
+                 max_workers_per_device: int = 2, batch_size: int = 50,
+                 max_per_root: Optional[int] = None, index=None, keep_results: bool = True,
+                 progress: ScanProgress = None):
+        self.matcher = matcher or FileMatcher()
+        self.progress = progress or ScanProgress()
+        # Sin keep_results los registros solo viajan en los lotes (para almacenes externos)
+        self.keep_results = keep_results
+        self.index = index
+        # Escaneo limitado por E/S: más hilos que núcleos, pero acotado
+        self.max_workers = max(1, max_workers or min(16, (os.cpu_count() or 2) * 2))
+        self.max_workers_per_device = max(1, max_workers_per_device)
+        self.batch_size = max(1, batch_size)
+        self.max_per_root = max_per_root
+
+        self.is_running = False
+        self.was_cancelled = False
+        self.results: Dict[str, List[FileRecord]] = {}
+        self.root_status: Dict[str, Dict] = {}
+
+        self._device_slots: Dict = {}
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._done_event = threading.Event()
+        self._done_event.set()
+
+    def start(self, roots: Iterable[str], on_batch: Callable = None, on_complete: Callable = None,
+              runner: Callable = None, on_root_progress: Callable = None,
+              on_progress: Callable = None) -> bool:
+        """Iniciar el escaneo en segundo plano
+
+        on_batch(root, records) se llama con cada lote parcial de FileRecord encontrados.
+        on_complete(results, cancelled) se llama una sola vez al terminar.
+        on_root_progress(root, status) se llama cuando cambia el estado de una raíz.
+        on_progress(stats) recibe los contadores globales como máximo 10 veces por segundo.
+        runner(func) permite lanzar el hilo coordinador (por ejemplo page.run_thread).
+        """
+        with self._lock:
+            if self.is_running:
+                print("⚠️ Escaneo ya en progreso")
+                return False
+
+            self.is_running = True
+            self.was_cancelled = False
+            self.results = {}
+            self.root_status = {}
+            self._cancel_event.clear()
+            self._resume_event.set()
+            self._done_event.clear()
+
+        roots = list(dict.fromkeys(roots))
+        if on_progress:
+            self.progress.on_update = on_progress
+        self.progress.start()
+        with self._lock:
+            for root in roots:
+                self.root_status[root] = {"state": "pendiente", "found": 0}
+
+        if runner:
+            runner(self._run, roots, on_batch, on_complete, on_root_progress)
+        else:
+            threading.Thread(
+                target=self._run,
+                args=(roots, on_batch, on_complete, on_root_progress),
+                daemon=True
+            ).start()
+        return True
+
+    def cancel(self):
+        """Cancelar el escaneo en curso"""
+        self._cancel_event.set()
+        # Despertar a los hilos pausados para que puedan terminar
+        self._resume_event.set()
+
+    def pause(self):
+        """Pausar el escaneo en curso"""
+        if self.is_running:
+            self._resume_event.clear()
+
+    def resume(self):
+        """Reanudar un escaneo pausado"""
+        self._resume_event.set()
+
+    def is_paused(self) -> bool:
+        """Verificar si el escaneo está pausado"""
+        return self.is_running and not self._resume_event.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Esperar a que el escaneo termine"""
+        return self._done_event.wait(timeout)
+
+    def get_progress(self) -> Dict:
+        """Obtener los contadores globales del escaneo"""
+        return self.progress.snapshot()
+
+    def get_root_status(self) -> Dict[str, Dict]:
+        """Obtener una copia del progreso de cada raíz"""
+        with self._lock:
+            return {root: dict(status) for root, status in self.root_status.items()}
+
+    def _set_root_status(self, root: str, on_root_progress: Callable, state: str = None, found: int = None):
+        """Actualizar el progreso de una raíz y notificarlo"""
+        with self._lock:
+            status = self.root_status.setdefault(root, {"state": "pendiente", "found": 0})
+            if state is not None:
+                status["state"] = state
+            if found is not None:
+                status["found"] = found
+            snapshot = dict(status)
+
+        if on_root_progress:
+            try:
+                on_root_progress(root, snapshot)
+            except Exception as e:
+                print(f"⚠️ Error en callback de progreso: {e}")
+
+    def _order_by_device(self, roots: List[str]) -> List[str]:
+        """Intercalar las raíces por dispositivo para repartir la E/S entre discos"""
+        groups: Dict = {}
+        for root in roots:
+            groups.setdefault(_device_of(root), []).append(root)
+
+        ordered = []
+        queues = list(groups.values())
+        while queues:
+            for queue in list(queues):
+                ordered.append(queue.pop(0))
+                if not queue:
+                    queues.remove(queue)
+        return ordered
+
+    def _device_slot(self, root: str) -> threading.Semaphore:
+        """Obtener el semáforo que limita los hilos simultáneos por dispositivo"""
+        device = _device_of(root)
+        with self._lock:
+            if device not in self._device_slots:
+                self._device_slots[device] = threading.Semaphore(self.max_workers_per_device)
+            return self._device_slots[device]
+
+    def _should_stop(self) -> bool:
+        """Bloquear mientras esté pausado e indicar si se canceló"""
+        self._resume_event.wait()
+        return self._cancel_event.is_set()
+
+    def _run(self, roots: List[str], on_batch: Callable, on_complete: Callable, on_root_progress: Callable):
+        """Hilo coordinador: reparte las raíces entre los hilos de trabajo"""
+        try:
+            # El índice conoce cuántos archivos había la última vez: sirve para estimar el ETA
+            if self.index:
+                self.progress.expected_files = sum(self.index.count_files(root) for root in roots) or None
+
+            workers = min(self.max_workers, max(1, len(roots)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan") as executor:
+                futures = {
+                    executor.submit(self._scan_root, root, on_batch, on_root_progress): root
+                    for root in self._order_by_device(roots)
+                }
+                for future, root in futures.items():
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"⚠️ Error en hilo de escaneo: {e}")
+                        self._set_root_status(root, on_root_progress, state="error")
+        finally:
+            self.progress.finish()
+            self.progress.log_summary()
+            with self._lock:
+                self.is_running = False
+                self.was_cancelled = self._cancel_event.is_set()
+                results = {root: list(records) for root, records in self.results.items()}
+            self._done_event.set()
+
+            if on_complete:
+                try:
+                    on_complete(results, self.was_cancelled)
+                except Exception as e:
+                    print(f"❌ Error en callback de finalización: {e}")
+
+    def _scan_root(self, root: str, on_batch: Callable, on_root_progress: Callable = None):
+        """Recorrer una raíz y emitir lotes de archivos encontrados"""
+        if not os.path.isdir(root):
+            self._set_root_status(root, on_root_progress, state="omitida")
+            return
+
+        with self._device_slot(root):
+            self._scan_root_locked(root, on_batch, on_root_progress)
+
+    def _scan_root_locked(self, root: str, on_batch: Callable, on_root_progress: Callable):
+        """Recorrer una raíz con el cupo de su dispositivo ya reservado"""
+        if self._cancel_event.is_set():
+            self._set_root_status(root, on_root_progress, state="cancelada")
+            return
+
+        print(f"📁 Buscando en: {root}")
+        self._set_root_status(root, on_root_progress, state="escaneando")
+        found = 0
+        batch = []
+        state = "completada"
+
+        def flush():
+            if not batch:
+                return
+            if self.keep_results:
+                with self._lock:
+                    self.results.setdefault(root, []).extend(batch)
+            self._set_root_status(root, on_root_progress, found=found)
+            if on_batch:
+                try:
+                    on_batch(root, list(batch))
+                except Exception as e:
+                    print(f"⚠️ Error en callback de lote: {e}")
+            batch.clear()
+
+        # Con índice persistente solo se vuelven a listar las carpetas modificadas
+        walk = self.index.scan if self.index else scan_directory
+        records = walk(root, name_filter=self.matcher.matches_name, should_stop=self._should_stop,
+                       on_directory=self.progress.add_directory)
+        check_record = self.matcher.has_record_predicates
+        try:
+            for record in records:
+                if check_record and not self.matcher.matches_record(record):
+                    continue
+                self.progress.add_match(record.size)
+                batch.append(record)
+                found += 1
+                if len(batch) >= self.batch_size:
+                    flush()
+                if self.max_per_root and found >= self.max_per_root:
+                    break
+            if self._cancel_event.is_set():
+                state = "cancelada"
+        except Exception as e:
+            print(f"  ⚠️ Error en {root}: {e}")
+            state = "error"
+        finally:
+            records.close()
+            flush()
+            self._set_root_status(root, on_root_progress, state=state, found=found)
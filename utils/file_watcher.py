@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vigilante de Archivos - ModuStackClean
+Mantiene el índice al día con inotify (Linux) o sondeo de carpetas como respaldo
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Tipos de cambio entregados al índice
+CHANGE_CREATED = "created"
+CHANGE_MODIFIED = "modified"
+CHANGE_DELETED = "deleted"
+CHANGE_DIRECTORY = "directory"  # Re-listar la carpeta
+CHANGE_RESCAN = "rescan"  # Se perdieron eventos: re-escaneo incremental de la raíz
+
+# Espera sin eventos antes de aplicar los cambios acumulados
+DEFAULT_DEBOUNCE = 0.5
+
+# Espera máxima desde el primer cambio pendiente aunque sigan llegando eventos
+MAX_LATENCY = 3.0
+
+# Intervalo del sondeo de carpetas
+DEFAULT_POLL_INTERVAL = 5.0
+
+# Constantes de inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONTFOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+              IN_DELETE_SELF | IN_ONLYDIR | IN_DONTFOLLOW)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def _list_subdirs(path: str) -> List[str]:
+    """Listar las subcarpetas directas de una carpeta"""
+    try:
+        with os.scandir(path) as entries:
+            return [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return []
+
+
+def _walk_dirs(root: str) -> List[str]:
+    """Listar una raíz y todas sus subcarpetas"""
+    found = []
+    pending = [root]
+    while pending:
+        current = pending.pop()
+        found.append(current)
+        pending.extend(_list_subdirs(current))
+    return found
+
+
+class _InotifyBackend:
+    """Eventos del kernel con inotify, una vigilancia por carpeta"""
+
+    def __init__(self, emit: Callable[[str, str], None]):
+        self.emit = emit
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falló")
+        self._paths: Dict[int, str] = {}
+        self.roots: List[str] = []
+
+    def add_tree(self, root: str):
+        """Vigilar una carpeta y todas sus subcarpetas"""
+        for path in _walk_dirs(root):
+            self._add_watch(path)
+
+    def _add_watch(self, path: str):
+        """Agregar la vigilancia de una carpeta"""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise OSError(error, "Límite de vigilancias de inotify alcanzado (fs.inotify.max_user_watches)")
+            return  # Carpeta eliminada o sin permisos
+        self._paths[wd] = path
+
+    def run(self, stop_event: threading.Event):
+        """Leer eventos hasta que se pida detener"""
+        try:
+            while not stop_event.is_set():
+                ready, _, _ = select.select([self._fd], [], [], 0.5)
+                if not ready:
+                    continue
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                self._dispatch(data)
+        finally:
+            self.close()
+
+    def close(self):
+        """Cerrar el descriptor de inotify (libera todas sus vigilancias)"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _dispatch(self, data: bytes):
+        """Traducir los eventos crudos a cambios"""
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                for root in self.roots:
+                    self.emit(root, CHANGE_RESCAN)
+                continue
+
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                self._paths.pop(wd, None)
+                continue
+            if mask & IN_DELETE_SELF:
+                self.emit(directory, CHANGE_DELETED)
+                continue
+
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        self.add_tree(path)
+                    except OSError as e:
+                        print(f"⚠️ {e}")
+                    self.emit(path, CHANGE_DIRECTORY)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self.emit(path, CHANGE_DELETED)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                self.emit(path, CHANGE_DELETED)
+            elif mask & IN_CREATE:
+                self.emit(path, CHANGE_CREATED)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                self.emit(path, CHANGE_MODIFIED)
+
+
+class _PollingBackend:
+    """Sondeo periódico que solo consulta el mtime de las carpetas
+
+    Crear, borrar o renombrar una entrada cambia el mtime de su carpeta;
+    esa carpeta se re-lista y las demás no se tocan. Las modificaciones
+    del contenido de un archivo existente no se detectan por esta vía.
+    """
+
+    def __init__(self, emit: Callable[[str, str], None], interval: float = DEFAULT_POLL_INTERVAL, index=None):
+        self.emit = emit
+        self.interval = interval
+        self.index = index
+        self._mtimes: Dict[str, float] = {}
+        self.roots: List[str] = []
+
+    def add_tree(self, root: str):
+        """Registrar el mtime de una raíz y sus subcarpetas"""
+        known = self.index.list_directories(root) if self.index else []
+        if known:
+            self._mtimes.update(known)
+            return
+        for path in _walk_dirs(root):
+            self._stat_into(path)
+
+    def _stat_into(self, path: str) -> Optional[float]:
+        """Leer y registrar el mtime de una carpeta"""
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        self._mtimes[path] = mtime
+        return mtime
+
+    def run(self, stop_event: threading.Event):
+        """Sondear hasta que se pida detener"""
+        while not stop_event.wait(self.interval):
+            self.poll()
+
+    def poll(self):
+        """Comparar el mtime de cada carpeta con el registrado"""
+        for path, known_mtime in list(self._mtimes.items()):
+            if path not in self._mtimes:
+                continue  # Eliminada junto con su carpeta padre en esta vuelta
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                prefix = path.rstrip(os.sep) + os.sep
+                for gone in [known for known in self._mtimes if known == path or known.startswith(prefix)]:
+                    del self._mtimes[gone]
+                self.emit(path, CHANGE_DELETED)
+                continue
+
+            if mtime != known_mtime:
+                self._mtimes[path] = mtime
+                self.emit(path, CHANGE_DIRECTORY)
+                for subdir in _list_subdirs(path):
+                    if subdir not in self._mtimes:
+                        for new_dir in _walk_dirs(subdir):
+                            self._stat_into(new_dir)
+
+
+class FileWatcher:
+    """Vigilante de raíces que alimenta el índice con cambios agrupados
+
+    Los eventos se acumulan por ruta (el último gana) y se aplican cuando
+    pasan `debounce` segundos sin eventos nuevos, o como mucho MAX_LATENCY
+    segundos después del primero. Así, copiar cien archivos en Downloads
+    produce una sola actualización del índice y de la interfaz.
+    """
+
+    def __init__(self, index=None, on_changes: Callable[[Dict[str, str]], None] = None,
+                 debounce: float = DEFAULT_DEBOUNCE, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 use_inotify: bool = True):
+        self.index = index
+        self.on_changes = on_changes
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify and sys.platform.startswith("linux")
+        self.backend_name = None
+        self.roots: List[str] = []
+
+        self._pending: Dict[str, str] = {}
+        self._first_event = 0.0
+        self._last_event = 0.0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self, roots: List[str]):
+        """Empezar a vigilar las raíces"""
+        self.roots = list(dict.fromkeys(roots))
+        self._stop_event.clear()
+
+        backend = None
+        if self.use_inotify:
+            try:
+                backend = _InotifyBackend(self._emit)
+                for root in self.roots:
+                    backend.add_tree(root)
+                self.backend_name = "inotify"
+            except (OSError, AttributeError) as e:
+                print(f"⚠️ inotify no disponible, se usará sondeo de carpetas: {e}")
+                if backend is not None:
+                    # Las vigilancias ya agregadas siguen contando en max_user_watches
+                    backend.close()
+                backend = None
+
+        if backend is None:
+            backend = _PollingBackend(self._emit, self.poll_interval, self.index)
+            for root in self.roots:
+                backend.add_tree(root)
+            self.backend_name = "sondeo"
+
+        backend.roots = self.roots
+        self._threads = [
+            threading.Thread(target=backend.run, args=(self._stop_event,), daemon=True),
+            threading.Thread(target=self._dispatch_loop, daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+        print(f"👁️ Vigilando {len(self.roots)} rutas con {self.backend_name}")
+
+    def stop(self, timeout: float = 2.0):
+        """Detener la vigilancia"""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _emit(self, path: str, kind: str):
+        """Acumular un cambio para la próxima entrega"""
+        now = time.monotonic()
+        with self._lock:
+            if not self._pending:
+                self._first_event = now
+            self._pending[path] = kind
+            self._last_event = now
+
+    def _dispatch_loop(self):
+        """Entregar los cambios acumulados cuando los eventos se calman"""
+        while not self._stop_event.wait(self.debounce / 2):
+            self.flush()
+        self.flush(force=True)
+
+    def flush(self, force: bool = False) -> Dict[str, str]:
+        """Aplicar los cambios pendientes si corresponde"""
+        now = time.monotonic()
+        with self._lock:
+            if not self._pending:
+                return {}
+            quiet = now - self._last_event >= self.debounce
+            overdue = now - self._first_event >= MAX_LATENCY
+            if not (force or quiet or overdue):
+                return {}
+            changes, self._pending = self._pending, {}
+
+        if self.index:
+            try:
+                self.apply(changes)
+            except Exception as e:
+                print(f"❌ Error aplicando cambios al índice: {e}")
+        if self.on_changes:
+            try:
+                self.on_changes(changes)
+            except Exception as e:
+                print(f"⚠️ Error en callback de cambios: {e}")
+        return changes
+
+    def apply(self, changes: Dict[str, str]):
+        """Aplicar un grupo de cambios al índice"""
+        refreshed = {path for path, kind in changes.items() if kind in (CHANGE_DIRECTORY, CHANGE_RESCAN)}
+        for path, kind in changes.items():
+            if kind == CHANGE_DELETED:
+                self.index.remove_path(path)
+            elif kind == CHANGE_RESCAN:
+                for _ in self.index.scan(path):
+                    pass
+            elif kind == CHANGE_DIRECTORY:
+                self.index.refresh_directory(path)
+            elif os.path.dirname(path) not in refreshed:
+                # La carpeta re-listada ya incluye este archivo
+                self.index.upsert_file(path)
+        self.index.commit()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diario de Movimientos - ModuStackClean
+Registro append-only de movimientos para reanudar o deshacer una organización
+"""
+
+import glob
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from utils.file_hasher import hash_file
+from utils.file_organizer import PARTIAL_SUFFIX, PlannedMove
+
+# Carpeta por defecto de los diarios
+DEFAULT_JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".modustackclean", "journals")
+
+# Estados de un movimiento en el diario
+STATE_PLANNED = "planned"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+STATE_UNDONE = "undone"
+
+
+class MoveJournal:
+    """Diario JSON-lines de una ejecución del organizador
+
+    El plan completo se escribe y sincroniza antes de mover nada; los
+    resultados se acumulan en memoria y se sincronizan con fsync una vez
+    por lote. Si el proceso se interrumpe se pierde como mucho el último
+    lote de resultados, que se reconcilia mirando si el origen o el destino
+    existen en disco.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.moves: List[PlannedMove] = []
+        self.states: Dict[int, str] = {}
+        self.completed = False
+
+        self._buffer: List[str] = []
+        self._file = None
+        if os.path.exists(path):
+            self._load()
+
+    @classmethod
+    def create(cls, directory: str = DEFAULT_JOURNAL_DIR) -> "MoveJournal":
+        """Crear un diario nuevo con nombre por fecha"""
+        os.makedirs(directory, exist_ok=True)
+        name = time.strftime("organize_%Y%m%d_%H%M%S") + f"_{os.getpid()}.jsonl"
+        return cls(os.path.join(directory, name))
+
+    @classmethod
+    def find_incomplete(cls, directory: str = DEFAULT_JOURNAL_DIR) -> List["MoveJournal"]:
+        """Buscar diarios de ejecuciones que no terminaron"""
+        journals = [cls(path) for path in sorted(glob.glob(os.path.join(directory, "organize_*.jsonl")))]
+        return [journal for journal in journals if journal.moves and not journal.completed]
+
+    def _load(self):
+        """Leer el diario tolerando una última línea truncada"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+
+                op = entry.get("op")
+                if op == "plan":
+                    self.moves.append(PlannedMove(entry["src"], entry["dst"], entry["size"], entry["category"]))
+                    self.states[entry["id"]] = STATE_PLANNED
+                elif op in (STATE_DONE, STATE_FAILED, STATE_UNDONE):
+                    self.states[entry["id"]] = op
+                elif op == "end":
+                    self.completed = True
+
+    def _append(self, entry: Dict):
+        """Agregar una entrada al buffer pendiente de sincronizar"""
+        self._buffer.append(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def flush(self):
+        """Escribir el buffer y sincronizarlo a disco"""
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write("".join(self._buffer))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._buffer = []
+
+    def close(self):
+        """Sincronizar lo pendiente y cerrar el archivo"""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def record_plan(self, moves: List[PlannedMove]) -> List[int]:
+        """Registrar el plan completo antes de ejecutarlo"""
+        first = len(self.moves)
+        for offset, move in enumerate(moves):
+            move_id = first + offset
+            self.moves.append(move)
+            self.states[move_id] = STATE_PLANNED
+            self._append({"op": "plan", "id": move_id, "src": move.source, "dst": move.destination,
+                          "size": move.size, "category": move.category})
+        self.flush()
+        return list(range(first, len(self.moves)))
+
+    def record_result(self, move_id: int, success: bool, error: Optional[str] = None):
+        """Registrar el resultado de un movimiento (se sincroniza en el próximo flush)"""
+        state = STATE_DONE if success else STATE_FAILED
+        self.states[move_id] = state
+        entry = {"op": state, "id": move_id}
+        if error:
+            entry["error"] = error
+        self._append(entry)
+
+    def record_undone(self, move_id: int):
+        """Registrar un movimiento deshecho"""
+        self.states[move_id] = STATE_UNDONE
+        self._append({"op": STATE_UNDONE, "id": move_id})
+
+    def mark_complete(self):
+        """Registrar que la ejecución terminó y cerrar el diario"""
+        self.completed = True
+        self._append({"op": "end"})
+        self.close()
+
+    def reconcile(self):
+        """Ajustar los estados perdidos en una interrupción mirando el disco
+
+        Un movimiento planificado cuyo origen ya no existe y cuyo destino sí
+        se completó antes de que su resultado llegara al diario.
+        """
+        for move_id, move in enumerate(self.moves):
+            if self.states.get(move_id) != STATE_PLANNED:
+                continue
+
+            partial = move.destination + PARTIAL_SUFFIX
+            if os.path.exists(partial):
+                try:
+                    os.remove(partial)
+                except OSError:
+                    pass
+
+            if not os.path.lexists(move.destination):
+                continue
+            if not os.path.lexists(move.source):
+                self.record_result(move_id, True)
+            elif self._same_content(move.source, move.destination):
+                # Copia entre discos interrumpida antes de borrar el origen
+                try:
+                    os.remove(move.source)
+                    self.record_result(move_id, True)
+                except OSError:
+                    pass
+        self.flush()
+
+    @staticmethod
+    def _same_content(first: str, second: str) -> bool:
+        """Comparar dos archivos por tamaño y hash"""
+        try:
+            if os.path.getsize(first) != os.path.getsize(second):
+                return False
+        except OSError:
+            return False
+        first_hash = hash_file(first)
+        return first_hash is not None and first_hash == hash_file(second)
+
+    def pending(self) -> List[int]:
+        """Identificadores de movimientos planificados sin ejecutar"""
+        return [move_id for move_id in range(len(self.moves)) if self.states.get(move_id) == STATE_PLANNED]
+
+    def done(self) -> List[int]:
+        """Identificadores de movimientos completados y no deshechos"""
+        return [move_id for move_id in range(len(self.moves)) if self.states.get(move_id) == STATE_DONE]
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hash de Contraseñas - ModuStackClean
+Hash con sal y costo ajustable (scrypt o PBKDF2) y migración de hashes SHA-256 antiguos
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+ALGORITHM_SCRYPT = "scrypt"
+ALGORITHM_PBKDF2 = "pbkdf2_sha256"
+ALGORITHM_LEGACY = "sha256"
+
+# Costos por defecto: ~80 ms por hash en un núcleo actual
+DEFAULT_SCRYPT_N = 2 ** 14
+DEFAULT_SCRYPT_R = 8
+DEFAULT_SCRYPT_P = 1
+DEFAULT_PBKDF2_ITERATIONS = 600_000
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _derive(algorithm: str, password: str, salt: bytes, params: Tuple[int, ...]) -> bytes:
+    """Derivar la clave (hashlib libera el GIL mientras calcula)"""
+    secret = password.encode("utf-8")
+    if algorithm == ALGORITHM_SCRYPT:
+        n, r, p = params
+        return hashlib.scrypt(secret, salt=salt, n=n, r=r, p=p, dklen=KEY_BYTES,
+                              maxmem=256 * n * r * p)
+    if algorithm == ALGORITHM_PBKDF2:
+        return hashlib.pbkdf2_hmac("sha256", secret, salt, params[0], dklen=KEY_BYTES)
+    raise ValueError(f"Algoritmo de hash desconocido: {algorithm}")
+
+
+def parse_hash(encoded: str) -> Tuple[str, Tuple[int, ...], bytes, bytes]:
+    """Separar un hash guardado en (algoritmo, parámetros, sal, clave)
+
+    Formatos: "scrypt$n$r$p$sal$clave", "pbkdf2_sha256$iteraciones$sal$clave"
+    y el antiguo SHA-256 sin sal (64 caracteres hexadecimales).
+    """
+    parts = encoded.split("$")
+    if len(parts) == 1 and len(encoded) == 64:
+        return ALGORITHM_LEGACY, (), b"", bytes.fromhex(encoded)
+    if parts[0] == ALGORITHM_SCRYPT and len(parts) == 6:
+        return ALGORITHM_SCRYPT, tuple(int(value) for value in parts[1:4]), _b64decode(parts[4]), _b64decode(parts[5])
+    if parts[0] == ALGORITHM_PBKDF2 and len(parts) == 4:
+        return ALGORITHM_PBKDF2, (int(parts[1]),), _b64decode(parts[2]), _b64decode(parts[3])
+    raise ValueError("Formato de hash no reconocido")
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    """Verificar una contraseña contra cualquier formato guardado
+
+    Función de módulo para poder ejecutarse en un pool de procesos.
+    """
+    try:
+        algorithm, params, salt, key = parse_hash(encoded)
+    except (ValueError, TypeError):
+        return False
+    if algorithm == ALGORITHM_LEGACY:
+        candidate = hashlib.sha256(password.encode("utf-8")).digest()
+    else:
+        candidate = _derive(algorithm, password, salt, params)
+    return hmac.compare_digest(candidate, key)
+
+
+def _hash_job(algorithm: str, params: Tuple[int, ...], password: str) -> str:
+    """Calcular un hash nuevo con sal aleatoria (tarea del pool)"""
+    salt = os.urandom(SALT_BYTES)
+    key = _derive(algorithm, password, salt, params)
+    fields = [algorithm] + [str(value) for value in params] + [_b64encode(salt), _b64encode(key)]
+    return "$".join(fields)
+
+
+class PasswordHasher:
+    """Hash de contraseñas con costo configurable y pool opcional
+
+    hashlib.scrypt y pbkdf2_hmac liberan el GIL, así que un pool de hilos
+    ya reparte los logins simultáneos entre núcleos; el pool también limita
+    cuántos hashes corren a la vez (scrypt usa 128·n·r bytes por cálculo).
+    Con use_processes se usa un pool de procesos (en el exe de PyInstaller
+    depende de multiprocessing.freeze_support() en main.py). Con workers=0
+    el cálculo se hace en el hilo que llama.
+    """
+
+    def __init__(self, algorithm: str = ALGORITHM_SCRYPT, scrypt_n: int = DEFAULT_SCRYPT_N,
+                 scrypt_r: int = DEFAULT_SCRYPT_R, scrypt_p: int = DEFAULT_SCRYPT_P,
+                 pbkdf2_iterations: int = DEFAULT_PBKDF2_ITERATIONS, workers: int = 0,
+                 use_processes: bool = False):
+        if algorithm == ALGORITHM_SCRYPT:
+            if scrypt_n < 2 or scrypt_n & (scrypt_n - 1):
+                raise ValueError("scrypt_n debe ser potencia de 2")
+            self.params = (scrypt_n, scrypt_r, scrypt_p)
+        elif algorithm == ALGORITHM_PBKDF2:
+            self.params = (pbkdf2_iterations,)
+        else:
+            raise ValueError(f"Algoritmo de hash desconocido: {algorithm}")
+        self.algorithm = algorithm
+        self.workers = max(0, workers)
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> "PasswordHasher":
+        """Crear el hasher a partir de AppConfig"""
+        return cls(
+            algorithm=getattr(config, 'PASSWORD_HASH_ALGORITHM', ALGORITHM_SCRYPT),
+            scrypt_n=getattr(config, 'PASSWORD_SCRYPT_N', DEFAULT_SCRYPT_N),
+            pbkdf2_iterations=getattr(config, 'PASSWORD_PBKDF2_ITERATIONS', DEFAULT_PBKDF2_ITERATIONS),
+            workers=getattr(config, 'PASSWORD_HASH_WORKERS', 0),
+            use_processes=getattr(config, 'PASSWORD_HASH_USE_PROCESSES', False)
+        )
+
+    def _get_executor(self) -> Optional[Executor]:
+        """Crear el pool la primera vez que se necesita"""
+        if not self.workers:
+            return None
+        with self._lock:
+            if self._executor is None:
+                if self.use_processes:
+                    try:
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    except (OSError, NotImplementedError) as e:
+                        print(f"⚠️ Pool de procesos no disponible, se usarán hilos: {e}")
+                        self.use_processes = False
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                        thread_name_prefix="password_hasher")
+            return self._executor
+
+    def _call(self, function, *args):
+        """Ejecutar una tarea en el pool (o en este hilo si no hay pool)"""
+        executor = self._get_executor()
+        if executor is None:
+            return function(*args)
+        return executor.submit(function, *args).result()
+
+    def hash(self, password: str) -> str:
+        """Calcular el hash de una contraseña con sal aleatoria"""
+        return self._call(_hash_job, self.algorithm, self.params, password)
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """Calcular varios hashes repartiéndolos en el pool (cargas masivas)"""
+        executor = self._get_executor()
+        if executor is None:
+            return [_hash_job(self.algorithm, self.params, password) for password in passwords]
+        count = len(passwords)
+        return list(executor.map(_hash_job, [self.algorithm] * count, [self.params] * count, passwords))
+
+    def verify(self, password: str, encoded: str) -> bool:
+        """Verificar una contraseña en tiempo constante"""
+        if not encoded:
+            return False
+        return self._call(verify_password, password, encoded)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """Indicar si un hash guardado es antiguo o usa otro costo"""
+        try:
+            algorithm, params, _, _ = parse_hash(encoded)
+        except (ValueError, TypeError):
+            return True
+        return algorithm != self.algorithm or params != self.params
+
+    def verify_and_update(self, password: str, encoded: str) -> Tuple[bool, Optional[str]]:
+        """Verificar y, si el hash está desactualizado, devolver uno nuevo para guardar"""
+        if not self.verify(password, encoded):
+            return False, None
+        if self.needs_rehash(encoded):
+            return True, self.hash(password)
+        return True, None
+
+    def shutdown(self):
+        """Cerrar el pool"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+_default_hasher: Optional[PasswordHasher] = None
+_default_lock = threading.Lock()
+
+
+def get_default_hasher() -> PasswordHasher:
+    """Obtener el hasher compartido configurado en AppConfig"""
+    global _default_hasher
+    with _default_lock:
+        if _default_hasher is None:
+            from config.app_config import AppConfig
+            _default_hasher = PasswordHasher.from_config(AppConfig())
+        return _default_hasher
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Progreso de Escaneo - ModuStackClean
+Contadores de progreso del escaneo con entrega limitada en frecuencia
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# Frecuencia máxima de entrega a la interfaz (10 Hz)
+DEFAULT_INTERVAL = 0.1
+
+
+class ScanProgress:
+    """Contadores de un escaneo: archivos, carpetas, bytes y coincidencias
+
+    Los hilos de escaneo actualizan los contadores una vez por carpeta;
+    on_update recibe un snapshot como máximo cada `interval` segundos.
+    """
+
+    def __init__(self, on_update: Callable[[Dict], None] = None, interval: float = DEFAULT_INTERVAL,
+                 expected_files: Optional[int] = None):
+        self.on_update = on_update
+        self.interval = interval
+        self.expected_files = expected_files
+
+        self.files_seen = 0
+        self.directories = 0
+        self.matches = 0
+        self.bytes_matched = 0
+        self.started_at = None
+        self.finished_at = None
+
+        self._lock = threading.Lock()
+        self._last_emit = 0.0
+
+    def start(self):
+        """Reiniciar los contadores al comenzar un escaneo"""
+        with self._lock:
+            self.files_seen = 0
+            self.directories = 0
+            self.matches = 0
+            self.bytes_matched = 0
+            self.started_at = time.monotonic()
+            self.finished_at = None
+            self._last_emit = 0.0
+
+    def add_directory(self, file_count: int):
+        """Registrar una carpeta recorrida y sus archivos"""
+        with self._lock:
+            self.directories += 1
+            self.files_seen += file_count
+        self._maybe_emit()
+
+    def add_match(self, size: int):
+        """Registrar un archivo que coincidió con el filtro"""
+        with self._lock:
+            self.matches += 1
+            self.bytes_matched += size
+
+    def finish(self):
+        """Marcar el escaneo como terminado y entregar el snapshot final"""
+        with self._lock:
+            self.finished_at = time.monotonic()
+        self._emit()
+
+    def snapshot(self) -> Dict:
+        """Obtener el estado actual de los contadores"""
+        with self._lock:
+            end = self.finished_at or time.monotonic()
+            elapsed = end - self.started_at if self.started_at else 0.0
+            files_per_second = self.files_seen / elapsed if elapsed > 0 else 0.0
+
+            eta_seconds = None
+            percent = None
+            if self.expected_files:
+                percent = min(1.0, self.files_seen / self.expected_files)
+                remaining = max(0, self.expected_files - self.files_seen)
+                if files_per_second > 0:
+                    eta_seconds = remaining / files_per_second
+
+            return {
+                "files_seen": self.files_seen,
+                "directories": self.directories,
+                "matches": self.matches,
+                "bytes_matched": self.bytes_matched,
+                "elapsed": elapsed,
+                "files_per_second": files_per_second,
+                "expected_files": self.expected_files,
+                "percent": percent,
+                "eta_seconds": eta_seconds,
+                "finished": self.finished_at is not None
+            }
+
+    def _maybe_emit(self):
+        """Entregar un snapshot si pasó el intervalo mínimo"""
+        if not self.on_update:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_emit < self.interval:
+                return
+            self._last_emit = now
+        self._emit()
+
+    def _emit(self):
+        """Entregar un snapshot a on_update"""
+        if not self.on_update:
+            return
+        try:
+            self.on_update(self.snapshot())
+        except Exception as e:
+            print(f"⚠️ Error en callback de progreso: {e}")
+
+    def log_summary(self, label: str = "Escaneo"):
+        """Imprimir el rendimiento del escaneo para registro"""
+        stats = self.snapshot()
+        print(
+            f"📊 {label}: {stats['files_seen']:,} archivos en {stats['directories']:,} carpetas, "
+            f"{stats['matches']:,} coincidencias ({stats['bytes_matched'] / (1024 * 1024):.1f} MB) "
+            f"en {stats['elapsed']:.2f} s — {stats['files_per_second']:,.0f} archivos/s"
+        )
+        return stats
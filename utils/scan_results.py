@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resultados de Escaneo - ModuStackClean
+Almacén paginado de resultados con desborde a disco para escaneos grandes
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Iterable, Iterator, List
+
+from utils.file_scanner import FileRecord
+
+# Tamaño de página por defecto para la interfaz
+DEFAULT_PAGE_SIZE = 60
+
+# Registros que se mantienen en memoria antes de desbordar a disco
+DEFAULT_MEMORY_LIMIT = 20000
+
+# Registros leídos por bloque al recorrer todo el almacén
+ITER_CHUNK_SIZE = 5000
+
+
+class ScanResultStore:
+    """Almacén de resultados que se consulta por páginas
+
+    Los primeros registros se guardan en memoria; a partir de memory_limit
+    se escriben en una base SQLite temporal, de modo que la memoria usada
+    no crece con el número de resultados y cada página se lee por rango
+    de secuencia. remove_trees() y upsert() aplican cambios sueltos sin
+    volver a cargar el almacén.
+    """
+
+    def __init__(self, page_size: int = DEFAULT_PAGE_SIZE, memory_limit: int = DEFAULT_MEMORY_LIMIT):
+        self.page_size = max(1, page_size)
+        self.memory_limit = max(1, memory_limit)
+
+        self._lock = threading.Lock()
+        self._memory: List[FileRecord] = []
+        self._spilled = 0
+        self._spill_path = None
+        self._spill_connection = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._memory) + self._spilled
+
+    @property
+    def total_pages(self) -> int:
+        """Número de páginas disponibles (al menos una)"""
+        return max(1, -(-len(self) // self.page_size))
+
+    def extend(self, records: Iterable[FileRecord]):
+        """Agregar registros al final del almacén"""
+        records = list(records)
+        with self._lock:
+            room = self.memory_limit - len(self._memory)
+            if room > 0:
+                self._memory.extend(records[:room])
+                records = records[room:]
+            if records:
+                self._spill(records)
+
+    def _spill(self, records: List[FileRecord]):
+        """Escribir registros en la base temporal de desborde"""
+        if self._spill_connection is None:
+            handle, self._spill_path = tempfile.mkstemp(prefix="modustack_results_", suffix=".db")
+            os.close(handle)
+            self._spill_connection = sqlite3.connect(self._spill_path, check_same_thread=False)
+            self._spill_connection.execute("PRAGMA journal_mode=OFF")
+            self._spill_connection.execute("PRAGMA synchronous=OFF")
+            self._spill_connection.execute("""
+                CREATE TABLE results (
+                    seq INTEGER PRIMARY KEY,
+                    path TEXT, name TEXT, size INTEGER, mtime REAL, ctime REAL
+                )
+            """)
+            self._spill_connection.execute("CREATE INDEX idx_results_path ON results(path)")
+
+        start = self._spilled
+        self._spill_connection.executemany(
+            "INSERT INTO results (seq, path, name, size, mtime, ctime) VALUES (?, ?, ?, ?, ?, ?)",
+            [(start + offset, *record) for offset, record in enumerate(records)]
+        )
+        self._spill_connection.commit()
+        self._spilled += len(records)
+
+    def remove_trees(self, paths: Iterable[str]) -> int:
+        """Quitar los registros de esas rutas y de todo lo que haya debajo"""
+        prefixes = [(path, path.rstrip(os.sep) + os.sep) for path in paths]
+        if not prefixes:
+            return 0
+
+        def gone(record_path: str) -> bool:
+            return any(record_path == path or record_path.startswith(prefix) for path, prefix in prefixes)
+
+        with self._lock:
+            kept = [record for record in self._memory if not gone(record.path)]
+            removed = len(self._memory) - len(kept)
+            self._memory = kept
+
+            if self._spill_connection is not None:
+                seqs = []
+                for path, prefix in prefixes:
+                    # Rango [prefijo, prefijo+1) para usar el índice por ruta
+                    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+                    seqs.extend(row[0] for row in self._spill_connection.execute(
+                        "SELECT seq FROM results WHERE path = ? OR (path >= ? AND path < ?)",
+                        (path, prefix, upper)
+                    ))
+                if seqs:
+                    self._spill_connection.executemany("DELETE FROM results WHERE seq = ?",
+                                                       [(seq,) for seq in set(seqs)])
+                    self._renumber_spill(min(seqs))
+                    removed += len(set(seqs))
+            return removed
+
+    def _renumber_spill(self, first: int):
+        """Volver a numerar seq desde `first` para que las páginas sigan siendo rangos contiguos"""
+        connection = self._spill_connection
+        connection.execute("CREATE TEMP TABLE IF NOT EXISTS renumber (new INTEGER PRIMARY KEY, old INTEGER UNIQUE)")
+        connection.execute("DELETE FROM renumber")
+        connection.execute("INSERT INTO renumber (old) SELECT seq FROM results WHERE seq > ? ORDER BY seq", (first,))
+        # Pasar por negativos evita choques de clave primaria sea cual sea el orden del UPDATE
+        connection.execute("UPDATE results SET seq = -(SELECT new FROM renumber WHERE old = results.seq) WHERE seq > ?",
+                           (first,))
+        connection.execute("UPDATE results SET seq = ? - 1 - seq WHERE seq < 0", (first,))
+        connection.commit()
+        self._spilled = connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def upsert(self, records: Iterable[FileRecord]) -> int:
+        """Actualizar los registros cuya ruta ya está y agregar el resto al final"""
+        by_path = {record.path: record for record in records}
+        found = set()
+        with self._lock:
+            for position, current in enumerate(self._memory):
+                record = by_path.get(current.path)
+                if record is not None:
+                    self._memory[position] = record
+                    found.add(current.path)
+
+            if self._spill_connection is not None:
+                for path, record in by_path.items():
+                    if path in found:
+                        continue
+                    cursor = self._spill_connection.execute(
+                        "UPDATE results SET name = ?, size = ?, mtime = ?, ctime = ? WHERE path = ?",
+                        (record.name, record.size, record.mtime, record.ctime, path)
+                    )
+                    if cursor.rowcount:
+                        found.add(path)
+                self._spill_connection.commit()
+
+        added = [record for path, record in by_path.items() if path not in found]
+        self.extend(added)
+        return len(added)
+
+    def get_range(self, start: int, stop: int) -> List[FileRecord]:
+        """Obtener los registros en posiciones [start, stop)"""
+        with self._lock:
+            in_memory = len(self._memory)
+            stop = min(stop, in_memory + self._spilled)
+            if start >= stop:
+                return []
+
+            records = self._memory[start:min(stop, in_memory)]
+            if stop > in_memory:
+                first = max(start, in_memory) - in_memory
+                rows = self._spill_connection.execute(
+                    "SELECT path, name, size, mtime, ctime FROM results WHERE seq >= ? AND seq < ? ORDER BY seq",
+                    (first, stop - in_memory)
+                )
+                records.extend(FileRecord(*row) for row in rows)
+            return records
+
+    def iter_records(self, chunk_size: int = ITER_CHUNK_SIZE) -> Iterator[FileRecord]:
+        """Recorrer todos los registros por bloques, sin cargarlos juntos en memoria"""
+        start = 0
+        while True:
+            records = self.get_range(start, start + chunk_size)
+            if not records:
+                return
+            yield from records
+            start += len(records)
+
+    def __iter__(self) -> Iterator[FileRecord]:
+        return self.iter_records()
+
+    def get_page(self, page: int) -> List[FileRecord]:
+        """Obtener una página (empezando en 0)"""
+        start = max(0, page) * self.page_size
+        return self.get_range(start, start + self.page_size)
+
+    def clear(self):
+        """Vaciar el almacén y borrar el desborde temporal"""
+        with self._lock:
+            self._memory = []
+            self._spilled = 0
+            if self._spill_connection is not None:
+                self._spill_connection.close()
+                self._spill_connection = None
+            if self._spill_path:
+                try:
+                    os.remove(self._spill_path)
+                except OSError:
+                    pass
+                self._spill_path = None
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Caché LRU con Vencimiento - ModuStackClean
+Caché en memoria con tamaño máximo, vencimiento por entrada y métricas
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# Entradas máximas por defecto
+DEFAULT_MAX_ENTRIES = 256
+
+# Vigencia por defecto de una entrada (segundos)
+DEFAULT_TTL = 60.0
+
+
+class CacheEntry:
+    """Valor guardado con su vencimiento y metadatos (ej. ETag)"""
+
+    __slots__ = ("value", "expires_at", "meta")
+
+    def __init__(self, value: Any, expires_at: float, meta: Optional[Dict] = None):
+        self.value = value
+        self.expires_at = expires_at
+        self.meta = meta or {}
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class TTLCache:
+    """Caché LRU segura entre hilos con vigencia por entrada
+
+    Una entrada vencida no se borra al leerla: get() la cuenta como fallo,
+    pero get_entry() la sigue entregando para revalidarla (ej. con ETag).
+    El tamaño máximo acota la memoria expulsando la menos usada.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, default_ttl: float = DEFAULT_TTL):
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "evictions": 0,
+            "invalidations": 0
+        }
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Obtener un valor vigente (o default si falta o venció)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.fresh:
+                self._metrics["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            return entry.value
+
+    def get_entry(self, key: Hashable) -> Optional[CacheEntry]:
+        """Obtener la entrada aunque esté vencida, sin contar acierto ni fallo"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, meta: Optional[Dict] = None):
+        """Guardar un valor con su vigencia"""
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = CacheEntry(value, time.monotonic() + ttl, meta)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    def touch(self, key: Hashable, ttl: Optional[float] = None) -> bool:
+        """Renovar la vigencia de una entrada revalidada (ej. respuesta 304)"""
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            entry.expires_at = time.monotonic() + ttl
+            self._entries.move_to_end(key)
+            self._metrics["revalidated"] += 1
+            return True
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Quitar una entrada"""
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return False
+            self._metrics["invalidations"] += 1
+            return True
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """Quitar las entradas cuya clave de texto empieza por prefix"""
+        with self._lock:
+            keys = [key for key in self._entries if isinstance(key, str) and key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            self._metrics["invalidations"] += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """Vaciar la caché"""
+        with self._lock:
+            self._metrics["invalidations"] += len(self._entries)
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        """Obtener las métricas de la caché"""
+        with self._lock:
+            stats = dict(self._metrics)
+            stats["entries"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Grid Virtualizado - ModuStackClean
+GridView por páginas que llena las cards de forma perezosa y las reutiliza
+"""
+
+import time
+from typing import Callable, List, Sequence
+
+import flet as ft
+
+
+class VirtualGrid:
+    """Grid de una página que se llena de forma perezosa al hacer scroll
+
+    Al asignar elementos solo se muestran las primeras filas; el resto se
+    agrega por bloques cuando el scroll llega al final, sin pasar nunca de
+    max_cards. No es un grid con ventana: las cards que salen de la vista
+    siguen montadas; el número de controles queda acotado por el tamaño de
+    página (max_cards). Al cambiar de página los controles se conservan en
+    un pool y se re-enlazan con bind_card en lugar de reconstruirse.
+    """
+
+    def __init__(self, build_card: Callable[[], ft.Control], bind_card: Callable[[ft.Control, object], None],
+                 runs_count: int = 3, initial_rows: int = 4, chunk_rows: int = 4, max_cards: int = 60,
+                 **grid_kwargs):
+        self.build_card = build_card
+        self.bind_card = bind_card
+        self.initial_count = max(1, runs_count * initial_rows)
+        self.chunk_count = max(1, runs_count * chunk_rows)
+        self.max_cards = max(self.initial_count, max_cards)
+
+        self.items: Sequence = []
+        self.cards_built = 0
+        # Tiempo de enlazar las cards iniciales (no incluye el pintado en el cliente)
+        self.last_bind_ms = 0.0
+
+        self._pool: List[ft.Control] = []
+        self.grid = ft.GridView(
+            runs_count=runs_count,
+            on_scroll=self._on_scroll,
+            on_scroll_interval=100,
+            **grid_kwargs
+        )
+
+    @property
+    def rendered_count(self) -> int:
+        """Número de cards actualmente en el grid"""
+        return len(self.grid.controls)
+
+    def set_items(self, items: Sequence):
+        """Mostrar una nueva lista de elementos reciclando las cards existentes"""
+        start = time.perf_counter()
+        self.items = items
+        self.grid.controls = self._bind_range(0, min(len(items), self.initial_count))
+        self.last_bind_ms = (time.perf_counter() - start) * 1000
+
+    def _bind_range(self, start: int, stop: int) -> List[ft.Control]:
+        """Enlazar las cards del pool con los elementos [start, stop)"""
+        while len(self._pool) < stop:
+            self._pool.append(self.build_card())
+            self.cards_built += 1
+
+        cards = self._pool[start:stop]
+        for card, item in zip(cards, self.items[start:stop]):
+            self.bind_card(card, item)
+        return cards
+
+    def load_more(self) -> bool:
+        """Agregar el siguiente bloque de cards si quedan elementos"""
+        shown = len(self.grid.controls)
+        stop = min(len(self.items), self.max_cards, shown + self.chunk_count)
+        if stop <= shown:
+            return False
+
+        self.grid.controls.extend(self._bind_range(shown, stop))
+        return True
+
+    def _on_scroll(self, e):
+        """Cargar más cards cuando el scroll se acerca al final"""
+        try:
+            near_end = e.pixels >= e.max_scroll_extent - 200
+        except (AttributeError, TypeError):
+            return
+
+        if near_end and self.load_more():
+            self.grid.update()
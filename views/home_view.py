@@ -52,20 +52,24 @@ class HomeView(ft.Container):
             width=280 if self.sidebar_expanded else 70,
             bgcolor="#1a1a1a",
             border=ft.border.only(right=ft.border.BorderSide(1, "#333333")),
-            content=ft.Column(
-                expand=True,
-                spacing=0,
-                controls=[
-                    # Header del sidebar
-                    self._build_sidebar_header(),
-                    
-                    # Menú de navegación
-                    self._build_navigation_menu(),
-                    
-                    # Footer del sidebar
-                    self._build_sidebar_footer()
-                ]
-            )
+            content=self._build_sidebar_content()
+        )
+    
+    def _build_sidebar_content(self):
+        """Construir el contenido del menú lateral según su estado"""
+        return ft.Column(
+            expand=True,
+            spacing=0,
+            controls=[
+                # Header del sidebar
+                self._build_sidebar_header(),
+                
+                # Menú de navegación
+                self._build_navigation_menu(),
+                
+                # Footer del sidebar
+                self._build_sidebar_footer()
+            ]
         )
     
     def _build_sidebar_header(self):
@@ -481,28 +485,14 @@ class HomeView(ft.Container):
     def _toggle_sidebar(self, e):
         """Alternar estado del sidebar"""
         self.sidebar_expanded = not self.sidebar_expanded
-        
-        # Limpiar la página y reconstruir todo
-        self.page.clean()
-        
-        # Reconstruir los componentes con el nuevo estado
-        self.sidebar = self._build_sidebar()
-        self.main_content = self._build_main_content()
-        
-        # Agregar los componentes reconstruidos
-        self.page.add(
-            ft.Row(
-                expand=True,
-                spacing=0,
-                controls=[
-                    self.sidebar,
-                    self.main_content
-                ]
-            )
-        )
-        
-        # Actualizar la página
-        self.page.update()
+        self._refresh_sidebar()
+    
+    def _refresh_sidebar(self):
+        """Actualizar ancho y contenido del sidebar sin reconstruir la vista"""
+        self.sidebar.width = 280 if self.sidebar_expanded else 70
+        self.sidebar.content = self._build_sidebar_content()
+        if self.page:
+            self.page.update(self.sidebar)
     
     def _on_menu_item_click(self, e):
         """Manejar clic en elementos del menú"""
@@ -534,29 +524,15 @@ class HomeView(ft.Container):
     def update_responsive_layout(self):
         """Actualizar layout para ser responsive"""
         # Ajustar sidebar según el tamaño de la ventana
-        if self.config.WINDOW_WIDTH < 1000:
-            self.sidebar_expanded = False
-        else:
-            self.sidebar_expanded = True
+        expanded = self.config.WINDOW_WIDTH >= 1000
         
-        # Limpiar la página y reconstruir todo
-        self.page.clean()
-        
-        # Reconstruir los componentes con el nuevo estado
-        self.sidebar = self._build_sidebar()
-        self.main_content = self._build_main_content()
-        
-        # Agregar los componentes reconstruidos
-        self.page.add(
-            ft.Row(
-                expand=True,
-                spacing=0,
-                controls=[
-                    self.sidebar,
-                    self.main_content
-                ]
-            )
-        )
+        # Actualizar solo el tamaño de la vista y, si cambió, el sidebar
+        self.width = self.config.WINDOW_WIDTH
+        self.height = self.config.WINDOW_HEIGHT
+        if expanded != self.sidebar_expanded:
+            self.sidebar_expanded = expanded
+            self.sidebar.width = 280 if expanded else 70
+            self.sidebar.content = self._build_sidebar_content()
         
         if self.page:
-            self.page.update()
+            self.page.update(self)
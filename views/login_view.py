@@ -123,7 +123,9 @@ class LoginView(ft.Container):
             visible=False  # Solo visible cuando no hay conexión
         )
         
-        # Actualizar información de conexión
+        # Registrar el listener antes de leer el estado: si el ping termina
+        # entre ambos pasos, la notificación no se pierde
+        self.api_manager.add_status_listener(self._on_connection_status)
         self.update_connection_info()
         
         super().__init__(
@@ -232,11 +234,37 @@ class LoginView(ft.Container):
             )
         )
     
+    def did_mount(self):
+        """Escuchar cambios de conexión mientras la vista está en pantalla"""
+        self.api_manager.add_status_listener(self._on_connection_status)
+        self._refresh_connection_info()
+    
+    def will_unmount(self):
+        """Dejar de escuchar cambios de conexión"""
+        self.api_manager.remove_status_listener(self._on_connection_status)
+    
+    def _on_connection_status(self, status: str):
+        """Callback del APIManager (llega desde el hilo del ping)"""
+        self._refresh_connection_info()
+    
+    def _refresh_connection_info(self):
+        """Releer el estado y enviar solo los controles de conexión"""
+        self.update_connection_info()
+        if self.page:
+            try:
+                self.page.update(self.connection_info, self.super_user_note)
+            except Exception as e:
+                print(f"⚠️ Error actualizando estado de conexión: {e}")
+    
     def update_connection_info(self):
         """Actualizar información de conexión"""
         try:
             info = self.api_manager.get_connection_info()
-            if info["status"] == "connected":
+            if info["status"] == "checking":
+                self.connection_info.value = "⏳ Verificando conexión a API..."
+                self.connection_info.color = "gray"
+                self.super_user_note.visible = False
+            elif info["status"] == "connected":
                 self.connection_info.value = f"🔗 Conectado a API ({info['url']})"
                 self.connection_info.color = "green"
                 self.super_user_note.visible = False  # Ocultar nota cuando hay conexión
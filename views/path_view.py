@@ -8,7 +8,18 @@ Vista para mostrar paths encontrados en el sistema
 import flet as ft
 import os
 import platform
+import threading
+import time
 from pathlib import Path
+from utils.duplicate_finder import DuplicateFinder
+from utils.file_scanner import FileScanner, detect_drives, get_standard_paths
+from utils.file_index import FileIndex
+from utils.file_organizer import FileOrganizer
+from utils.file_watcher import FileWatcher
+from utils.move_journal import MoveJournal
+from utils.file_matcher import FileMatcher
+from utils.scan_results import ScanResultStore
+from utils.virtual_grid import VirtualGrid
 
 class PathView(ft.Container):
     """Vista para mostrar paths encontrados en el sistema"""
@@ -29,8 +40,32 @@ class PathView(ft.Container):
         self.sidebar_expanded = True
         
         # Resultados de la búsqueda
-        self.search_results = []
+        self.search_results = ScanResultStore()
+        self.current_page = 0
         self.is_searching = False
+        self.results_grid = VirtualGrid(
+            build_card=self._build_file_card,
+            bind_card=self._bind_file_card,
+            max_cards=self.search_results.page_size,
+            expand=True,
+            max_extent=400,
+            child_aspect_ratio=1.2,
+            spacing=20,
+            run_spacing=20
+        )
+        self.scanner = None
+        self.file_index = None
+        self.duplicate_groups = []
+        self.is_finding_duplicates = False
+        self.organize_plan = []
+        self.is_organizing = False
+        self.last_journal = None
+        self.file_watcher = None
+        self._search_matcher = None
+        self._root_drives = {}
+        self._results_lock = threading.Lock()
+        self._close_lock = threading.Lock()
+        self._closed = False
         
         # Componentes del menú lateral
         self.sidebar = self._build_sidebar()
@@ -58,20 +93,24 @@ class PathView(ft.Container):
             width=280 if self.sidebar_expanded else 70,
             bgcolor="#1a1a1a",
             border=ft.border.only(right=ft.border.BorderSide(1, "#333333")),
-            content=ft.Column(
-                expand=True,
-                spacing=0,
-                controls=[
-                    # Header del sidebar
-                    self._build_sidebar_header(),
-                    
-                    # Menú de navegación
-                    self._build_navigation_menu(),
-                    
-                    # Footer del sidebar
-                    self._build_sidebar_footer()
-                ]
-            )
+            content=self._build_sidebar_content()
+        )
+    
+    def _build_sidebar_content(self):
+        """Construir el contenido del menú lateral según su estado"""
+        return ft.Column(
+            expand=True,
+            spacing=0,
+            controls=[
+                # Header del sidebar
+                self._build_sidebar_header(),
+                
+                # Menú de navegación
+                self._build_navigation_menu(),
+                
+                # Footer del sidebar
+                self._build_sidebar_footer()
+            ]
         )
     
     def _build_sidebar_header(self):
@@ -351,6 +390,75 @@ class PathView(ft.Container):
     
     def _build_search_section(self):
         """Construir sección de búsqueda"""
+        self.search_button = ft.ElevatedButton(
+            icon=ft.Icon("search"),
+            style=ft.ButtonStyle(
+                bgcolor="#4facfe",
+                color="white",
+                shape=ft.RoundedRectangleBorder(radius=8)
+            ),
+            on_click=self._start_search
+        )
+        self.pause_button = ft.ElevatedButton(
+            style=ft.ButtonStyle(
+                bgcolor="#ffc107",
+                color="white",
+                shape=ft.RoundedRectangleBorder(radius=8)
+            ),
+            on_click=self._toggle_pause_search
+        )
+        self.cancel_button = ft.ElevatedButton(
+            text="Cancelar",
+            icon=ft.Icon("stop"),
+            style=ft.ButtonStyle(
+                bgcolor="#dc3545",
+                color="white",
+                shape=ft.RoundedRectangleBorder(radius=8)
+            ),
+            on_click=self._cancel_search
+        )
+        self.duplicates_button = ft.ElevatedButton(
+            icon=ft.Icon("content_copy"),
+            style=ft.ButtonStyle(
+                bgcolor="#6f42c1",
+                color="white",
+                shape=ft.RoundedRectangleBorder(radius=8)
+            ),
+            on_click=self._start_duplicate_search
+        )
+        self.organize_button = ft.ElevatedButton(
+            icon=ft.Icon("drive_file_move"),
+            style=ft.ButtonStyle(
+                bgcolor="#28a745",
+                color="white",
+                shape=ft.RoundedRectangleBorder(radius=8)
+            ),
+            on_click=self._on_organize_click
+        )
+        self.undo_button = ft.ElevatedButton(
+            text="Deshacer organización",
+            icon=ft.Icon("undo"),
+            style=ft.ButtonStyle(
+                bgcolor="#6c757d",
+                color="white",
+                shape=ft.RoundedRectangleBorder(radius=8)
+            ),
+            on_click=self._on_undo_organize_click
+        )
+        self.search_controls = ft.Row(
+            spacing=10,
+            controls=[self.search_button, self.pause_button, self.cancel_button,
+                      self.duplicates_button, self.organize_button, self.undo_button]
+        )
+        self.progress_bar = ft.ProgressBar(value=None, color="#4facfe", bgcolor="#e9ecef")
+        self.progress_text = ft.Text("", size=14, color="#6c757d")
+        self.progress_panel = ft.Column(
+            spacing=8,
+            visible=False,
+            controls=[self.progress_bar, self.progress_text]
+        )
+        self._sync_search_controls()
+        
         return ft.Container(
             bgcolor="white",
             border_radius=12,
@@ -376,219 +484,309 @@ class PathView(ft.Container):
                         color="#6c757d",
                         text_align=ft.TextAlign.START
                     ),
-                    ft.ElevatedButton(
-                        text="Buscar Rutas" if not self.is_searching else "Buscando...",
-                        icon=ft.Icon("search"),
-                        style=ft.ButtonStyle(
-                            bgcolor="#4facfe",
-                            color="white",
-                            shape=ft.RoundedRectangleBorder(radius=8)
-                        ),
-                        on_click=self._start_search
-                    )
+                    self.search_controls,
+                    self.progress_panel
                 ]
             )
         )
     
+    def _sync_search_controls(self):
+        """Ajustar los botones de búsqueda al estado actual"""
+        paused = bool(self.scanner and self.scanner.is_paused())
+        self.search_button.text = "Buscando..." if self.is_searching else "Buscar Rutas"
+        self.search_button.disabled = self.is_finding_duplicates or self.is_organizing
+        self.pause_button.text = "Reanudar" if paused else "Pausar"
+        self.pause_button.icon = ft.Icon("play_arrow" if paused else "pause")
+        self.pause_button.visible = self.is_searching
+        self.cancel_button.visible = self.is_searching
+        self.duplicates_button.text = "Buscando duplicados..." if self.is_finding_duplicates else "Buscar Duplicados"
+        self.duplicates_button.visible = not self.is_searching and len(self.search_results) > 1
+        self.duplicates_button.disabled = self.is_finding_duplicates
+        if self.is_organizing:
+            self.organize_button.text = "Organizando..."
+        elif self.organize_plan:
+            self.organize_button.text = f"Confirmar ({len(self.organize_plan)} movimientos)"
+        else:
+            self.organize_button.text = "Organizar"
+        self.organize_button.visible = not self.is_searching and len(self.search_results) > 0
+        self.organize_button.disabled = self.is_organizing or self.is_finding_duplicates
+        self.undo_button.visible = bool(self.last_journal) and not self.is_searching
+        self.undo_button.disabled = self.is_organizing
+        self.progress_panel.visible = self.is_searching or bool(self.progress_text.value)
+    
+    def _sync_progress(self, stats):
+        """Mostrar los contadores de progreso del escaneo"""
+        text = (
+            f"📁 {stats['directories']:,} carpetas · {stats['files_seen']:,} archivos revisados "
+            f"({stats['files_per_second']:,.0f}/s) · {stats['matches']:,} encontrados "
+            f"({self._format_file_size(stats['bytes_matched'])})"
+        )
+        if stats["finished"]:
+            text += f" · {stats['elapsed']:.1f} s"
+        elif stats["eta_seconds"] is not None:
+            text += f" · ~{stats['eta_seconds']:.0f} s restantes"
+        self.progress_text.value = text
+        
+        # Sin estimación la barra queda indeterminada
+        self.progress_bar.value = 1.0 if stats["finished"] else stats["percent"]
+    
     def _build_results_section(self):
         """Construir sección de resultados con cards bonitas"""
-        if not self.search_results:
-            return ft.Container(
-                bgcolor="white",
-                border_radius=12,
-                padding=ft.padding.all(30),
-                shadow=ft.BoxShadow(
-                    spread_radius=1,
-                    blur_radius=10,
-                    color="#00000010",
-                    offset=ft.Offset(0, 2)
-                ),
-                content=ft.Column(
-                    spacing=20,
+        self.empty_results = ft.Container(
+            bgcolor="white",
+            border_radius=12,
+            padding=ft.padding.all(30),
+            shadow=ft.BoxShadow(
+                spread_radius=1,
+                blur_radius=10,
+                color="#00000010",
+                offset=ft.Offset(0, 2)
+            ),
+            content=ft.Column(
+                spacing=20,
+                controls=[
+                    ft.Text(
+                        "📁 Rutas Encontradas",
+                        size=24,
+                        weight=ft.FontWeight.BOLD,
+                        color="#2d2d2d"
+                    ),
+                    ft.Text(
+                        "Haz clic en 'Buscar Rutas' para comenzar la detección automática.",
+                        size=16,
+                        color="#6c757d",
+                        text_align=ft.TextAlign.CENTER
+                    )
+                ]
+            )
+        )
+        
+        self.results_header = ft.Text(
+            "",
+            size=24,
+            weight=ft.FontWeight.BOLD,
+            color="#2d2d2d"
+        )
+        self.results_panel = ft.Column(
+            spacing=20,
+            controls=[
+                ft.Row(
+                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                     controls=[
-                        ft.Text(
-                            "📁 Rutas Encontradas",
-                            size=24,
-                            weight=ft.FontWeight.BOLD,
-                            color="#2d2d2d"
-                        ),
-                        ft.Text(
-                            "Haz clic en 'Buscar Rutas' para comenzar la detección automática.",
-                            size=16,
-                            color="#6c757d",
-                            text_align=ft.TextAlign.CENTER
-                        )
+                        self.results_header,
+                        self._build_pagination()
                     ]
-                )
-            )
+                ),
+                self.results_grid.grid
+            ]
+        )
         
-        # Crear grid de cards
-        all_cards = []
+        self._shown_page = None
+        self._sync_results()
         
-        for result in self.search_results:
-            # Crear cards para cada archivo encontrado
-            for i, path in enumerate(result['paths']):
-                # Obtener información del archivo
-                file_name = os.path.basename(path)
-                file_dir = os.path.dirname(path)
-                file_size = self._get_file_size(path)
-                file_icon = self._get_file_icon(file_name)
-                
-                # Crear card individual
-                card = ft.Container(
-                    bgcolor="white",
-                    border_radius=12,
-                    padding=ft.padding.all(20),
-                    shadow=ft.BoxShadow(
-                        spread_radius=1,
-                        blur_radius=8,
-                        color="#00000015",
-                        offset=ft.Offset(0, 2)
-                    ),
-                    border=ft.border.all(1, "#e9ecef"),
-                    content=ft.Column(
-                        spacing=15,
+        self.results_section = ft.Column(
+            spacing=0,
+            controls=[self.empty_results, self.results_panel]
+        )
+        return self.results_section
+    
+    def _sync_results(self):
+        """Ajustar la sección de resultados al estado actual sin reconstruirla"""
+        has_results = bool(self.search_results)
+        self.empty_results.visible = not has_results
+        self.results_panel.visible = has_results
+        if not has_results:
+            self._shown_page = None
+            return
+        
+        total_pages = self.search_results.total_pages
+        self.current_page = min(self.current_page, total_pages - 1)
+        self.results_header.value = f"📁 Archivos Encontrados ({len(self.search_results)} archivos)"
+        self.page_label.value = f"Página {self.current_page + 1} de {total_pages}"
+        self.previous_page_button.disabled = self.current_page <= 0
+        self.next_page_button.disabled = self.current_page >= total_pages - 1
+        
+        # Re-enlazar el grid solo si cambió el contenido de la página visible
+        records = self.search_results.get_page(self.current_page)
+        page_key = (self.current_page, len(records))
+        if page_key != self._shown_page:
+            self._shown_page = page_key
+            self.results_grid.set_items(records)
+            print(
+                f"🧮 Cards en pantalla: {self.results_grid.rendered_count} "
+                f"(construidas: {self.results_grid.cards_built}), "
+                f"enlace de cards: {self.results_grid.last_bind_ms:.1f} ms"
+            )
+    
+    def _build_file_card(self):
+        """Construir una card de archivo vacía (se enlaza después con _bind_file_card)"""
+        icon = ft.Icon("insert_drive_file", color="#4facfe", size=24)
+        name_text = ft.Text(
+            "",
+            size=16,
+            weight=ft.FontWeight.BOLD,
+            color="#2d2d2d",
+            max_lines=1,
+            overflow=ft.TextOverflow.ELLIPSIS
+        )
+        size_text = ft.Text("", size=12, color="#6c757d")
+        dir_text = ft.Text(
+            "",
+            size=12,
+            color="#6c757d",
+            font_family="monospace",
+            max_lines=2,
+            overflow=ft.TextOverflow.ELLIPSIS
+        )
+        more_button = ft.IconButton(
+            icon="more_vert",
+            icon_color="#6c757d",
+            tooltip="Más opciones",
+            on_click=self._on_card_more_click
+        )
+        open_button = ft.ElevatedButton(
+            text="Abrir Ubicación",
+            icon=ft.Icon("folder_open"),
+            style=ft.ButtonStyle(
+                bgcolor="#28a745",
+                color="white",
+                shape=ft.RoundedRectangleBorder(radius=6)
+            ),
+            on_click=self._on_open_location_click
+        )
+        info_button = ft.ElevatedButton(
+            text="Más Info",
+            icon=ft.Icon("info"),
+            style=ft.ButtonStyle(
+                bgcolor="#17a2b8",
+                color="white",
+                shape=ft.RoundedRectangleBorder(radius=6)
+            ),
+            on_click=self._on_more_info_click
+        )
+        
+        return ft.Container(
+            bgcolor="white",
+            border_radius=12,
+            padding=ft.padding.all(20),
+            shadow=ft.BoxShadow(
+                spread_radius=1,
+                blur_radius=8,
+                color="#00000015",
+                offset=ft.Offset(0, 2)
+            ),
+            border=ft.border.all(1, "#e9ecef"),
+            # Referencias a los controles que cambian al reciclar la card
+            data={
+                "icon": icon,
+                "name": name_text,
+                "size": size_text,
+                "dir": dir_text,
+                "buttons": (more_button, open_button, info_button)
+            },
+            content=ft.Column(
+                spacing=15,
+                controls=[
+                    # Header de la card
+                    ft.Row(
+                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                         controls=[
-                            # Header de la card
                             ft.Row(
-                                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                                spacing=10,
                                 controls=[
-                                    ft.Row(
-                                        spacing=10,
-                                        controls=[
-                                            ft.Icon(
-                                                file_icon,
-                                                color="#4facfe",
-                                                size=24
-                                            ),
-                                            ft.Column(
-                                                spacing=2,
-                                                controls=[
-                                                    ft.Text(
-                                                        file_name,
-                                                        size=16,
-                                                        weight=ft.FontWeight.BOLD,
-                                                        color="#2d2d2d",
-                                                        max_lines=1,
-                                                        overflow=ft.TextOverflow.ELLIPSIS
-                                                    ),
-                                                    ft.Text(
-                                                        f"Tamaño: {file_size}",
-                                                        size=12,
-                                                        color="#6c757d"
-                                                    )
-                                                ]
-                                            )
-                                        ]
-                                    ),
-                                    ft.IconButton(
-                                        icon="more_vert",
-                                        icon_color="#6c757d",
-                                        tooltip="Más opciones",
-                                        on_click=self._on_card_more_click,
-                                        data={"path": path, "file_name": file_name}
+                                    icon,
+                                    ft.Column(
+                                        spacing=2,
+                                        controls=[name_text, size_text]
                                     )
                                 ]
                             ),
-                            
-                            # Ruta del archivo
-                            ft.Container(
-                                bgcolor="#f8f9fa",
-                                border_radius=8,
-                                padding=ft.padding.all(12),
-                                content=ft.Column(
-                                    spacing=5,
-                                    controls=[
-                                        ft.Text(
-                                            "📁 Ubicación:",
-                                            size=12,
-                                            weight=ft.FontWeight.BOLD,
-                                            color="#495057"
-                                        ),
-                                        ft.Text(
-                                            file_dir,
-                                            size=12,
-                                            color="#6c757d",
-                                            font_family="monospace",
-                                            max_lines=2,
-                                            overflow=ft.TextOverflow.ELLIPSIS
-                                        )
-                                    ]
-                                )
-                            ),
-                            
-                            # Botones de acción
-                            ft.Row(
-                                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                                controls=[
-                                    ft.ElevatedButton(
-                                        text="Abrir Ubicación",
-                                        icon=ft.Icon("folder_open"),
-                                        style=ft.ButtonStyle(
-                                            bgcolor="#28a745",
-                                            color="white",
-                                            shape=ft.RoundedRectangleBorder(radius=6)
-                                        ),
-                                        on_click=self._on_open_location_click,
-                                        data={"path": path}
-                                    ),
-                                    ft.ElevatedButton(
-                                        text="Más Info",
-                                        icon=ft.Icon("info"),
-                                        style=ft.ButtonStyle(
-                                            bgcolor="#17a2b8",
-                                            color="white",
-                                            shape=ft.RoundedRectangleBorder(radius=6)
-                                        ),
-                                        on_click=self._on_more_info_click,
-                                        data={"path": path, "file_name": file_name}
-                                    )
-                                ]
-                            )
+                            more_button
                         ]
+                    ),
+                    
+                    # Ruta del archivo
+                    ft.Container(
+                        bgcolor="#f8f9fa",
+                        border_radius=8,
+                        padding=ft.padding.all(12),
+                        content=ft.Column(
+                            spacing=5,
+                            controls=[
+                                ft.Text(
+                                    "📁 Ubicación:",
+                                    size=12,
+                                    weight=ft.FontWeight.BOLD,
+                                    color="#495057"
+                                ),
+                                dir_text
+                            ]
+                        )
+                    ),
+                    
+                    # Botones de acción
+                    ft.Row(
+                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                        controls=[open_button, info_button]
                     )
-                )
-                
-                all_cards.append(card)
-        
-        # Crear grid responsive
-        grid_view = ft.GridView(
-            expand=True,
-            runs_count=3,
-            max_extent=400,
-            child_aspect_ratio=1.2,
-            spacing=20,
-            run_spacing=20,
-            controls=all_cards
+                ]
+            )
         )
-        
-        return ft.Column(
-            spacing=20,
-            controls=[
-                ft.Text(
-                    f"📁 Archivos Encontrados ({len(all_cards)} archivos)",
-                    size=24,
-                    weight=ft.FontWeight.BOLD,
-                    color="#2d2d2d"
-                ),
-                grid_view
-            ]
+    
+    def _bind_file_card(self, card, record):
+        """Enlazar una card (nueva o reciclada) con un archivo encontrado"""
+        refs = card.data
+        refs["icon"].name = self._get_file_icon(record.name)
+        refs["name"].value = record.name
+        refs["size"].value = f"Tamaño: {self._format_file_size(record.size)}"
+        refs["dir"].value = record.directory
+        for button in refs["buttons"]:
+            button.data = {"path": record.path, "file_name": record.name, "record": record}
+    
+    def _build_pagination(self):
+        """Construir controles de paginación de resultados"""
+        self.previous_page_button = ft.IconButton(
+            icon="chevron_left",
+            icon_color="#4facfe",
+            tooltip="Página anterior",
+            on_click=self._on_previous_page_click
+        )
+        self.page_label = ft.Text("", size=14, color="#6c757d")
+        self.next_page_button = ft.IconButton(
+            icon="chevron_right",
+            icon_color="#4facfe",
+            tooltip="Página siguiente",
+            on_click=self._on_next_page_click
+        )
+        return ft.Row(
+            spacing=10,
+            controls=[self.previous_page_button, self.page_label, self.next_page_button]
         )
     
-    def _get_file_size(self, file_path):
-        """Obtener tamaño del archivo en formato legible"""
-        try:
-            size = os.path.getsize(file_path)
-            if size < 1024:
-                return f"{size} B"
-            elif size < 1024 * 1024:
-                return f"{size / 1024:.1f} KB"
-            elif size < 1024 * 1024 * 1024:
-                return f"{size / (1024 * 1024):.1f} MB"
-            else:
-                return f"{size / (1024 * 1024 * 1024):.1f} GB"
-        except:
+    def _on_previous_page_click(self, e):
+        """Mostrar la página anterior de resultados"""
+        if self.current_page > 0:
+            self.current_page -= 1
+            self._refresh_results_ui()
+    
+    def _on_next_page_click(self, e):
+        """Mostrar la página siguiente de resultados"""
+        if self.current_page < self.search_results.total_pages - 1:
+            self.current_page += 1
+            self._refresh_results_ui()
+    
+    def _format_file_size(self, size):
+        """Formatear tamaño del archivo en formato legible"""
+        if size is None:
             return "N/A"
+        if size < 1024:
+            return f"{size} B"
+        elif size < 1024 * 1024:
+            return f"{size / 1024:.1f} KB"
+        elif size < 1024 * 1024 * 1024:
+            return f"{size / (1024 * 1024):.1f} MB"
+        else:
+            return f"{size / (1024 * 1024 * 1024):.1f} GB"
     
     def _get_file_icon(self, file_name):
         """Obtener icono según el tipo de archivo"""
@@ -626,26 +824,19 @@ class PathView(ft.Container):
     
     def _on_more_info_click(self, e):
         """Manejar clic en más información"""
-        data = e.control.data
-        path = data["path"]
-        file_name = data["file_name"]
+        record = e.control.data["record"]
         
         try:
-            # Obtener información detallada del archivo
-            file_size = self._get_file_size(path)
-            file_dir = os.path.dirname(path)
-            created_time = os.path.getctime(path)
-            modified_time = os.path.getmtime(path)
-            
+            # Usar los metadatos capturados durante el escaneo
             import datetime
-            created_str = datetime.datetime.fromtimestamp(created_time).strftime('%Y-%m-%d %H:%M:%S')
-            modified_str = datetime.datetime.fromtimestamp(modified_time).strftime('%Y-%m-%d %H:%M:%S')
+            created_str = datetime.datetime.fromtimestamp(record.ctime).strftime('%Y-%m-%d %H:%M:%S')
+            modified_str = datetime.datetime.fromtimestamp(record.mtime).strftime('%Y-%m-%d %H:%M:%S')
             
             info_text = f"""
 📄 Información del Archivo:
-• Nombre: {file_name}
-• Tamaño: {file_size}
-• Ubicación: {file_dir}
+• Nombre: {record.name}
+• Tamaño: {self._format_file_size(record.size)}
+• Ubicación: {record.directory}
 • Creado: {created_str}
 • Modificado: {modified_str}
             """
@@ -653,7 +844,7 @@ class PathView(ft.Container):
             print(info_text)
             
         except Exception as error:
-                         print(f"❌ Error obteniendo información: {error}")
+            print(f"❌ Error obteniendo información: {error}")
     
     def _build_main_footer(self):
         """Construir footer principal"""
@@ -676,7 +867,7 @@ class PathView(ft.Container):
         )
     
     def _start_search(self, e):
-        """Iniciar búsqueda de rutas - Versión simplificada para ejecutable"""
+        """Iniciar búsqueda de rutas en segundo plano"""
         try:
             print("🔍 Iniciando búsqueda de rutas...")
             
@@ -685,9 +876,20 @@ class PathView(ft.Container):
                 print("⚠️ Búsqueda ya en progreso, ignorando clic")
                 return
             
+            # La búsqueda vacía el almacén que recorren duplicados y organizador
+            if self.is_finding_duplicates or self.is_organizing:
+                print("⚠️ Hay una búsqueda de duplicados u organización en curso, ignorando clic")
+                return
+            
             # Cambiar estado inmediatamente
             self.is_searching = True
-            self.search_results = []
+            self._stop_watcher()
+            self.search_results.clear()
+            self.duplicate_groups = []
+            self.organize_plan = []
+            self.current_page = 0
+            self.progress_text.value = ""
+            self.progress_bar.value = None
             
             # Actualizar UI inmediatamente
             self._update_search_ui()
@@ -709,8 +911,8 @@ class PathView(ft.Container):
                 except Exception as snack_error:
                     print(f"⚠️ Error mostrando snackbar: {snack_error}")
             
-            # Ejecutar búsqueda simplificada
-            print("🚀 Ejecutando búsqueda simplificada...")
+            # Lanzar el motor de escaneo sin bloquear la interfaz
+            print("🚀 Ejecutando búsqueda en segundo plano...")
             self._perform_simple_search()
             
         except Exception as e:
@@ -721,95 +923,371 @@ class PathView(ft.Container):
             self._update_search_ui()
     
     def _perform_simple_search(self):
-        """Realizar búsqueda simplificada para ejecutable"""
-        try:
-            print("🔍 Iniciando búsqueda simplificada...")
-            
-            # Detectar solo el disco principal
-            drives = ["C:\\"]  # Solo buscar en C: para velocidad
-            
-            # Obtener el usuario actual del sistema
-            current_user = self._get_current_user()
-            print(f"👤 Usuario actual detectado: {current_user}")
+        """Lanzar la búsqueda en todos los discos detectados"""
+        # Obtener el usuario actual del sistema
+        current_user = self._get_current_user()
+        print(f"👤 Usuario actual detectado: {current_user}")
+        
+        # Rutas estándar de cada disco detectado
+        self._root_drives = {}
+        for drive in self._detect_drives():
+            for path in self._get_standard_paths(drive, current_user):
+                self._root_drives[path] = drive
+        print(f"📁 Rutas a escanear: {list(self._root_drives)}")
+        
+        self._search_files_in_paths(list(self._root_drives))
+    
+    def _detect_drives(self):
+        """Detectar los discos disponibles"""
+        drives = detect_drives()
+        print(f"📂 Discos detectados: {drives}")
+        return drives
+    
+    def _get_standard_paths(self, drive, current_user=None):
+        """Obtener las rutas estándar existentes en un disco"""
+        return get_standard_paths(drive, current_user)
+    
+    def _search_files_in_paths(self, paths):
+        """Escanear las rutas en paralelo con el motor de escaneo"""
+        self._last_ui_refresh = 0.0
+        self._search_matcher = FileMatcher.from_config(self.config)
+        self.scanner = FileScanner(
+            matcher=self._search_matcher,
+            index=self._get_file_index(),
+            keep_results=False  # Los resultados se guardan en el almacén paginado
+        )
+        self.scanner.start(
+            paths,
+            on_batch=self._on_scan_batch,
+            on_complete=self._on_scan_complete,
+            on_root_progress=self._on_root_progress,
+            on_progress=self._on_scan_progress,
+            runner=getattr(self.page, 'run_thread', None)
+        )
+    
+    def _get_file_index(self):
+        """Abrir el índice persistente de archivos (None si no está disponible)"""
+        if self.file_index is None:
+            try:
+                self.file_index = FileIndex()
+                print(f"🗂️ Índice de archivos: {self.file_index.db_path}")
+            except Exception as e:
+                print(f"⚠️ Índice de archivos no disponible, se escaneará completo: {e}")
+        return self.file_index
+    
+    def _on_root_progress(self, root, status):
+        """Recibir el progreso de una raíz desde el motor de escaneo"""
+        if status["state"] in ("completada", "cancelada", "error"):
+            print(f"📁 {root}: {status['state']} ({status['found']} archivos)")
+    
+    def _on_scan_progress(self, stats):
+        """Recibir los contadores del motor de escaneo (máximo 10 veces por segundo)"""
+        self._sync_progress(stats)
+        self._update_controls(self.progress_panel)
+    
+    def _on_scan_batch(self, root, records):
+        """Recibir resultados parciales desde el motor de escaneo"""
+        self.search_results.extend(records)
+        
+        with self._results_lock:
+            # Limitar la frecuencia de refresco de la interfaz
+            now = time.monotonic()
+            if now - self._last_ui_refresh < 1.0:
+                return
+            self._last_ui_refresh = now
+        
+        self._refresh_results_ui()
+    
+    def _on_scan_complete(self, results, cancelled):
+        """Finalizar la búsqueda con los resultados del motor de escaneo"""
+        found_by_drive = {}
+        for root, status in self.scanner.get_root_status().items():
+            drive = self._root_drives.get(root, root)
+            found_by_drive[drive] = found_by_drive.get(drive, 0) + status["found"]
+        for drive, found in found_by_drive.items():
+            print(f"✅ Disco {drive}: {found} archivos encontrados")
+        
+        if not self.search_results:
+            print("ℹ️ No se encontraron archivos en los discos detectados")
+        if cancelled:
+            print("🛑 Búsqueda cancelada por el usuario")
+        
+        # Marcar búsqueda como completada
+        print(f"✅ Búsqueda completada: {len(self.search_results)} archivos")
+        print("🏁 Marcando búsqueda como completada")
+        with self._close_lock:
+            self.is_searching = False
+            if self._closed:
+                # La vista se cerró durante el escaneo: liberar lo que quedó abierto
+                self._release_index()
+                return
             
-            results = []
-            for drive in drives:
-                print(f"🔍 Buscando en disco: {drive}")
-                
-                # Buscar en rutas del usuario actual y también en Public
-                search_paths = []
-                
-                # Rutas del usuario actual
-                if current_user:
-                    user_paths = [
-                        os.path.join(drive, f"Users\\{current_user}\\Desktop"),
-                        os.path.join(drive, f"Users\\{current_user}\\Downloads"),
-                        os.path.join(drive, f"Users\\{current_user}\\Documents"),
-                        os.path.join(drive, f"Users\\{current_user}\\Pictures"),
-                        os.path.join(drive, f"Users\\{current_user}\\Music"),
-                        os.path.join(drive, f"Users\\{current_user}\\Videos")
-                    ]
-                    search_paths.extend(user_paths)
-                    print(f"📁 Rutas del usuario {current_user}: {user_paths}")
-                
-                # También buscar en Public como respaldo
-                public_paths = [
-                    os.path.join(drive, "Users\\Public\\Desktop"),
-                    os.path.join(drive, "Users\\Public\\Downloads"),
-                    os.path.join(drive, "Users\\Public\\Documents"),
-                    os.path.join(drive, "Users\\Public\\Pictures"),
-                    os.path.join(drive, "Users\\Public\\Music"),
-                    os.path.join(drive, "Users\\Public\\Videos")
-                ]
-                search_paths.extend(public_paths)
-                print(f"📁 Rutas públicas: {public_paths}")
-                
-                found_files = []
-                for path in search_paths:
-                    if os.path.exists(path):
-                        print(f"📁 Buscando en: {path}")
-                        try:
-                            # Buscar solo los primeros 10 archivos por ruta
-                            count = 0
-                            for root, dirs, files in os.walk(path):
-                                for file in files:
-                                    if count >= 10:  # Límite para velocidad
-                                        break
-                                    file_lower = file.lower()
-                                    # Buscar solo archivos ejecutables y comprimidos
-                                    if any(file_lower.endswith(ext) for ext in ['.exe', '.zip', '.rar', '.msi']):
-                                        found_files.append(os.path.join(root, file))
-                                        count += 1
-                                        print(f"  ✅ Encontrado: {file}")
-                                if count >= 10:
-                                    break
-                        except Exception as path_error:
-                            print(f"  ⚠️ Error en {path}: {path_error}")
-                            continue
-                
-                if found_files:
-                    results.append({
-                        'disk': drive,
-                        'paths': found_files[:30]  # Limitar a 30 archivos para mostrar
-                    })
-                    print(f"✅ Disco {drive}: {len(found_files)} archivos encontrados")
+            # Mantener los resultados al día sin volver a recorrer los discos
+            if not cancelled and self.file_index is not None:
+                self._start_watcher(list(self._root_drives))
+        self._update_search_ui()
+    
+    def _start_watcher(self, roots):
+        """Vigilar las rutas escaneadas y actualizar el índice con los cambios"""
+        self._stop_watcher()
+        try:
+            self.file_watcher = FileWatcher(index=self.file_index, on_changes=self._on_watch_changes)
+            self.file_watcher.start(roots)
+        except Exception as e:
+            print(f"⚠️ No se pudo iniciar la vigilancia de archivos: {e}")
+            self.file_watcher = None
+    
+    def _stop_watcher(self):
+        """Detener la vigilancia de archivos si está activa"""
+        if self.file_watcher:
+            self.file_watcher.stop()
+            self.file_watcher = None
+    
+    def will_unmount(self):
+        """Liberar recursos cuando la vista sale de la página"""
+        self.close()
+    
+    def close(self):
+        """Detener búsqueda y vigilancia y cerrar el índice al salir de la vista"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._stop_watcher()
+            if self.scanner and self.is_searching:
+                # El índice se cierra en _on_scan_complete cuando el escaneo termine
+                self.scanner.cancel()
+            elif not self.is_finding_duplicates:
+                self._release_index()
+    
+    def _release_index(self):
+        """Cerrar el índice de archivos y borrar el desborde de resultados"""
+        if self.file_index is not None:
+            try:
+                self.file_index.close()
+            except Exception as e:
+                print(f"⚠️ Error cerrando el índice de archivos: {e}")
+            self.file_index = None
+        self.search_results.clear()
+    
+    def _on_watch_changes(self, changes):
+        """Refrescar los resultados desde el índice cuando cambian archivos buscados"""
+        if self.is_searching or not self._search_matcher:
+            return
+        
+        relevant = any(
+            kind not in ("created", "modified") or self._search_matcher.matches_name(os.path.basename(path))
+            for path, kind in changes.items()
+        )
+        if not relevant:
+            return
+        
+        # Aplicar solo lo que cambió: el índice ya está al día con este lote
+        removed, records = [], []
+        for path, kind in changes.items():
+            if kind in ("created", "modified"):
+                record = self.file_index.get_file(path)
+                if record and self._search_matcher.matches(record):
+                    records.append(record)
                 else:
-                    print(f"ℹ️ No se encontraron archivos en {drive}")
+                    removed.append(path)
+            else:
+                # Carpeta eliminada, re-listada o re-escaneada: reemplazar lo que hay debajo
+                removed.append(path)
+                if kind != "deleted":
+                    records.extend(record for record in self.file_index.files_under(path)
+                                   if self._search_matcher.matches(record))
+        
+        self.search_results.remove_trees(removed)
+        self.search_results.upsert(records)
+        print(f"👁️ {len(changes)} cambios aplicados, {len(self.search_results)} archivos en resultados")
+        self._shown_page = None
+        self._refresh_results_ui()
+    
+    def _cancel_search(self, e):
+        """Cancelar la búsqueda en curso"""
+        if self.scanner and self.is_searching:
+            self.scanner.cancel()
+    
+    def _toggle_pause_search(self, e):
+        """Pausar o reanudar la búsqueda en curso"""
+        if not self.scanner or not self.is_searching:
+            return
+        
+        if self.scanner.is_paused():
+            self.scanner.resume()
+            print("▶️ Búsqueda reanudada")
+        else:
+            self.scanner.pause()
+            print("⏸️ Búsqueda pausada")
+        self._sync_search_controls()
+        self._update_controls(self.search_controls)
+    
+    def _start_duplicate_search(self, e):
+        """Buscar duplicados entre los resultados en segundo plano"""
+        if self.is_searching or self.is_finding_duplicates:
+            return
+        
+        self.is_finding_duplicates = True
+        self._sync_search_controls()
+        self._update_controls(self.search_controls)
+        
+        runner = getattr(self.page, 'run_thread', None)
+        if runner:
+            runner(self._find_duplicates)
+        else:
+            threading.Thread(target=self._find_duplicates, daemon=True).start()
+    
+    def _find_duplicates(self):
+        """Agrupar los resultados por contenido con el buscador de duplicados"""
+        try:
+            finder = DuplicateFinder(index=self._get_file_index())
+            # El almacén se recorre por bloques: no se carga entero en memoria
+            self.duplicate_groups = finder.find(self.search_results)
+            finder.log_summary(self.duplicate_groups)
             
-            print(f"✅ Búsqueda simplificada completada: {len(results)} discos")
-            self.search_results = results
+            for group in self.duplicate_groups:
+                print(f"📄 {len(group.records)} copias de {self._format_file_size(group.size)}:")
+                for record in group.records:
+                    print(f"   {record.path}")
             
+            wasted = sum(group.wasted_bytes for group in self.duplicate_groups)
+            message = (
+                f"🔁 {len(self.duplicate_groups)} grupos de duplicados, "
+                f"{self._format_file_size(wasted)} recuperables."
+                if self.duplicate_groups else "✅ No se encontraron archivos duplicados."
+            )
         except Exception as e:
-            print(f"❌ Error en búsqueda simplificada: {e}")
-            import traceback
-            traceback.print_exc()
-            self.search_results = []
+            print(f"❌ Error buscando duplicados: {e}")
+            message = f"❌ Error buscando duplicados: {e}"
+        finally:
+            with self._close_lock:
+                self.is_finding_duplicates = False
+                if self._closed:
+                    self._release_index()
+            self._sync_search_controls()
+            self._update_controls(self.search_controls)
+        
+        try:
+            if hasattr(self.page, 'show_snack_bar'):
+                self.page.show_snack_bar(ft.SnackBar(content=ft.Text(message), action="OK"))
+            else:
+                print(message)
+        except Exception:
+            print(message)
+    
+    def _on_organize_click(self, e):
+        """Mostrar la vista previa de la organización o ejecutarla si ya se revisó"""
+        if self.is_searching or self.is_organizing:
+            return
+        
+        if not self.organize_plan:
+            self._preview_organization()
+            return
+        
+        self.is_organizing = True
+        self._sync_search_controls()
+        self._update_controls(self.search_controls)
+        
+        runner = getattr(self.page, 'run_thread', None)
+        if runner:
+            runner(self._organize_files)
+        else:
+            threading.Thread(target=self._organize_files, daemon=True).start()
+    
+    def _preview_organization(self):
+        """Calcular el plan de organización sin mover archivos"""
+        organizer = FileOrganizer.from_config(self.config)
+        started = time.perf_counter()
+        self.organize_plan = organizer.plan(self.search_results)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        summary = FileOrganizer.summarize(self.organize_plan)
+        print(f"🗂️ Vista previa: {len(self.organize_plan)} movimientos calculados en {elapsed_ms:.0f} ms")
+        for category, count in summary.items():
+            print(f"   {category}: {count} archivos")
+        for move in self.organize_plan[:20]:
+            print(f"   {move.source} → {move.destination}")
         
+        if self.organize_plan:
+            self.progress_text.value = "🗂️ Vista previa: " + ", ".join(
+                f"{category}: {count}" for category, count in summary.items()
+            ) + ". Pulsa Confirmar para mover los archivos."
+        else:
+            self.progress_text.value = "✅ No hay archivos por organizar."
+        self._sync_search_controls()
+        self._update_controls(self.search_controls, self.progress_panel)
+    
+    def _organize_files(self):
+        """Ejecutar el plan de organización en segundo plano"""
+        organizer = FileOrganizer.from_config(self.config)
+        moves = self.organize_plan
+        try:
+            # Terminar primero cualquier organización interrumpida
+            for journal in MoveJournal.find_incomplete():
+                organizer.resume(journal)
+            
+            self.last_journal = MoveJournal.create()
+            results = organizer.execute(moves, on_batch=self._on_organize_batch, journal=self.last_journal)
+            for result in results:
+                if not result.success:
+                    print(f"❌ {result.move.source}: {result.error}")
+            message = (
+                f"✅ {organizer.stats['moved']} archivos organizados "
+                f"({self._format_file_size(organizer.stats['bytes_moved'])}), "
+                f"{organizer.stats['failed']} con error."
+            )
+        except Exception as e:
+            print(f"❌ Error organizando archivos: {e}")
+            message = f"❌ Error organizando archivos: {e}"
         finally:
-            # Marcar búsqueda como completada
-            print("🏁 Marcando búsqueda como completada")
-            self.is_searching = False
-            self._update_search_ui()
+            self.organize_plan = []
+            self.is_organizing = False
+        
+        print(message)
+        self.progress_text.value = message
+        self._sync_search_controls()
+        self._update_controls(self.search_controls, self.progress_panel)
+    
+    def _on_undo_organize_click(self, e):
+        """Deshacer la última organización en segundo plano"""
+        if not self.last_journal or self.is_organizing:
+            return
+        
+        self.is_organizing = True
+        self._sync_search_controls()
+        self._update_controls(self.search_controls)
+        
+        runner = getattr(self.page, 'run_thread', None)
+        if runner:
+            runner(self._undo_organization)
+        else:
+            threading.Thread(target=self._undo_organization, daemon=True).start()
+    
+    def _undo_organization(self):
+        """Devolver los archivos de la última organización a su ubicación original"""
+        organizer = FileOrganizer.from_config(self.config)
+        try:
+            journal = MoveJournal(self.last_journal.path)
+            undone = organizer.rollback(journal, on_batch=self._on_organize_batch)
+            message = f"↩️ {undone} archivos devueltos a su ubicación original, {organizer.stats['failed']} con error."
+        except Exception as e:
+            print(f"❌ Error deshaciendo la organización: {e}")
+            message = f"❌ Error deshaciendo la organización: {e}"
+        finally:
+            self.last_journal = None
+            self.is_organizing = False
+        
+        print(message)
+        self.progress_text.value = message
+        self._sync_search_controls()
+        self._update_controls(self.search_controls, self.progress_panel)
+    
+    def _on_organize_batch(self, done, total):
+        """Mostrar el avance de la organización por lotes"""
+        self.progress_text.value = f"🗂️ Organizando: {done:,} de {total:,} archivos"
+        self.progress_bar.value = done / total if total else None
+        self._update_controls(self.progress_panel)
     
     def _get_current_user(self):
         """Obtener el nombre del usuario actual del sistema"""
@@ -855,90 +1333,28 @@ class PathView(ft.Container):
             print(f"❌ Error detectando usuario: {e}")
             return None
     
-    def _perform_search(self):
-        """Realizar la búsqueda de rutas (versión con hilos - mantenida para compatibilidad)"""
-        try:
-            print("🔍 Detectando discos...")
-            # Detectar discos
-            drives = self._detect_drives()
-            print(f"📂 Discos detectados: {drives}")
-            
-            results = []
-            for drive in drives:
-                print(f"🔍 Buscando en disco: {drive}")
-                # Obtener rutas estándar
-                standard_paths = self._get_standard_paths(drive)
-                print(f"📁 Rutas estándar en {drive}: {standard_paths}")
-                
-                # Buscar archivos
-                found_files = self._search_files_in_paths(standard_paths)
-                print(f"📄 Archivos encontrados en {drive}: {len(found_files)}")
-                
-                if found_files:
-                    results.append({
-                        'disk': drive,
-                        'paths': found_files
-                    })
-            
-            print(f"✅ Búsqueda completada. Resultados: {len(results)} discos")
-            # Actualizar resultados en el hilo principal usando invoke
-            self.search_results = results
-            
-        except Exception as e:
-            print(f"❌ Error en la búsqueda: {e}")
-            import traceback
-            traceback.print_exc()
-        
-        finally:
-            # Marcar búsqueda como completada y actualizar UI en el hilo principal
-            self.is_searching = False
-            # Usar invoke para actualizar la UI desde el hilo principal
-            if self.page:
-                self.page.invoke(self._update_search_ui)
-    
     def _update_search_ui(self):
-        """Actualizar la interfaz de usuario"""
+        """Actualizar solo los controles de búsqueda y resultados"""
         try:
             print("🔄 Actualizando UI...")
-            # Reconstruir el contenido principal
-            self.main_content = self._build_main_content()
-            
-            # Limpiar la página y reconstruir todo
-            self.page.clean()
-            
-            # Reconstruir los componentes con el nuevo estado
-            self.sidebar = self._build_sidebar()
-            
-            # Agregar los componentes reconstruidos
-            self.page.add(
-                ft.Row(
-                    expand=True,
-                    spacing=0,
-                controls=[
-                        self.sidebar,
-                        self.main_content
-                    ]
-                )
-            )
+            self._sync_search_controls()
+            self._sync_results()
+            self._update_controls(self.search_controls, self.progress_panel, self.results_section)
             
-            # Actualizar la página
-            if self.page:
-                self.page.update()
-                
             # Mostrar mensaje de completado (versión compatible)
             if not self.is_searching and self.search_results:
                 try:
                     if hasattr(self.page, 'show_snack_bar'):
                         self.page.show_snack_bar(
                             ft.SnackBar(
-                                content=ft.Text(f"✅ Búsqueda completada. {len(self.search_results)} discos con archivos encontrados."),
+                                content=ft.Text(f"✅ Búsqueda completada. {len(self.search_results)} archivos encontrados."),
                                 action="OK"
                             )
                         )
                     else:
-                        print(f"✅ Búsqueda completada. {len(self.search_results)} discos con archivos encontrados.")
+                        print(f"✅ Búsqueda completada. {len(self.search_results)} archivos encontrados.")
                 except Exception as e:
-                    print(f"✅ Búsqueda completada. {len(self.search_results)} discos con archivos encontrados.")
+                    print(f"✅ Búsqueda completada. {len(self.search_results)} archivos encontrados.")
             elif not self.is_searching and not self.search_results:
                 try:
                     if hasattr(self.page, 'show_snack_bar'):
@@ -960,37 +1376,36 @@ class PathView(ft.Container):
             import traceback
             traceback.print_exc()
     
+    def _refresh_results_ui(self):
+        """Actualizar solo la sección de resultados (sin mensajes)"""
+        try:
+            self._sync_results()
+            self._update_controls(self.results_section)
+        except Exception as e:
+            print(f"❌ Error actualizando resultados: {e}")
+    
+    def _update_controls(self, *controls):
+        """Enviar al cliente solo los controles indicados"""
+        if self.page:
+            self.page.update(*controls)
+    
     def _toggle_sidebar(self, e):
         """Alternar estado del sidebar"""
         self.sidebar_expanded = not self.sidebar_expanded
-        
-        # Limpiar la página y reconstruir todo
-        self.page.clean()
-        
-        # Reconstruir los componentes con el nuevo estado
-        self.sidebar = self._build_sidebar()
-        self.main_content = self._build_main_content()
-        
-        # Agregar los componentes reconstruidos
-        self.page.add(
-            ft.Row(
-                expand=True,
-                spacing=0,
-                controls=[
-                    self.sidebar,
-                    self.main_content
-                ]
-            )
-        )
-        
-        # Actualizar la página
-        self.page.update()
+        self._refresh_sidebar()
+    
+    def _refresh_sidebar(self):
+        """Actualizar ancho y contenido del sidebar sin reconstruir la vista"""
+        self.sidebar.width = 280 if self.sidebar_expanded else 70
+        self.sidebar.content = self._build_sidebar_content()
+        self._update_controls(self.sidebar)
     
     def _on_menu_item_click(self, e):
         """Manejar clic en elementos del menú"""
         item = e.control.data
         
         if item["label"] == "Inicio" and self.on_back:
+            self.close()
             self.on_back()
         else:
             try:
@@ -1008,6 +1423,7 @@ class PathView(ft.Container):
     
     def _handle_logout(self, e):
         """Manejar logout de usuario"""
+        self.close()
         if self.session_manager:
             self.session_manager.logout()
         
@@ -1017,29 +1433,14 @@ class PathView(ft.Container):
     def update_responsive_layout(self):
         """Actualizar layout para ser responsive"""
         # Ajustar sidebar según el tamaño de la ventana
-        if self.config.WINDOW_WIDTH < 1000:
-            self.sidebar_expanded = False
-        else:
-            self.sidebar_expanded = True
-        
-        # Limpiar la página y reconstruir todo
-        self.page.clean()
-        
-        # Reconstruir los componentes con el nuevo estado
-        self.sidebar = self._build_sidebar()
-        self.main_content = self._build_main_content()
+        expanded = self.config.WINDOW_WIDTH >= 1000
         
-        # Agregar los componentes reconstruidos
-        self.page.add(
-            ft.Row(
-                expand=True,
-                spacing=0,
-                controls=[
-                    self.sidebar,
-                    self.main_content
-                ]
-            )
-        )
+        # Actualizar solo el tamaño de la vista y, si cambió, el sidebar
+        self.width = self.config.WINDOW_WIDTH
+        self.height = self.config.WINDOW_HEIGHT
+        if expanded != self.sidebar_expanded:
+            self.sidebar_expanded = expanded
+            self.sidebar.width = 280 if expanded else 70
+            self.sidebar.content = self._build_sidebar_content()
         
-        if self.page:
-            self.page.update()
+        self._update_controls(self)